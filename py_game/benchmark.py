@@ -0,0 +1,237 @@
+"""
+Benchmarks the gameplay hot paths with SDL's dummy video and audio drivers.
+
+Every scenario runs a headless game from a fixed seed, timing _update and
+_draw for each frame, then runs again under tracemalloc to measure the peak
+memory allocated by the frame loop. Results are printed and written as JSON so they can be compared
+between commits. A map-clear scenario that does not clear its map is flagged,
+and makes the run exit with an error, since its timings are not those of a
+whole map.
+
+Usage: python benchmark.py [--output FILE] [--scenario NAME ...]
+"""
+
+import os
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+import pygame
+
+from game.controls import PolicyInput, tracking_policy
+from game.game import Game
+from game.utils import MapLoader
+
+SEED = 1234
+MAP_CLEAR_FRAMES = 200000  # Safety cap; the tracking policy clears every map in well under this
+
+
+class Scenario:
+    """A reproducible stretch of gameplay to time."""
+
+    def __init__(
+        self,
+        name: str,
+        frames: int,
+        setup: Callable[[Game], None] | None = None,
+        tick: Callable[[Game, int], None] | None = None,
+        done: Callable[[Game], bool] | None = None,
+        level: int = 0,
+    ) -> None:
+        """
+        Initializes the Scenario.
+
+        Args:
+            name: The name of the scenario.
+            frames: The maximum number of frames to run.
+            setup: Prepares a freshly started game.
+            tick: Called before every frame with the frame number.
+            done: Returns True once the scenario reached its goal, ending it early.
+            level: The level the game starts on.
+        """
+        self.name: str = name
+        self.frames: int = frames
+        self.setup: Callable[[Game], None] | None = setup
+        self.tick: Callable[[Game, int], None] | None = tick
+        self.done: Callable[[Game], bool] | None = done
+        self.level: int = level
+        self.final_state: Dict[str, int] = {}
+        self.peak_memory: int = 0
+
+    def play(self, timed: bool, traced: bool = False) -> List[float]:
+        """
+        Runs the scenario from its seed.
+
+        Args:
+            timed: True to time every frame.
+            traced: True to trace the memory allocated by the frame loop and
+                store its peak in peak_memory. Building and starting the game
+                are not traced.
+
+        Returns:
+            The time of each frame in seconds, or an empty list if not timed.
+        """
+        game = Game(headless=True, seed=SEED, input_source=PolicyInput(tracking_policy))
+        game._start_game(new_game=True, level=self.level)
+        if self.setup:
+            self.setup(game)
+        if traced:
+            tracemalloc.start()
+        frame_times: List[float] = []
+        for frame in range(self.frames):
+            if game.game_mode != "playing" or (self.done and self.done(game)):
+                break
+            if self.tick:
+                self.tick(game, frame)
+            start = time.perf_counter()
+            game._update()
+            game._draw()
+            if timed:
+                frame_times.append(time.perf_counter() - start)
+        if traced:
+            _, self.peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        pools: Dict[str, Dict[str, int]] = game.pool_stats()
+        self.final_state = {
+            "score": game.score,
+            "lives": game.lives,
+            "level": game.current_level,
+            "pool_hits": sum(stats["hits"] for stats in pools.values()),
+            "pool_misses": sum(stats["misses"] for stats in pools.values()),
+        }
+        if self.done:
+            self.final_state["cleared"] = self.done(game)
+        return frame_times
+
+
+def dense_map(columns: int = 18, rows: int = 12) -> List[List[int]]:
+    """Returns a map with a brick of every colour in every cell."""
+    return [[(x + y) % 8 + 1 for x in range(columns)] for y in range(rows)]
+
+
+def map_clear(level: int) -> Scenario:
+    """Plays one map until it is cleared, the game ends or the frame limit is reached."""
+    return Scenario(
+        f"map_clear_{level + 1}", MAP_CLEAR_FRAMES, done=lambda game: game.current_level != level, level=level
+    )
+
+
+def ball_multi_storm(game: Game) -> None:
+    """Fills a dense map with dozens of balls."""
+    game._setup_level(0, dense_map())
+    for _ in range(12):
+        game.apply_powerup("ballMulti")
+
+
+def bomb_chain(game: Game, frame: int) -> None:
+    """Keeps a handful of balls armed as bombs on a dense map, setting off chains of blasts."""
+    if frame == 0:
+        game._setup_level(0, dense_map())
+        for _ in range(2):
+            game.apply_powerup("ballMulti")
+    if frame % 30 == 0:
+        game.apply_powerup("bomb")
+
+
+def particle_flood(game: Game, frame: int) -> None:
+    """Emits enough particles to keep well over a thousand alive."""
+    for index in range(12):
+        game.particles.emit(40 + index * 48, 120, "red", 1)
+
+
+def bullet_stream(game: Game, frame: int) -> None:
+    """Fires a bullet every fourth frame into a dense map."""
+    if frame == 0:
+        game._setup_level(0, dense_map())
+    game.ammo = 99
+    if frame % 4 == 0:
+        game.shoot_bullet()
+
+
+def scenarios() -> List[Scenario]:
+    """Returns every benchmark scenario."""
+    result: List[Scenario] = [map_clear(level) for level in range(MapLoader().max_level)]
+    result.append(Scenario("ball_multi_storm", 1200, ball_multi_storm))
+    result.append(Scenario("bomb_chain", 1200, tick=bomb_chain))
+    result.append(Scenario("particles_1000", 1200, tick=particle_flood))
+    result.append(Scenario("bullet_stream", 1200, tick=bullet_stream))
+    return result
+
+
+def run_scenario(scenario: Scenario) -> Dict[str, float]:
+    """
+    Times a scenario and measures its peak memory.
+
+    Args:
+        scenario: The scenario to run.
+
+    Returns:
+        The scenario's metrics.
+    """
+    frame_times: np.ndarray = np.array(scenario.play(timed=True))
+    state: Dict[str, int] = scenario.final_state
+
+    scenario.play(timed=False, traced=True)
+
+    total: float = float(frame_times.sum())
+    return {
+        "frames": len(frame_times),
+        "fps": len(frame_times) / total if total > 0 else 0.0,
+        "p50_ms": float(np.percentile(frame_times, 50)) * 1000 if len(frame_times) else 0.0,
+        "p99_ms": float(np.percentile(frame_times, 99)) * 1000 if len(frame_times) else 0.0,
+        "peak_memory_kb": scenario.peak_memory / 1024,
+        **state,
+    }
+
+
+def main() -> None:
+    """Runs the benchmarks and writes the results."""
+    parser = argparse.ArgumentParser(description="Benchmark Box Breaker gameplay.")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file to write")
+    parser.add_argument("--scenario", action="append", help="only run scenarios with these names")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {}
+    uncleared: List[str] = []
+    for scenario in scenarios():
+        if args.scenario and scenario.name not in args.scenario:
+            continue
+        metrics = run_scenario(scenario)
+        results[scenario.name] = metrics
+        if metrics.get("cleared") is False:
+            uncleared.append(scenario.name)
+        print(
+            f"{scenario.name:20} {metrics['frames']:6d} frames {metrics['fps']:9.1f} fps "
+            f"p50 {metrics['p50_ms']:6.2f} ms p99 {metrics['p99_ms']:6.2f} ms "
+            f"peak {metrics['peak_memory_kb']:8.0f} KiB"
+            + ("  NOT CLEARED" if metrics.get("cleared") is False else "")
+        )
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "seed": SEED,
+                "python": platform.python_version(),
+                "pygame": pygame.version.ver,
+                "scenarios": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"Wrote {args.output}")
+    if uncleared:
+        print(f"Did not clear their maps: {', '.join(uncleared)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+This module contains the sound manager.
+"""
+
+import pygame
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from .constants import AUDIO_CHANNELS, SOUND_SETTINGS, SOUND_VOLUME, MERGED_VOLUME_STEP, MERGED_VOLUME_MAX
+
+if TYPE_CHECKING:
+    from .utils import AssetTable
+
+
+class SoundManager:
+    """
+    Plays sounds through a fixed pool of mixer channels.
+
+    Requests are collected during a frame and played together by flush(), so
+    a sound requested many times in one frame, such as every brick of an
+    explosion breaking, plays once, louder the more it was requested, up to
+    MERGED_VOLUME_MAX. The mixer plays nothing louder than 1.0, so at the
+    default full volume merged sounds play as loud as single ones, and the
+    boost is heard once the volume is turned down. Each sound has a
+    priority and a voice limit: a sound at its limit restarts its oldest
+    voice, and when every channel is busy a sound takes the channel of the
+    lowest-priority voice below its own, or is dropped.
+    """
+
+    def __init__(
+        self,
+        sounds: "AssetTable[pygame.mixer.Sound]",
+        channels: int = AUDIO_CHANNELS,
+        volume: float = SOUND_VOLUME,
+    ) -> None:
+        """
+        Initializes the SoundManager.
+
+        Args:
+            sounds: The sounds by name.
+            channels: The number of mixer channels to play sounds on.
+            volume: The volume of a sound played once in a frame, from 0.0 to 1.0.
+        """
+        self.sounds: "AssetTable[pygame.mixer.Sound]" = sounds
+        self.volume: float = volume
+        self.muted: bool = False
+        self.requests: Dict[str, int] = {}
+        self.channels: List[pygame.mixer.Channel] = []
+        # The sound and priority last started on each channel.
+        self.playing: List[Tuple[str | None, int]] = []
+        self.voices: Dict[str, List[int]] = {}
+        if pygame.mixer.get_init() is not None:
+            pygame.mixer.set_num_channels(channels)
+            self.channels = [pygame.mixer.Channel(index) for index in range(channels)]
+            self.playing = [(None, 0)] * channels
+
+    def play(self, name: str) -> None:
+        """
+        Requests a sound for this frame. Sounds still loading are skipped.
+
+        Args:
+            name: The name of the sound.
+        """
+        if self.muted or name not in self.sounds:
+            return
+        self.requests[name] = self.requests.get(name, 0) + 1
+
+    def toggle_mute(self) -> None:
+        """Mutes or unmutes every sound. While muted, the mixer is left alone."""
+        self.muted = not self.muted
+        self.requests.clear()
+        if self.muted and self.channels:
+            pygame.mixer.stop()
+            self.playing = [(None, 0)] * len(self.channels)
+            self.voices.clear()
+
+    def flush(self) -> None:
+        """Plays the sounds requested since the last flush, highest priority first."""
+        if not self.requests:
+            return
+        if not self.channels:
+            self.requests.clear()
+            return
+        requests: List[Tuple[str, int]] = sorted(
+            self.requests.items(), key=lambda request: -SOUND_SETTINGS.get(request[0], (0, 1))[0]
+        )
+        self.requests.clear()
+        for name, count in requests:
+            priority, max_voices = SOUND_SETTINGS.get(name, (0, 1))
+            index: int | None = self._voice_channel(name, max_voices)
+            if index is None:
+                index = self._free_channel(priority)
+            if index is None:
+                continue
+            channel: pygame.mixer.Channel = self.channels[index]
+            channel.set_volume(self.merged_volume(count))
+            channel.play(self.sounds[name])
+            self._start_voice(index, name, priority)
+
+    def merged_volume(self, count: int) -> float:
+        """
+        Returns the volume of a sound requested a number of times in one frame.
+
+        Args:
+            count: The number of requests merged into one play.
+
+        Returns:
+            The volume, never above MERGED_VOLUME_MAX or below the single-play volume.
+        """
+        return max(self.volume, min(MERGED_VOLUME_MAX, self.volume + MERGED_VOLUME_STEP * (count - 1)))
+
+    def _voice_channel(self, name: str, max_voices: int) -> int | None:
+        """Returns the channel of the oldest voice of a sound at its voice limit."""
+        voices: List[int] = [
+            index
+            for index in self.voices.get(name, [])
+            if self.channels[index].get_busy() and self.playing[index][0] == name
+        ]
+        self.voices[name] = voices
+        if len(voices) < max_voices:
+            return None
+        return voices[0]
+
+    def _free_channel(self, priority: int) -> int | None:
+        """Returns an idle channel, or the busy one with the lowest priority below the given one."""
+        lowest: int | None = None
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return index
+            playing_priority: int = self.playing[index][1]
+            if playing_priority < priority and (lowest is None or playing_priority < self.playing[lowest][1]):
+                lowest = index
+        return lowest
+
+    def _start_voice(self, index: int, name: str, priority: int) -> None:
+        """Records that a sound started on a channel, taking it from its previous voice."""
+        previous: str | None = self.playing[index][0]
+        if previous is not None and index in self.voices.get(previous, []):
+            self.voices[previous].remove(index)
+        self.playing[index] = (name, priority)
+        voices: List[int] = self.voices.setdefault(name, [])
+        voices.append(index)
@@ -0,0 +1,79 @@
+"""
+This module contains the ball controller.
+"""
+
+from typing import TYPE_CHECKING, Dict, Sequence, Tuple
+
+from .constants import PPM, MIN_BALL_SPEED, MAX_BALL_SPEED
+
+if TYPE_CHECKING:
+    from Box2D.b2 import dynamicBody
+    from .entities import Ball, Paddle
+
+
+class BallController:
+    """
+    Updates every ball once per physics step, in one pass.
+
+    Balls waiting on the paddle are moved to it, the speed of moving balls is
+    clamped between the minimum and maximum, and every rect is synced from
+    its body. The paddle anchor is worked out once per paddle and the speed
+    limits are compared squared, so a ball costs little more than reading its
+    body. Only the balls whose speed is out of range are written back.
+    """
+
+    # Box2D keeps velocities as 32-bit floats, so a clamped speed reads back a
+    # hair off its limit. Speeds that close are left alone rather than
+    # written back every step.
+    tolerance: float = 1e-4
+
+    def __init__(self, min_speed: float = MIN_BALL_SPEED, max_speed: float = MAX_BALL_SPEED) -> None:
+        """
+        Initializes the BallController.
+
+        Args:
+            min_speed: The slowest a moving ball may go, in meters per second.
+            max_speed: The fastest a moving ball may go, in meters per second.
+        """
+        self.min_speed: float = min_speed
+        self.max_speed: float = max_speed
+        self.min_speed_squared: float = (min_speed - self.tolerance) ** 2
+        self.max_speed_squared: float = (max_speed + self.tolerance) ** 2
+
+    def update(self, balls: Sequence["Ball"]) -> None:
+        """
+        Keeps waiting balls on the paddle, clamps the speed of moving ones and syncs all rects.
+
+        Args:
+            balls: The live balls.
+        """
+        anchors: Dict["Paddle", Tuple[float, float]] = {}
+        for ball in balls:
+            body: "dynamicBody" = ball.body
+            if ball.state == "on_paddle":
+                anchor: Tuple[float, float] | None = anchors.get(ball.paddle)
+                if anchor is None:
+                    paddle: "Paddle" = ball.paddle
+                    position = paddle.body.position
+                    anchor = anchors[paddle] = (position.x, position.y - paddle.rect.height / 2 / PPM)
+                x, y = anchor[0], anchor[1] - ball.rect.height / 2 / PPM
+                body.position = (x, y)
+            else:
+                position = body.position
+                x, y = position.x, position.y
+                if ball.state == "moving":
+                    self._clamp_speed(body)
+            ball.rect.center = (x * PPM, y * PPM)
+
+    def _clamp_speed(self, body: "dynamicBody") -> None:
+        """Scales a body's velocity back into range if it is going too fast or too slow."""
+        velocity = body.linearVelocity
+        vx, vy = velocity.x, velocity.y
+        speed_squared: float = vx * vx + vy * vy
+        if speed_squared > self.max_speed_squared:
+            scale: float = self.max_speed / speed_squared**0.5
+        elif 0 < speed_squared < self.min_speed_squared:
+            scale = self.min_speed / speed_squared**0.5
+        else:
+            return
+        body.linearVelocity = (vx * scale, vy * scale)
@@ -0,0 +1,188 @@
+"""
+This module plays batches of headless games across a pool of processes.
+
+Every game gets its own seed and start level. Each worker process keeps one
+headless game and plays its share of the batch on it, and results are
+streamed back to the parent as games finish. The parent writes every result
+and the summary statistics to a JSON file:
+
+    python -m game.batch --games 1000 --levels 0 5 --output results.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+import numpy as np
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from .controls import InputFrame, PolicyInput, tracking_policy
+from .game import Game
+from .headless import run_headless
+from .utils import MapLoader
+
+# The paddle policies a batch can be played with, by name.
+POLICIES: Dict[str, Callable[[Game], InputFrame]] = {"tracking": tracking_policy}
+# The per-game results that are summarised.
+METRICS: Tuple[str, ...] = ("levels_cleared", "score", "lives_lost", "frames", "powerups")
+
+# A game to play: its index, seed, start level, frame limit and policy.
+GameTask = Tuple[int, int, int, int, str]
+
+# The headless game a worker process plays all of its games on.
+_worker_game: Game | None = None
+
+
+def game_tasks(games: int, seed: int, levels: range, frames: int, policy: str) -> List[GameTask]:
+    """
+    Plans a batch of games.
+
+    Args:
+        games: The number of games to play.
+        seed: The seed that the seeds of the games are derived from.
+        levels: The start levels, handed out to the games in turn.
+        frames: The maximum number of frames of each game.
+        policy: The name of the paddle policy.
+
+    Returns:
+        The games to play.
+    """
+    # SeedSequence gives every game a statistically independent stream.
+    seeds: List[np.random.SeedSequence] = np.random.SeedSequence(seed).spawn(games)
+    return [
+        (index, int(child.generate_state(1)[0]), levels[index % len(levels)], frames, policy)
+        for index, child in enumerate(seeds)
+    ]
+
+
+def play_game(task: GameTask) -> Dict[str, Any]:
+    """
+    Plays one game of a batch in a worker process.
+
+    Args:
+        task: The game to play.
+
+    Returns:
+        The result of the game, as returned by run_headless, along with its
+        index, seed, start level and policy.
+    """
+    global _worker_game
+    index, seed, level, frames, policy = task
+    if _worker_game is None:
+        # SDL turns SIGTERM into a quit event, which would keep the pool from
+        # terminating the worker.
+        os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1"
+        _worker_game = Game(headless=True)
+    result: Dict[str, Any] = run_headless(
+        frames, seed=seed, input_source=PolicyInput(POLICIES[policy]), level=level, game=_worker_game
+    )
+    result.update(game=index, seed=seed, start_level=level, policy=policy)
+    return result
+
+
+def run_batch(tasks: List[GameTask], workers: int) -> Iterator[Dict[str, Any]]:
+    """
+    Plays a batch of games across a pool of processes.
+
+    Args:
+        tasks: The games to play.
+        workers: The number of worker processes.
+
+    Yields:
+        The result of every game, in the order they finish.
+    """
+    with multiprocessing.Pool(workers) as pool:
+        # Games take seconds each, so they are handed out one at a time to
+        # keep every worker busy until the end of the batch.
+        yield from pool.imap_unordered(play_game, tasks, chunksize=1)
+        pool.close()
+        pool.join()
+
+
+def summarise(results: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Computes summary statistics of game results.
+
+    Args:
+        results: The results of the games.
+
+    Returns:
+        The mean, standard deviation, minimum, median, 90th percentile and
+        maximum of every metric.
+    """
+    results = list(results)
+    summary: Dict[str, Dict[str, float]] = {}
+    for metric in METRICS:
+        values: np.ndarray = np.array([result[metric] for result in results], dtype=np.float64)
+        summary[metric] = {
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+            "min": float(values.min()),
+            "p50": float(np.percentile(values, 50)),
+            "p90": float(np.percentile(values, 90)),
+            "max": float(values.max()),
+        }
+    return summary
+
+
+def main() -> None:
+    """Plays a batch of headless games from the command line and writes the results."""
+    parser = argparse.ArgumentParser(description="Play batches of headless Box Breaker games.")
+    parser.add_argument("--games", type=int, default=100, help="number of games to play")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="seed the game seeds are derived from")
+    parser.add_argument(
+        "--levels", type=int, nargs=2, metavar=("FIRST", "LAST"), help="range of start levels (default: all)"
+    )
+    parser.add_argument("--frames", type=int, default=20000, help="maximum frames per game")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="tracking", help="paddle policy")
+    parser.add_argument("--output", default="batch_results.json", help="JSON file to write")
+    args = parser.parse_args()
+
+    max_level: int = MapLoader().max_level
+    first, last = args.levels if args.levels else (0, max_level - 1)
+    if not 0 <= first <= last < max_level:
+        parser.error(f"levels must be between 0 and {max_level - 1}")
+    if args.games < 1 or args.workers < 1:
+        parser.error("--games and --workers must be at least 1")
+    tasks: List[GameTask] = game_tasks(args.games, args.seed, range(first, last + 1), args.frames, args.policy)
+
+    results: List[Dict[str, Any]] = []
+    progress_step: int = max(1, args.games // 20)
+    start: float = time.perf_counter()
+    for result in run_batch(tasks, args.workers):
+        results.append(result)
+        if len(results) % progress_step == 0 or len(results) == args.games:
+            print(f"{len(results)}/{args.games} games, {time.perf_counter() - start:.1f}s")
+    elapsed: float = time.perf_counter() - start
+    results.sort(key=lambda result: result["game"])
+
+    by_level: Dict[str, Dict[str, Dict[str, float]]] = {
+        str(level): summarise(result for result in results if result["start_level"] == level)
+        for level in range(first, min(last, first + args.games - 1) + 1)
+    }
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "seed": args.seed,
+                "workers": args.workers,
+                "policy": args.policy,
+                "seconds": elapsed,
+                "summary": summarise(results),
+                "by_start_level": by_level,
+                "games": results,
+            },
+            f,
+            indent=2,
+        )
+
+    total_frames: int = sum(result["frames"] for result in results)
+    print(
+        f"{args.games} games in {elapsed:.1f}s on {args.workers} workers "
+        f"({total_frames / elapsed:.0f} frames/sec), wrote {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+This module contains the precompiled asset bundle.
+
+The bundle packs every image as raw RGBA pixels and every sound as PCM in
+the mixer's format, so startup builds surfaces and sounds straight from a
+memory-mapped file instead of decoding PNGs and MP3s. Build it with:
+
+    python -m game.bundle
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import pygame
+from typing import Any, Dict, List, Tuple
+
+from .constants import BUNDLE_PATH, IMAGE_DIR, SOUND_DIR, ATLAS_IMAGE, MIXER_FORMAT
+
+MAGIC: bytes = b"BXBNDL01"
+# Magic, SHA-256 of the source files, length of the JSON index.
+HEADER: struct.Struct = struct.Struct("<8s32sI")
+ALIGNMENT: int = 16
+
+
+def source_files() -> List[Tuple[str, str]]:
+    """
+    Returns the loose asset files that go into the bundle, in a fixed order.
+
+    Returns:
+        The (kind, path) of every image and sound.
+    """
+    files: List[Tuple[str, str]] = []
+    for kind, directory, extension in (("image", IMAGE_DIR, ".png"), ("sound", SOUND_DIR, ".mp3")):
+        if os.path.isdir(directory):
+            files.extend(
+                (kind, os.path.join(directory, filename))
+                for filename in sorted(os.listdir(directory))
+                if filename.endswith(extension)
+            )
+    if os.path.exists(ATLAS_IMAGE):
+        files.append(("image", ATLAS_IMAGE))
+    return files
+
+
+def content_hash(files: List[Tuple[str, str]]) -> bytes:
+    """
+    Hashes the names and contents of the source files.
+
+    Args:
+        files: The (kind, path) of every source file.
+
+    Returns:
+        The SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    for _, path in files:
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.digest()
+
+
+def build_bundle(path: str = BUNDLE_PATH) -> None:
+    """
+    Decodes every loose asset and writes the bundle.
+
+    Args:
+        path: Where to write the bundle.
+    """
+    files: List[Tuple[str, str]] = source_files()
+    index: Dict[str, Any] = {"images": {}, "sounds": {}, "mixer": list(MIXER_FORMAT)}
+    blobs: List[bytes] = []
+    offset: int = 0
+
+    def add_blob(data: bytes) -> int:
+        nonlocal offset
+        start: int = offset
+        padding: int = -len(data) % ALIGNMENT
+        blobs.append(data + b"\0" * padding)
+        offset += len(data) + padding
+        return start
+
+    pygame.mixer.init(*MIXER_FORMAT)
+    for kind, source in files:
+        name: str = os.path.splitext(os.path.basename(source))[0]
+        if kind == "image":
+            image: pygame.Surface = pygame.image.load(source)
+            pixels: bytes = pygame.image.tobytes(image, "RGBA")
+            index["images"][name] = {
+                "offset": add_blob(pixels),
+                "size": len(pixels),
+                "width": image.get_width(),
+                "height": image.get_height(),
+            }
+        else:
+            samples: bytes = pygame.mixer.Sound(source).get_raw()
+            index["sounds"][name] = {"offset": add_blob(samples), "size": len(samples)}
+    pygame.mixer.quit()
+
+    index_data: bytes = json.dumps(index).encode()
+    index_data += b" " * (-(HEADER.size + len(index_data)) % ALIGNMENT)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, content_hash(files), len(index_data)))
+        f.write(index_data)
+        for blob in blobs:
+            f.write(blob)
+
+
+class AssetBundle:
+    """A memory-mapped asset bundle."""
+
+    def __init__(self, data: mmap.mmap, index: Dict[str, Any], data_start: int) -> None:
+        """
+        Initializes the AssetBundle.
+
+        Args:
+            data: The memory-mapped bundle file.
+            index: The index of the bundle's images and sounds.
+            data_start: The offset of the first blob in the file.
+        """
+        self.data: mmap.mmap = data
+        self.index: Dict[str, Any] = index
+        self.data_start: int = data_start
+
+    @classmethod
+    def open(cls, path: str = BUNDLE_PATH) -> "AssetBundle | None":
+        """
+        Opens the bundle if it exists and matches the loose asset files.
+
+        Args:
+            path: The bundle file.
+
+        Returns:
+            The bundle, or None if it is missing, unreadable or stale.
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                data: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, digest, index_size = HEADER.unpack_from(data)
+            if magic != MAGIC:
+                print(f"Ignoring asset bundle {path}: not a bundle")
+                return None
+            files: List[Tuple[str, str]] = source_files()
+            # Without the loose files there is nothing to be stale against.
+            if files and digest != content_hash(files):
+                print(f"Ignoring asset bundle {path}: the assets changed since it was built")
+                return None
+            index: Dict[str, Any] = json.loads(data[HEADER.size : HEADER.size + index_size])
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Failed to read asset bundle {path}: {e}")
+            return None
+        return cls(data, index, HEADER.size + index_size)
+
+    def _blob(self, entry: Dict[str, int]) -> memoryview:
+        """Returns a view of one blob of the bundle."""
+        start: int = self.data_start + entry["offset"]
+        return memoryview(self.data)[start : start + entry["size"]]
+
+    def image_names(self) -> List[str]:
+        """Returns the names of the bundled images, in the order of their file names."""
+        return list(self.index["images"])
+
+    def sound_names(self) -> List[str]:
+        """Returns the names of the bundled sounds, in the order of their file names."""
+        return list(self.index["sounds"])
+
+    def image(self, name: str) -> pygame.Surface:
+        """
+        Builds an image, converted to the display format.
+
+        Args:
+            name: The name of the image.
+
+        Returns:
+            The image.
+        """
+        entry: Dict[str, int] = self.index["images"][name]
+        with self._blob(entry) as pixels:
+            image: pygame.Surface = pygame.image.frombuffer(pixels, (entry["width"], entry["height"]), "RGBA")
+            converted: pygame.Surface = image.convert_alpha()
+            del image
+        return converted
+
+    def has_mixer_format(self) -> bool:
+        """Returns True if the mixer runs in the format the sounds were decoded to."""
+        mixer: Tuple[int, int, int] | None = pygame.mixer.get_init()
+        return mixer is not None and list(mixer) == self.index["mixer"]
+
+    def sound(self, name: str) -> pygame.mixer.Sound:
+        """
+        Builds a sound. Only valid if has_mixer_format() is True.
+
+        Args:
+            name: The name of the sound.
+
+        Returns:
+            The sound.
+        """
+        with self._blob(self.index["sounds"][name]) as samples:
+            return pygame.mixer.Sound(buffer=samples)
+
+
+def main() -> None:
+    """Builds the asset bundle from the command line."""
+    parser = argparse.ArgumentParser(description="Build the Box Breaker asset bundle.")
+    parser.add_argument("--output", default=BUNDLE_PATH, help="bundle file to write")
+    args = parser.parse_args()
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    build_bundle(args.output)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,44 @@ import os
 SCREEN_WIDTH: int = 640
 SCREEN_HEIGHT: int = 480
 TITLE: str = "Box Breaker"
-FPS: int = 60
+FPS: int = 60  # Simulation steps per second
+MAX_RENDER_FPS: int = 240  # Frame rate cap for drawing, 0 for uncapped
 PPM: float = 20.0  # Pixels per meter
 MIN_BALL_SPEED: int = 13
 MAX_BALL_SPEED: int = 20
+PARTICLE_CAPACITY: int = 2048  # The oldest particles are recycled beyond this
+# The most parked entities each pool keeps for reuse.
+POOL_SIZES: dict[str, int] = {"ball": 64, "bullet": 32, "powerup": 16}
+
+# --- Physics ---
+PHYSICS_STEP: float = 1 / FPS  # Seconds of simulation per physics step
+VELOCITY_ITERATIONS: int = 6
+POSITION_ITERATIONS: int = 2
+MAX_SUBSTEPS: int = 5  # Most physics steps per drawn frame before the game slows down
+
+# --- Explosions ---
+EXPLOSION_RADIUS: int = 34  # Pixels from the exploding brick's center to the nearest point of a brick it destroys
+EXPLOSION_CHAIN_DEPTH: int = 1  # How many times bricks destroyed by a blast explode in turn
+
+# --- Collision categories (Box2D filter bits) ---
+CATEGORY_WALL: int = 0x0001
+CATEGORY_FLOOR: int = 0x0002
+CATEGORY_PADDLE: int = 0x0004
+CATEGORY_BALL: int = 0x0008
+CATEGORY_BRICK: int = 0x0010
+CATEGORY_BULLET: int = 0x0020
+
+# --- Rendering ---
+DIRTY_RECTS: bool = False  # Redraw and present only the changed parts of gameplay frames
+SCALE_MODE: str = "smooth"  # "smooth", "integer" or "scaled" (SDL's SCALED flag)
+
+# --- Profiling ---
+PROFILER_HISTORY: int = 600  # Frames kept in the profiler's ring buffer
+PROFILE_CSV_PATH: str | None = None  # Record every frame and write them here on exit
+
+# --- Text ---
+TEXT_CACHE_SIZE: int = 64  # Rendered strings kept; the least recently used are dropped
+HUD_LABELS: tuple[str, ...] = ("Score: ", "Lives: ", "Ammo: ")
 
 # --- Colors ---
 WHITE: tuple[int, int, int] = (255, 255, 255)
@@ -23,3 +57,41 @@ ASSET_DIR: str = os.path.join(BASE_DIR, "..", "res")
 IMAGE_DIR: str = os.path.join(ASSET_DIR, "pixmaps")
 SOUND_DIR: str = os.path.join(ASSET_DIR, "audio")
 MAP_DIR: str = os.path.join(BASE_DIR, "..", "maps")
+COMPILED_MAPS: str = "levels.bxm"  # Compiled maps in a map directory, built by python -m game.mapfile
+BUNDLE_PATH: str = os.path.join(ASSET_DIR, "assets.bundle")  # Built by python -m game.bundle
+ATLAS_IMAGE: str = os.path.join(ASSET_DIR, "atlas.png")  # Built by pack_atlas.py
+ATLAS_INDEX: str = os.path.join(ASSET_DIR, "atlas.json")
+REPLAY_DIR: str = os.path.join(BASE_DIR, "..", "replays")  # Every game played in the window is recorded here
+SAVE_PATH: str = os.path.join(BASE_DIR, "..", "savegame.json")
+LEGACY_SAVE_PATH: str = os.path.join(BASE_DIR, "..", "savegame.dat")  # The level alone, migrated to SAVE_PATH
+ASSET_WORKERS: int = 4  # Threads decoding the assets that the title screen does not need
+
+# --- Saves ---
+SAVE_VERSION: int = 1  # Bumped when the layout of the save file changes
+HIGH_SCORE_COUNT: int = 10
+
+# --- Replays ---
+REPLAY_KEEP: int = 20  # Recordings kept in REPLAY_DIR; older ones are deleted
+REPLAY_CHECKPOINT_INTERVAL: int = 60  # Frames between recorded score and lives checks
+
+# --- Audio ---
+MIXER_FORMAT: tuple[int, int, int] = (44100, -16, 2)  # Frequency, sample size, channels
+MIXER_BUFFER: int = 512
+AUDIO_CHANNELS: int = 16
+SOUND_VOLUME: float = 1.0  # Volume of a sound played once in a frame
+MERGED_VOLUME_STEP: float = 0.1  # Extra volume for every further request of a sound merged into the same frame
+MERGED_VOLUME_MAX: float = 1.0  # Loudest a merged sound plays; the mixer caps volume at 1.0
+# The priority and the most simultaneous voices of each sound. Other sounds get (0, 1).
+SOUND_SETTINGS: dict[str, tuple[int, int]] = {
+    "sfx-01": (3, 1),  # Life lost
+    "sfx-01b": (1, 4),  # Brick destroyed
+    "sfx-02": (2, 2),  # Ball launched
+    "sfx-05": (1, 4),  # Brick hit
+    "sfx-06": (2, 2),  # Power-up collected
+    "sfx-08": (3, 1),  # Game started
+    "sfx-09": (1, 3),  # Bullet fired
+}
+
+# --- Environment ---
+ENV_MAX_BALLS: int = 16  # Balls reported in an observation; any more are left out
+ENV_BRICK_GRID: tuple[int, int] = (16, 20)  # Rows and columns of the hit point grid in an observation
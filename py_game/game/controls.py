@@ -0,0 +1,183 @@
+"""
+This module contains the input sources that steer the paddle.
+"""
+
+import pygame
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .game import Game
+
+# An input frame is the paddle x-coordinate (in game surface pixels, or None to
+# leave the paddle where it is) and the actions to perform this frame.
+InputFrame = Tuple[int | None, Sequence[str]]
+
+LAUNCH: str = "launch"
+SHOOT: str = "shoot"
+
+
+class InputSource:
+    """Base class for everything that can drive the paddle."""
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        """
+        Receives a pygame event while a game is being played.
+
+        Args:
+            event: The event to handle.
+        """
+
+    def poll(self, game: "Game") -> InputFrame:
+        """
+        Returns the input for the next simulation frame.
+
+        Args:
+            game: The main game object.
+
+        Returns:
+            The paddle x-coordinate and the actions to perform.
+        """
+        return None, ()
+
+
+class MouseInput(InputSource):
+    """Reads the paddle position and clicks from the mouse."""
+
+    def __init__(self) -> None:
+        """Initializes the MouseInput."""
+        self.pending: List[str] = []
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        """
+        Queues the actions triggered by mouse clicks.
+
+        Args:
+            event: The event to handle.
+        """
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:  # Left-click
+                self.pending.append(LAUNCH)
+            elif event.button == 3:  # Right-click
+                self.pending.append(SHOOT)
+
+    def poll(self, game: "Game") -> InputFrame:
+        """
+        Returns the scaled mouse x-coordinate and the queued clicks.
+
+        Args:
+            game: The main game object.
+
+        Returns:
+            The paddle x-coordinate and the actions to perform.
+        """
+        mouse_x, _ = game._get_scaled_mouse_pos(pygame.mouse.get_pos())
+        actions: List[str] = self.pending
+        self.pending = []
+        return mouse_x, actions
+
+
+class ScriptedInput(InputSource):
+    """Plays back a fixed sequence of input frames."""
+
+    def __init__(self, script: Iterable[InputFrame]) -> None:
+        """
+        Initializes the ScriptedInput.
+
+        Args:
+            script: The input frames to play, one per simulation frame.
+        """
+        self.frames: Iterator[InputFrame] = iter(script)
+
+    def poll(self, game: "Game") -> InputFrame:
+        """
+        Returns the next scripted frame, or no input once the script ends.
+
+        Args:
+            game: The main game object.
+
+        Returns:
+            The paddle x-coordinate and the actions to perform.
+        """
+        return next(self.frames, (None, ()))
+
+
+class PolicyInput(InputSource):
+    """Asks a policy function for the input of every frame."""
+
+    def __init__(self, policy: Callable[["Game"], InputFrame]) -> None:
+        """
+        Initializes the PolicyInput.
+
+        Args:
+            policy: A function that maps the game state to an input frame.
+        """
+        self.policy: Callable[["Game"], InputFrame] = policy
+
+    def poll(self, game: "Game") -> InputFrame:
+        """
+        Returns the policy's input for the current game state.
+
+        Args:
+            game: The main game object.
+
+        Returns:
+            The paddle x-coordinate and the actions to perform.
+        """
+        return self.policy(game)
+
+
+class ActionInput(InputSource):
+    """Plays the input frame its owner sets before each simulation frame."""
+
+    def __init__(self) -> None:
+        """Initializes the ActionInput."""
+        self.frame: InputFrame = (None, ())
+
+    def set(self, frame: InputFrame) -> None:
+        """
+        Sets the input for the next simulation frame.
+
+        Args:
+            frame: The paddle x-coordinate and the actions to perform.
+        """
+        self.frame = frame
+
+    def poll(self, game: "Game") -> InputFrame:
+        """
+        Returns the input that was set, once. Later frames get no input until it is set again.
+
+        Args:
+            game: The main game object.
+
+        Returns:
+            The paddle x-coordinate and the actions to perform.
+        """
+        frame: InputFrame = self.frame
+        self.frame = (None, ())
+        return frame
+
+
+def tracking_policy(game: "Game") -> InputFrame:
+    """
+    A simple policy that keeps the paddle under the lowest ball.
+
+    It launches any ball resting on the paddle and fires whenever it has ammo.
+
+    Args:
+        game: The main game object.
+
+    Returns:
+        The paddle x-coordinate and the actions to perform.
+    """
+    actions: List[str] = []
+    target = None
+    for ball in game.balls:
+        if ball.state == "on_paddle":
+            actions.append(LAUNCH)
+        elif target is None or ball.rect.centery > target.rect.centery:
+            target = ball
+    if game.ammo > 0:
+        actions.append(SHOOT)
+    if target is None:
+        return game.paddle.rect.centerx, actions
+    return target.rect.centerx, actions
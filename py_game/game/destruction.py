@@ -0,0 +1,112 @@
+"""
+This module contains the deferred-destruction queue for Box2D bodies.
+"""
+
+import pygame
+from typing import Dict, List, Tuple
+from Box2D.b2 import body as b2Body, fixture, world
+
+
+class DestructionQueue:
+    """
+    Bodies and fixtures waiting to be destroyed once the physics step is over.
+
+    Box2D does not allow destroying bodies from inside a contact callback, so
+    everything that removes an entity queues its body here and the game
+    flushes the queue once per step. Queuing a body kills its sprite at the
+    same time, so a sprite is never drawn or updated without its body, and a
+    body is only ever queued once. Bodies of pooled sprites are parked in
+    their pool rather than destroyed. Single fixtures, such as the bricks
+    of a brick field, are queued with the body they belong to.
+    """
+
+    def __init__(self, physics_world: world) -> None:
+        """
+        Initializes the DestructionQueue.
+
+        Args:
+            physics_world: The Box2D world the bodies belong to.
+        """
+        self.world: world = physics_world
+        self.pending: Dict[b2Body, pygame.sprite.Sprite | None] = {}
+        self.pending_fixtures: List[Tuple[b2Body, fixture]] = []
+        self.queued: int = 0
+        self.destroyed: int = 0
+        self.total_queued: int = 0
+        self.total_destroyed: int = 0
+
+    def __contains__(self, body: b2Body) -> bool:
+        """Returns True if the body is waiting to be destroyed."""
+        return body in self.pending
+
+    def __len__(self) -> int:
+        """Returns the number of bodies and fixtures waiting to be destroyed."""
+        return len(self.pending) + len(self.pending_fixtures)
+
+    def queue(self, body: b2Body, sprite: pygame.sprite.Sprite | None = None) -> bool:
+        """
+        Queues a body for destruction and kills its sprite.
+
+        Args:
+            body: The body to destroy.
+            sprite: The sprite that owns the body, if any.
+
+        Returns:
+            True if the body was queued, False if it already was.
+        """
+        if body in self.pending:
+            return False
+        self.pending[body] = sprite
+        if sprite is not None:
+            sprite.kill()
+        self.queued += 1
+        self.total_queued += 1
+        return True
+
+    def queue_fixture(self, body: b2Body, body_fixture: fixture) -> None:
+        """
+        Queues one fixture of a body for destruction.
+
+        The caller makes sure each fixture is queued only once.
+
+        Args:
+            body: The body the fixture belongs to.
+            body_fixture: The fixture to destroy.
+        """
+        self.pending_fixtures.append((body, body_fixture))
+        self.queued += 1
+        self.total_queued += 1
+
+    def flush(self) -> None:
+        """Destroys or pools everything queued. Must not be called during a physics step."""
+        if self.pending_fixtures:
+            # Fixtures go first: destroying their body destroys them as well.
+            for body, body_fixture in self.pending_fixtures:
+                if body not in self.pending:
+                    body.DestroyFixture(body_fixture)
+            self.destroyed += len(self.pending_fixtures)
+            self.total_destroyed += len(self.pending_fixtures)
+            self.pending_fixtures.clear()
+        if not self.pending:
+            return
+        for body, sprite in self.pending.items():
+            pool = getattr(sprite, "pool", None)
+            if pool is not None:
+                pool.release(sprite)
+            else:
+                self.world.DestroyBody(body)
+        self.destroyed += len(self.pending)
+        self.total_destroyed += len(self.pending)
+        self.pending.clear()
+
+    def take_counts(self) -> Tuple[int, int]:
+        """
+        Returns the removals queued and done since the last call, and resets them.
+
+        Returns:
+            The number of bodies and fixtures queued and the number destroyed.
+        """
+        counts: Tuple[int, int] = (self.queued, self.destroyed)
+        self.queued = 0
+        self.destroyed = 0
+        return counts
@@ -2,23 +2,113 @@
 This module contains all the game entities.
 """
 
+import numpy as np
 import pygame
-import random
-from typing import TYPE_CHECKING, Dict, List
-from Box2D.b2 import polygonShape, fixtureDef, dynamicBody, kinematicBody, staticBody
-
-from .constants import SCREEN_WIDTH, SCREEN_HEIGHT, PPM, MAX_BALL_SPEED, MIN_BALL_SPEED, FPS, WHITE
+from typing import TYPE_CHECKING, Dict, List, Tuple
+from Box2D.b2 import polygonShape, fixtureDef, fixture, dynamicBody, kinematicBody, staticBody
+
+from .constants import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    PPM,
+    WHITE,
+    CATEGORY_WALL,
+    CATEGORY_FLOOR,
+    CATEGORY_PADDLE,
+    CATEGORY_BALL,
+    CATEGORY_BRICK,
+    CATEGORY_BULLET,
+)
+from .spatial import BrickGrid
 
 if TYPE_CHECKING:
     from .game import Game
+    from .pool import EntityPool
     from .utils import AssetManager
 
 
+def filtered_fixture(owner: pygame.sprite.Sprite, shape: polygonShape, **properties) -> fixtureDef:
+    """
+    Creates a fixture definition with the owner's collision filter and kind.
+
+    The fixture's user data is a (kind, owner) pair, which the contact
+    listener uses to pick a handler.
+
+    Args:
+        owner: The entity the fixture belongs to.
+        shape: The shape of the fixture.
+        **properties: Further fixture properties, such as density.
+
+    Returns:
+        The fixture definition.
+    """
+    return fixtureDef(
+        shape=shape,
+        categoryBits=owner.category,
+        maskBits=owner.mask,
+        userData=(owner.kind, owner),
+        **properties,
+    )
+
+
+class PhysicsSprite(pygame.sprite.Sprite):
+    """
+    A sprite that follows a dynamic Box2D body.
+
+    The body position before the latest physics step is kept so the sprite
+    can be drawn between the previous and the current step.
+    """
+
+    body: "dynamicBody"
+    rect: pygame.Rect
+    pool: "EntityPool | None" = None
+
+    def __init__(self) -> None:
+        """Initializes the PhysicsSprite."""
+        super().__init__()
+        self.previous_position: Tuple[float, float] | None = None
+
+    def deactivate(self) -> None:
+        """Takes the body out of the simulation while the sprite waits in its pool."""
+        self.body.active = False
+        self.previous_position = None
+
+    def store_position(self) -> None:
+        """Remembers the body position before a physics step."""
+        position = self.body.position
+        self.previous_position = (position.x, position.y)
+
+    def draw_rect(self, alpha: float) -> pygame.Rect:
+        """
+        Returns the rect to draw the sprite at.
+
+        Args:
+            alpha: How far to go from the previous to the current physics step, from 0 to 1.
+
+        Returns:
+            The interpolated rect.
+        """
+        if self.previous_position is None or alpha >= 1:
+            return self.rect
+        previous_x, previous_y = self.previous_position
+        position = self.body.position
+        rect: pygame.Rect = self.rect.copy()
+        rect.center = (
+            (previous_x + (position.x - previous_x) * alpha) * PPM,
+            (previous_y + (position.y - previous_y) * alpha) * PPM,
+        )
+        return rect
+
+
 class Paddle(pygame.sprite.Sprite):
     """
     The paddle that the player controls.
     """
 
+    kind: str = "paddle"
+    category: int = CATEGORY_PADDLE
+    mask: int = CATEGORY_BALL
+
     def __init__(self, assets: "AssetManager", world: "world", game: "Game") -> None:
         """
         Initializes the Paddle.
@@ -57,7 +147,7 @@ class Paddle(pygame.sprite.Sprite):
 
         self.body: "kinematicBody" = self.world.CreateKinematicBody(
             position=(self.rect.centerx / PPM, self.rect.centery / PPM),
-            shapes=polygonShape(vertices=vertices),
+            fixtures=filtered_fixture(self, polygonShape(vertices=vertices)),
         )
         self.body.userData = self
 
@@ -85,18 +175,14 @@ class Paddle(pygame.sprite.Sprite):
             (-bottom_width, bottom_y),
         ]
 
-        self.body.CreateFixture(
-            fixtureDef(
-                shape=polygonShape(vertices=vertices)
-            )
-        )
+        self.body.CreateFixture(filtered_fixture(self, polygonShape(vertices=vertices)))
         self.image = pygame.transform.scale(self.assets.images["paddle"], (int(width), self.rect.height))
         self.rect = self.image.get_rect(center=self.rect.center)
 
     def update(self) -> None:
-        """Updates the paddle's position based on the mouse position."""
-        mouse_x, _ = self.game._get_scaled_mouse_pos(pygame.mouse.get_pos())
-        self.body.position = (mouse_x / PPM, self.body.position.y)
+        """Updates the paddle's position based on the game's input source."""
+        if self.game.paddle_x is not None:
+            self.body.position = (self.game.paddle_x / PPM, self.body.position.y)
         self.rect.centerx = self.body.position.x * PPM
 
     def draw(self, surface: pygame.Surface) -> None:
@@ -111,11 +197,19 @@ class Paddle(pygame.sprite.Sprite):
         surface.blit(self.image, self.rect)
 
 
-class Ball(pygame.sprite.Sprite):
+class Ball(PhysicsSprite):
     """
     The ball that bounces around the screen.
+
+    The BallController updates every ball once per step, so a ball has no
+    update of its own.
     """
 
+    kind: str = "ball"
+    category: int = CATEGORY_BALL
+    # Balls pass through each other: ball-ball contacts need no game logic.
+    mask: int = CATEGORY_WALL | CATEGORY_FLOOR | CATEGORY_PADDLE | CATEGORY_BRICK
+
     def __init__(self, assets: "AssetManager", paddle: "Paddle", world: "world", game: "Game") -> None:
         """
         Initializes the Ball.
@@ -138,16 +232,29 @@ class Ball(pygame.sprite.Sprite):
         self.create_body()
         self.reset()
 
+    def spawn(self, paddle: "Paddle") -> None:
+        """
+        Brings a pooled ball back onto a paddle.
+
+        Args:
+            paddle: The paddle object.
+        """
+        self.paddle = paddle
+        self.image = self.assets.images["ball"]
+        self.is_bomb = False
+        self.body.active = True
+        self.body.angle = 0
+        self.reset()
+
     def create_body(self) -> None:
         """Creates the Box2D body for the ball."""
         self.body: "dynamicBody" = self.world.CreateDynamicBody(
             position=(self.paddle.rect.centerx / PPM, self.paddle.rect.top / PPM - 1),
         )
         self.body.CreateFixture(
-            fixtureDef(
-                shape=polygonShape(
-                    box=(self.rect.width / 2 / PPM, self.rect.height / 2 / PPM)
-                ),
+            filtered_fixture(
+                self,
+                polygonShape(box=(self.rect.width / 2 / PPM, self.rect.height / 2 / PPM)),
                 density=1.0,
                 friction=0.0,
                 restitution=1.0,
@@ -176,36 +283,28 @@ class Ball(pygame.sprite.Sprite):
         """Launches the ball from the paddle."""
         if self.state == "on_paddle":
             self.state = "moving"
-            impulse: tuple[float, int] = (random.uniform(-7, 7), -15)
+            impulse: tuple[float, int] = (self.game.rng.uniform(-7, 7), -15)
             self.body.ApplyLinearImpulse(impulse, self.body.worldCenter, True)
             self.game.play_sound("sfx-02")
             pygame.event.set_grab(True)
             pygame.mouse.set_visible(False)
 
-    def update(self) -> None:
-        """Updates the ball's position."""
-        if self.state == "on_paddle":
-            self.body.position = (
-                self.paddle.body.position.x,
-                self.paddle.body.position.y
-                - (self.paddle.rect.height / 2 / PPM)
-                - (self.rect.height / 2 / PPM),
-            )
-        elif self.state == "moving":
-            vel: "b2Vec2" = self.body.linearVelocity
-            speed: float = vel.length
-            if speed > MAX_BALL_SPEED:
-                self.body.linearVelocity = (MAX_BALL_SPEED / speed) * vel
-            elif speed > 0 and speed < MIN_BALL_SPEED:
-                self.body.linearVelocity = (MIN_BALL_SPEED / speed) * vel
 
-        self.rect.center = (self.body.position.x * PPM, self.body.position.y * PPM)
+class BrickField:
+    """
+    Every brick of a level, kept as an array of hit points.
 
+    All bricks share one static body, with one fixture per brick. A fixture's
+    user data is ("brick", cell), where cell is the brick's (column, row) in
+    the level map, so the contact listener hands the cell to the handlers.
 
-class Brick(pygame.sprite.Sprite):
-    """
-    The bricks that the player needs to destroy.
+    The bricks are drawn onto a copy of the background, the layer, which is
+    drawn in one blit. Only the cells that changed are redrawn on it.
     """
+
+    kind: str = "brick"
+    category: int = CATEGORY_BRICK
+    mask: int = CATEGORY_BALL | CATEGORY_BULLET
     BRICK_IMAGES: Dict[int, str] = {
         1: "brick",
         2: "brick_blue",
@@ -227,78 +326,179 @@ class Brick(pygame.sprite.Sprite):
         8: "silver",
     }
 
-    def __init__(self, assets: "AssetManager", x: int, y: int, hp: int, game: "Game", world: "world") -> None:
+    def __init__(
+        self,
+        assets: "AssetManager",
+        level_map: "np.ndarray | List[List[int]]",
+        origin: Tuple[int, int],
+        gap: int,
+        game: "Game",
+        world: "world",
+    ) -> None:
         """
-        Initializes the Brick.
+        Initializes the BrickField.
 
         Args:
             assets: The asset manager.
-            x: The x-coordinate of the brick.
-            y: The y-coordinate of the brick.
-            hp: The health points of the brick.
+            level_map: The hit points of the brick in every cell, 0 for none.
+            origin: The top-left corner of the first brick.
+            gap: The space between neighbouring bricks.
             game: The main game object.
             world: The Box2D world.
         """
-        super().__init__()
         self.assets: "AssetManager" = assets
-        self.hp: int = hp
         self.game: "Game" = game
         self.world: "world" = world
-        self.image: pygame.Surface = self.assets.images[self.BRICK_IMAGES.get(self.hp, "brick")]
-        self.rect: pygame.Rect = self.image.get_rect(topleft=(x, y))
+        self.hp: np.ndarray = np.array(level_map, dtype=np.uint8)
+        brick_width, brick_height = self.assets.images["brick"].get_size()
+        rows, columns = self.hp.shape
+        self.grid: BrickGrid[fixture] = BrickGrid(
+            origin, (brick_width + gap, brick_height + gap), (brick_width, brick_height), columns, rows
+        )
+        self.images: Dict[int, pygame.Surface] = {
+            hp: self.assets.images[name] for hp, name in self.BRICK_IMAGES.items()
+        }
+        self.layer: pygame.Surface | None = None
+        self.changed: List[Tuple[int, int]] = []
         self.create_body()
 
     def create_body(self) -> None:
-        """Creates the Box2D body for the brick."""
-        self.body: "staticBody" = self.world.CreateStaticBody(
-            position=(self.rect.centerx / PPM, self.rect.centery / PPM),
-            shapes=polygonShape(
-                box=(
-                    self.rect.width / 2 / PPM,
-                    self.rect.height / 2 / PPM,
-                )
-            ),
-        )
+        """Creates the static body and a fixture for every brick."""
+        self.body: "staticBody" = self.world.CreateStaticBody(position=(0, 0))
         self.body.userData = self
+        self.create_fixtures(np.nonzero(self.hp))
 
-    def destroy(self) -> None:
-        """Destroys the brick."""
-        color: str = self.BRICK_PARTICLE_COLORS.get(self.hp, "red")
-        for _ in range(5):
-            particle: "Particle" = Particle(
-                self.assets, self.rect.centerx, self.rect.centery, color
-            )
-            self.game.all_sprites.add(particle)
-            self.game.particles.add(particle)
-        if random.random() < 0.2:  # 20% chance of dropping a power-up
-            powerup_type: str = random.choice(
+    def create_fixtures(self, cells: Tuple[np.ndarray, np.ndarray]) -> None:
+        """
+        Creates the fixtures of bricks.
+
+        Args:
+            cells: The rows and columns of the bricks, as returned by np.nonzero.
+        """
+        half_width: float = self.grid.brick_size[0] / 2 / PPM
+        half_height: float = self.grid.brick_size[1] / 2 / PPM
+        # Box2D copies the definition into every fixture, so one definition
+        # and shape are reused for all of them.
+        shape: polygonShape = polygonShape()
+        definition: fixtureDef = fixtureDef(shape=shape, categoryBits=self.category, maskBits=self.mask)
+        for row, column in zip(*cells):
+            cell: Tuple[int, int] = (int(column), int(row))
+            rect: pygame.Rect = self.grid.cell_rect(cell)
+            shape.SetAsBox(half_width, half_height, (rect.centerx / PPM, rect.centery / PPM), 0)
+            definition.userData = (self.kind, cell)
+            self.grid.add(cell, self.body.CreateFixture(definition))
+
+    def __len__(self) -> int:
+        """Returns the number of bricks left."""
+        return len(self.grid)
+
+    def __contains__(self, cell: Tuple[int, int]) -> bool:
+        """Returns True if there is a brick in the cell."""
+        return cell in self.grid
+
+    def image(self, cell: Tuple[int, int]) -> pygame.Surface:
+        """
+        Returns the image of the brick in a cell, which shows its hit points.
+
+        Args:
+            cell: The (column, row) of the brick.
+
+        Returns:
+            The brick's image.
+        """
+        return self.images.get(int(self.hp[cell[1], cell[0]]), self.images[1])
+
+    def destroy(self, cell: Tuple[int, int]) -> None:
+        """
+        Destroys the brick in a cell.
+
+        Args:
+            cell: The (column, row) of the brick.
+        """
+        brick_fixture: fixture | None = self.grid.remove(cell)
+        if brick_fixture is None:
+            return
+        self.game.bodies_to_destroy.queue_fixture(self.body, brick_fixture)
+        hp: int = int(self.hp[cell[1], cell[0]])
+        self.hp[cell[1], cell[0]] = 0
+        self.changed.append(cell)
+        rect: pygame.Rect = self.grid.cell_rect(cell)
+        color: str = self.BRICK_PARTICLE_COLORS.get(hp, "red")
+        self.game.particles.emit(rect.centerx, rect.centery, color, 5)
+        if self.game.rng.random() < 0.2:  # 20% chance of dropping a power-up
+            powerup_type: str = self.game.rng.choice(
                 ["ball", "bomb", "gold", "shot", "ballMulti", "life", "grow"]
             )
-            powerup: "PowerUp" = PowerUp(
-                self.assets, self.rect.centerx, self.rect.centery, powerup_type
-            )
+            powerup: "PowerUp" = self.game.powerup_pool.acquire(rect.centerx, rect.centery, powerup_type)
             self.game.all_sprites.add(powerup)
             self.game.powerups.add(powerup)
         self.game.play_sound("sfx-01b")
-        if(self.body not in self.game.bodies_to_destroy):
-            self.game.bodies_to_destroy.append(self.body)
-            self.kill()
-
-    def hit(self) -> None:
-        """Handles the brick being hit."""
-        self.hp -= 1
-        if self.hp <= 0:
-            self.destroy()
+
+    def hit(self, cell: Tuple[int, int]) -> None:
+        """
+        Handles the brick in a cell being hit.
+
+        Args:
+            cell: The (column, row) of the brick.
+        """
+        if self.hp[cell[1], cell[0]] <= 1:
+            self.destroy(cell)
         else:
-            self.image = self.assets.images[self.BRICK_IMAGES.get(self.hp, "brick")]
+            self.hp[cell[1], cell[0]] -= 1
+            self.changed.append(cell)
             self.game.play_sound("sfx-05")
 
+    def restore(self, hp: np.ndarray) -> None:
+        """
+        Sets the hit points of every brick, adding and removing fixtures to match.
+        Must not be called during a physics step.
+
+        Args:
+            hp: The hit points of every cell, in the shape of the level map.
+        """
+        added: np.ndarray = (hp > 0) & (self.hp == 0)
+        removed: np.ndarray = (hp == 0) & (self.hp > 0)
+        for row, column in zip(*np.nonzero(removed)):
+            brick_fixture: fixture | None = self.grid.remove((int(column), int(row)))
+            if brick_fixture is not None:
+                self.body.DestroyFixture(brick_fixture)
+        self.create_fixtures(np.nonzero(added))
+        self.changed.extend((int(column), int(row)) for row, column in zip(*np.nonzero(hp != self.hp)))
+        self.hp[...] = hp
+
+    def update_layer(self) -> List[pygame.Rect]:
+        """
+        Brings the layer up to date, drawing it in full the first time.
+
+        Returns:
+            The rects of the cells redrawn since the last call, empty after a full draw.
+        """
+        background: pygame.Surface = self.assets.images["bg1"]
+        if self.layer is None:
+            self.layer = background.copy()
+            self.layer.blits(
+                [(self.image(cell), self.grid.cell_rect(cell)) for cell in self.grid.cells], doreturn=False
+            )
+            self.changed.clear()
+            return []
+        rects: List[pygame.Rect] = []
+        for cell in self.changed:
+            rect: pygame.Rect = self.grid.cell_rect(cell)
+            self.layer.blit(background, rect, rect)
+            if cell in self.grid:
+                self.layer.blit(self.image(cell), rect)
+            rects.append(rect)
+        self.changed.clear()
+        return rects
+
 
 class PowerUp(pygame.sprite.Sprite):
     """
     The power-ups that drop from bricks.
     """
 
+    pool: "EntityPool | None" = None
+
     def __init__(self, assets: "AssetManager", x: int, y: int, type: str) -> None:
         """
         Initializes the PowerUp.
@@ -311,60 +511,50 @@ class PowerUp(pygame.sprite.Sprite):
         """
         super().__init__()
         self.assets: "AssetManager" = assets
+        self.vy: int = 2
+        self.spawn(x, y, type)
+
+    def spawn(self, x: int, y: int, type: str) -> None:
+        """
+        Sets the power-up's type and position.
+
+        Args:
+            x: The x-coordinate of the power-up.
+            y: The y-coordinate of the power-up.
+            type: The type of the power-up.
+        """
         self.type: str = type
         if type == "life":
             self.image: pygame.Surface = self.assets.images["bonus_paddle"]
         else:
             self.image = self.assets.images[f"bonus_{self.type}"]
         self.rect: pygame.Rect = self.image.get_rect(center=(x, y))
-        self.vy: int = 2
 
-    def update(self) -> None:
-        """Updates the power-up's position."""
-        self.rect.y += self.vy
-        if self.rect.top > SCREEN_HEIGHT:
-            self.kill()
+    def deactivate(self) -> None:
+        """Power-ups have no body, so there is nothing to park."""
 
-
-class Particle(pygame.sprite.Sprite):
-    """
-    The particles that are created when a brick is destroyed.
-    """
-
-    def __init__(self, assets: "AssetManager", x: int, y: int, color: str) -> None:
-        """
-        Initializes the Particle.
-
-        Args:
-            assets: The asset manager.
-            x: The x-coordinate of the particle.
-            y: The y-coordinate of the particle.
-            color: The color of the particle.
-        """
-        super().__init__()
-        self.assets: "AssetManager" = assets
-        self.image: pygame.Surface = random.choice(self.assets.particle_images[color])
-        self.rect: pygame.Rect = self.image.get_rect(center=(x, y))
-        self.vx: float = random.uniform(-2, 2)
-        self.vy: float = random.uniform(-5, 0)
-        self.gravity: float = 0.1
-        self.life: int = FPS * 2  # 2 seconds
+    def remove(self) -> None:
+        """Kills the power-up and returns it to its pool."""
+        self.kill()
+        if self.pool is not None:
+            self.pool.release(self)
 
     def update(self) -> None:
-        """Updates the particle's position."""
-        self.vy += self.gravity
-        self.rect.x += self.vx
+        """Updates the power-up's position."""
         self.rect.y += self.vy
-        self.life -= 1
-        if self.life <= 0:
-            self.kill()
+        if self.rect.top > SCREEN_HEIGHT:
+            self.remove()
 
 
-class Bullet(pygame.sprite.Sprite):
+class Bullet(PhysicsSprite):
     """
     The bullets that the player can shoot.
     """
 
+    kind: str = "bullet"
+    category: int = CATEGORY_BULLET
+    mask: int = CATEGORY_BRICK
+
     def __init__(self, assets: "AssetManager", x: int, y: int, world: "world", game: "Game") -> None:
         """
         Initializes the Bullet.
@@ -384,6 +574,19 @@ class Bullet(pygame.sprite.Sprite):
         self.rect: pygame.Rect = self.image.get_rect(center=(x, y))
         self.create_body()
 
+    def spawn(self, x: int, y: int) -> None:
+        """
+        Fires a pooled bullet again from a new position.
+
+        Args:
+            x: The x-coordinate of the bullet.
+            y: The y-coordinate of the bullet.
+        """
+        self.rect.center = (x, y)
+        self.body.active = True
+        self.body.position = (self.rect.centerx / PPM, self.rect.centery / PPM)
+        self.body.linearVelocity = (0, -20)
+
     def create_body(self) -> None:
         """Creates the Box2D body for the bullet."""
         self.body: "dynamicBody" = self.world.CreateDynamicBody(
@@ -391,10 +594,9 @@ class Bullet(pygame.sprite.Sprite):
             bullet=True,
         )
         self.body.CreateFixture(
-            fixtureDef(
-                shape=polygonShape(
-                    box=(self.rect.width / 2 / PPM, self.rect.height / 2 / PPM)
-                ),
+            filtered_fixture(
+                self,
+                polygonShape(box=(self.rect.width / 2 / PPM, self.rect.height / 2 / PPM)),
                 isSensor=True,
             )
         )
@@ -405,6 +607,4 @@ class Bullet(pygame.sprite.Sprite):
         """Updates the bullet's position."""
         self.rect.center = (self.body.position.x * PPM, self.body.position.y * PPM)
         if self.rect.bottom < 0:
-            if self.body not in self.game.bodies_to_destroy:
-                self.game.bodies_to_destroy.append(self.body)
-                self.kill()
+            self.game.bodies_to_destroy.queue(self.body, self)
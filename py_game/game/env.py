@@ -0,0 +1,257 @@
+"""
+This module contains the environment API for training paddle-control agents.
+
+An environment wraps a headless Game: reset() starts a game, and step()
+plays an action and returns the observation, the reward (the points scored)
+and whether the game is over. Observations are NumPy arrays of the game
+state. pixels() returns the drawn frame as a view of the game surface.
+
+VectorEnv steps several games, each with its own Box2D world, in one call.
+Its observations are the state arrays of all its games stacked together.
+"""
+
+import numpy as np
+import pygame
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .constants import PPM, ENV_MAX_BALLS, ENV_BRICK_GRID
+from .controls import ActionInput, InputFrame
+from .game import Game
+from .utils import AssetManager
+
+# The observation of a game state:
+#   paddle_x: The x-coordinate of the paddle's center, in pixels.
+#   balls: The x, y, x velocity and y velocity of each ball, in pixels and
+#       pixels per second. Rows past ball_count are zeros.
+#   ball_count: The number of balls in the balls array.
+#   bricks: The hit points of every brick, one row per row of bricks.
+Observation = Dict[str, np.ndarray]
+
+
+def empty_observation(count: int | None = None) -> Observation:
+    """
+    Allocates the arrays of an observation.
+
+    Args:
+        count: The number of games to stack the arrays of, or None for one game.
+
+    Returns:
+        The observation, filled with zeros.
+    """
+    prefix: Tuple[int, ...] = () if count is None else (count,)
+    return {
+        "paddle_x": np.zeros(prefix, dtype=np.float32),
+        "balls": np.zeros(prefix + (ENV_MAX_BALLS, 4), dtype=np.float32),
+        "ball_count": np.zeros(prefix, dtype=np.int32),
+        "bricks": np.zeros(prefix + ENV_BRICK_GRID, dtype=np.uint8),
+    }
+
+
+class BoxBreakerEnv:
+    """
+    A headless game played one action at a time.
+
+    An action is an input frame: the paddle x-coordinate in pixels, or None
+    to leave the paddle where it is, and the actions (LAUNCH, SHOOT) to
+    perform. The observation arrays are updated in place by every call, so
+    copy them to keep them.
+    """
+
+    def __init__(
+        self,
+        frame_skip: int = 1,
+        assets: AssetManager | None = None,
+        observation: Observation | None = None,
+    ) -> None:
+        """
+        Initializes the BoxBreakerEnv.
+
+        Args:
+            frame_skip: The number of simulation frames each step plays.
+            assets: The assets of another game to share. Loaded anew by default.
+            observation: The arrays to write observations to. Allocated by default.
+        """
+        self.frame_skip: int = frame_skip
+        self.input: ActionInput = ActionInput()
+        self.game: Game = Game(headless=True, input_source=self.input, assets=assets)
+        self.observation: Observation = observation if observation is not None else empty_observation()
+        self.done: bool = True
+
+    def reset(self, seed: int | None = None, level: int = 0) -> Observation:
+        """
+        Starts a new game.
+
+        Args:
+            seed: The seed of the game, if any.
+            level: The level to start on.
+
+        Returns:
+            The first observation.
+        """
+        self.game.reset_world()
+        self.game._start_game(new_game=True, level=level, seed=seed)
+        self.done = False
+        return self.observe()
+
+    def step(self, action: InputFrame) -> Tuple[Observation, float, bool, Dict[str, Any]]:
+        """
+        Plays an action. The action applies to the first frame of the step.
+
+        Args:
+            action: The paddle x-coordinate and the actions to perform.
+
+        Returns:
+            The observation, the points scored, whether the game is over, and
+            the score, lives and level. Once the game is over, steps do nothing
+            until the next reset.
+        """
+        game: Game = self.game
+        score: int = game.score
+        if not self.done:
+            self.input.set(action)
+            for _ in range(self.frame_skip):
+                game._update()
+                if game.game_mode != "playing":
+                    self.done = True
+                    break
+        info: Dict[str, Any] = {"score": game.score, "lives": game.lives, "level": game.current_level}
+        return self.observe(), float(game.score - score), self.done, info
+
+    def observe(self) -> Observation:
+        """
+        Writes the current game state to the observation arrays.
+
+        Returns:
+            The observation.
+        """
+        game: Game = self.game
+        observation: Observation = self.observation
+        observation["paddle_x"][...] = game.paddle.body.position.x * PPM
+        balls: np.ndarray = observation["balls"]
+        balls[...] = 0
+        count: int = 0
+        for ball in game.balls:
+            if count == ENV_MAX_BALLS:
+                break
+            position = ball.body.position
+            velocity = ball.body.linearVelocity
+            balls[count] = (position.x * PPM, position.y * PPM, velocity.x * PPM, velocity.y * PPM)
+            count += 1
+        observation["ball_count"][...] = count
+        bricks: np.ndarray = observation["bricks"]
+        bricks[...] = 0
+        if game.bricks is not None:
+            hp: np.ndarray = game.bricks.hp[: bricks.shape[0], : bricks.shape[1]]
+            bricks[: hp.shape[0], : hp.shape[1]] = hp
+        return observation
+
+    def pixels(self) -> np.ndarray:
+        """
+        Draws the current frame and returns its pixels without copying them.
+
+        The array is a view of the game surface and keeps it locked, so it
+        must be dropped before the next call. Copy it to keep it.
+
+        Returns:
+            The RGB pixels, indexed [y, x, channel].
+
+        Raises:
+            RuntimeError: If an array returned earlier is still alive.
+        """
+        surface: pygame.Surface = self.game.game_surface
+        if surface.get_locked():
+            raise RuntimeError("Drop the previous pixels() array before drawing the next frame")
+        self.game._draw_scene()
+        return pygame.surfarray.pixels3d(surface).transpose(1, 0, 2)
+
+
+class VectorEnv:
+    """
+    Several headless games, each with its own Box2D world, stepped together.
+
+    The games share one set of assets. Observations stack the arrays of every
+    game along a first axis, and each game writes its state straight into its
+    slice of them.
+    """
+
+    def __init__(self, count: int, frame_skip: int = 1) -> None:
+        """
+        Initializes the VectorEnv.
+
+        Args:
+            count: The number of games.
+            frame_skip: The number of simulation frames each step plays.
+        """
+        self.observation: Observation = empty_observation(count)
+        self.envs: List[BoxBreakerEnv] = []
+        for index in range(count):
+            slices: Observation = {name: array[index, ...] for name, array in self.observation.items()}
+            assets: AssetManager | None = self.envs[0].game.assets if self.envs else None
+            self.envs.append(BoxBreakerEnv(frame_skip, assets, slices))
+
+    def __len__(self) -> int:
+        """Returns the number of games."""
+        return len(self.envs)
+
+    def reset(self, seed: int | None = None, level: int = 0) -> Observation:
+        """
+        Starts a new game in every environment.
+
+        Args:
+            seed: The seed that the seeds of the games are derived from, if any.
+            level: The level to start on.
+
+        Returns:
+            The first observation of every game.
+        """
+        seeds: List[int | None] = [None] * len(self.envs)
+        if seed is not None:
+            seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(len(self.envs))]
+        for env, env_seed in zip(self.envs, seeds):
+            env.reset(env_seed, level)
+        return self.observation
+
+    def reset_at(self, index: int, seed: int | None = None, level: int = 0) -> Observation:
+        """
+        Starts a new game in one environment, such as one whose game is over.
+
+        Args:
+            index: The index of the environment.
+            seed: The seed of the game, if any.
+            level: The level to start on.
+
+        Returns:
+            The observation of every game.
+        """
+        self.envs[index].reset(seed, level)
+        return self.observation
+
+    def step(
+        self, actions: Sequence[InputFrame]
+    ) -> Tuple[Observation, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """
+        Plays one action in every game.
+
+        Args:
+            actions: The action for each game.
+
+        Returns:
+            The observation, the points scored by each game, whether each game
+            is over, and the score, lives and level of each game.
+        """
+        rewards: np.ndarray = np.zeros(len(self.envs), dtype=np.float32)
+        dones: np.ndarray = np.zeros(len(self.envs), dtype=bool)
+        infos: List[Dict[str, Any]] = []
+        for index, (env, action) in enumerate(zip(self.envs, actions)):
+            _, rewards[index], dones[index], info = env.step(action)
+            infos.append(info)
+        return self.observation, rewards, dones, infos
+
+    def pixels(self) -> List[np.ndarray]:
+        """
+        Draws the current frame of every game and returns views of their pixels.
+
+        Returns:
+            The RGB pixels of each game, as returned by BoxBreakerEnv.pixels.
+        """
+        return [env.pixels() for env in self.envs]
@@ -2,20 +2,88 @@
 This module contains the main game logic.
 """
 
+import numpy as np
 import pygame
+import random
 import sys
 import os
-from typing import List, Tuple
-from Box2D.b2 import world, polygonShape, staticBody, dynamicBody, kinematicBody, contactListener, contact
-
-from .constants import SCREEN_WIDTH, SCREEN_HEIGHT, TITLE, FPS, PPM, WHITE, BLACK
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Tuple
+from Box2D.b2 import (
+    world,
+    polygonShape,
+    chainShape,
+    fixtureDef,
+    staticBody,
+    dynamicBody,
+    kinematicBody,
+    contactListener,
+    contact,
+)
+
+from .constants import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    TITLE,
+    PPM,
+    WHITE,
+    DIRTY_RECTS,
+    SCALE_MODE,
+    MAX_RENDER_FPS,
+    PHYSICS_STEP,
+    VELOCITY_ITERATIONS,
+    POSITION_ITERATIONS,
+    PROFILE_CSV_PATH,
+    POOL_SIZES,
+    EXPLOSION_RADIUS,
+    EXPLOSION_CHAIN_DEPTH,
+    CATEGORY_WALL,
+    CATEGORY_FLOOR,
+    CATEGORY_BALL,
+    REPLAY_DIR,
+    REPLAY_KEEP,
+    SAVE_PATH,
+    LEGACY_SAVE_PATH,
+    HUD_LABELS,
+)
 from .utils import AssetManager, MapLoader
-from .entities import Paddle, Ball, Brick, Bullet, PowerUp, Particle
+from .controls import InputSource, MouseInput, LAUNCH, SHOOT
+from .entities import Paddle, Ball, BrickField, Bullet, PowerUp, PhysicsSprite
+from .particles import ParticleSystem
+from .render import DirtyRenderer, DrawItem
+from .scaling import Scaler
+from .timestep import SimulationClock
+from .destruction import DestructionQueue
+from .audio import SoundManager
+from .recording import Recording
+from .save import SaveFile
+from .text import TextCache, GlyphStrip
+from .balls import BallController
+from .pool import EntityPool
+from .spatial import Cell
+from .profiler import (
+    FrameProfiler,
+    PHASE_EVENTS,
+    PHASE_DESTROY,
+    PHASE_STEP,
+    PHASE_HUD,
+    PHASE_SPRITES,
+    PHASE_POWERUPS,
+    PHASE_SCENE,
+    PHASE_SCALE,
+    PHASE_FLIP,
+)
 
 
 class GameContactListener(contactListener):
     """
     Handles collisions between game objects.
+
+    Every fixture's user data is a (kind, owner) pair. Handlers are
+    registered against a pair of kinds and looked up in a table, so contacts
+    without game logic cost a single dictionary miss. Pairs that never need
+    a contact at all are filtered out by the fixtures' collision categories.
     """
 
     def __init__(self, game: "Game") -> None:
@@ -27,6 +95,23 @@ class GameContactListener(contactListener):
         """
         super().__init__()
         self.game: "Game" = game
+        self.handlers: Dict[Tuple[str, str], Callable[[Any, Any], None]] = {}
+
+    def register(self, kind_a: str, kind_b: str, handler: Callable[[Any, Any], None]) -> None:
+        """
+        Registers the handler for contacts between two kinds of fixture.
+
+        The handler is called with the owners in the registered order,
+        whichever order Box2D reports the fixtures in.
+
+        Args:
+            kind_a: The kind of the first fixture.
+            kind_b: The kind of the second fixture.
+            handler: Called with the owners of both fixtures.
+        """
+        self.handlers[(kind_a, kind_b)] = handler
+        if kind_a != kind_b:
+            self.handlers[(kind_b, kind_a)] = lambda owner_b, owner_a: handler(owner_a, owner_b)
 
     def BeginContact(self, contact: contact) -> None:
         """
@@ -35,70 +120,102 @@ class GameContactListener(contactListener):
         Args:
             contact: The contact object.
         """
-        fixture_a = contact.fixtureA
-        fixture_b = contact.fixtureB
-        body_a = fixture_a.body
-        body_b = fixture_b.body
-
-        sprite_a = body_a.userData
-        sprite_b = body_b.userData
-
-        if sprite_a and sprite_b:
-            if isinstance(sprite_a, Ball) and isinstance(sprite_b, Brick):
-                self.game.handle_ball_brick_collision(sprite_a, sprite_b)
-            elif isinstance(sprite_b, Ball) and isinstance(sprite_a, Brick):
-                self.game.handle_ball_brick_collision(sprite_b, sprite_a)
-            elif isinstance(sprite_a, Ball) and sprite_b == "floor":
-                self.game.handle_ball_floor_collision(sprite_a)
-            elif isinstance(sprite_b, Ball) and sprite_a == "floor":
-                self.game.handle_ball_floor_collision(sprite_b)
-            elif isinstance(sprite_a, Bullet) and isinstance(sprite_b, Brick):
-                self.game.handle_bullet_brick_collision(sprite_a, sprite_b)
-            elif isinstance(sprite_b, Bullet) and isinstance(sprite_a, Brick):
-                self.game.handle_bullet_brick_collision(sprite_b, sprite_a)
+        kind_a, owner_a = contact.fixtureA.userData
+        kind_b, owner_b = contact.fixtureB.userData
+        handler = self.handlers.get((kind_a, kind_b))
+        if handler is not None:
+            handler(owner_a, owner_b)
 
 
 class Game:
     """Main class for the game."""
 
-    def __init__(self) -> None:
-        """Initializes the game."""
+    def __init__(
+        self,
+        headless: bool = False,
+        seed: int | None = None,
+        input_source: InputSource | None = None,
+        assets: AssetManager | None = None,
+        saves_progress: bool | None = None,
+    ) -> None:
+        """
+        Initializes the game.
+
+        Args:
+            headless: True to run without a window or audio, for simulation.
+            seed: The seed that the seeds of the games are drawn from, if any.
+            input_source: What steers the paddle. Defaults to the mouse.
+            assets: The assets of another game to share. Loaded anew by default.
+            saves_progress: True to read and write the save file and record
+                the games played. Defaults to True unless headless.
+        """
+        self.headless: bool = headless
+        if headless:
+            # The dummy drivers still give us a display format to convert
+            # images to, without opening a window or an audio device.
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        # Every game is seeded from this generator, or from its own seed.
+        self.rng: random.Random = random.Random(seed)
+        self.session_seed: int = 0
         pygame.init()
-        self.screen: pygame.Surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
+        self.scaler: Scaler = Scaler(SCALE_MODE)
+        self.screen: pygame.Surface = self.scaler.create_screen(resizable=not headless)
         self.game_surface: pygame.Surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(TITLE)
         self.clock: pygame.time.Clock = pygame.time.Clock()
-        self.assets: AssetManager = AssetManager()
+        self.sim_clock: SimulationClock = SimulationClock()
+        self.profiler: FrameProfiler = FrameProfiler(csv_path=PROFILE_CSV_PATH)
+        self.input: InputSource = input_source if input_source is not None else MouseInput()
+        self.paddle_x: int | None = None
+        self.assets: AssetManager = assets if assets is not None else AssetManager(load_sounds=not headless)
+        self.audio: SoundManager = SoundManager(self.assets.sounds)
+        # The particle images are still loading; they are set when a game starts.
+        self.particles: ParticleSystem = ParticleSystem()
+        self.ball_controller: BallController = BallController()
         self.map_loader: MapLoader = MapLoader()
         self.font: pygame.font.Font = pygame.font.Font(None, 36)
+        self.text: TextCache = TextCache()
+        self.hud_glyphs: GlyphStrip = GlyphStrip(self.font, WHITE, HUD_LABELS)
         self.game_mode: str = "start_menu"
-        self.bodies_to_destroy: List["b2Body"] = []
         self.should_create_new_ball: bool = False
         self.paddle_resize_needed: bool = False
-        self.save_path: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "savegame.dat")
+        self.saves_progress: bool = not headless if saves_progress is None else saves_progress
+        # Games played in the window are recorded, to be played back by game.replay.
+        self.recording: Recording | None = None
+        self.record_replays: bool = self.saves_progress
+        # Games that keep no progress do not read the player's save either.
+        self.save: SaveFile = SaveFile(SAVE_PATH, LEGACY_SAVE_PATH) if self.saves_progress else SaveFile(None)
         self.score: int = 0
         self.lives: int = 0
         self.current_level: int = 0
+        self.level_frames: int = 0
         self.ammo: int = 0
         self.grow_active: bool = False
+        self.lives_lost: int = 0
+        self.powerups_collected: int = 0
         self.score_val: int = -1
         self.lives_val: int = -1
         self.ammo_val: int = -1
-        self.score_text: pygame.Surface | None = None
-        self.lives_text: pygame.Surface | None = None
-        self.ammo_text: pygame.Surface | None = None
+        self.score_glyphs: List[Tuple[pygame.Surface, pygame.Rect]] = []
+        self.lives_glyphs: List[Tuple[pygame.Surface, pygame.Rect]] = []
+        self.ammo_glyphs: List[Tuple[pygame.Surface, pygame.Rect]] = []
+        self.dirty_rects: bool = DIRTY_RECTS
+        self.renderer: DirtyRenderer = DirtyRenderer(self.game_surface)
+        self.drawn_mode: str | None = None
+        self.bricks: BrickField | None = None
         self._setup_buttons()
         self._setup_physics()
 
     def play_sound(self, sound_name: str) -> None:
         """
-        Play a sound if it exists.
+        Play a sound if it exists, once the current frame is over. Sounds still
+        loading are skipped.
 
         Args:
             sound_name: The name of the sound to play.
         """
-        if sound_name in self.assets.sounds:
-            self.assets.sounds[sound_name].play()
+        self.audio.play(sound_name)
 
     def _get_scaled_mouse_pos(self, pos: Tuple[int, int]) -> Tuple[int, int]:
         """
@@ -110,18 +227,7 @@ class Game:
         Returns:
             The scaled mouse position.
         """
-        screen_width, screen_height = self.screen.get_size()
-        scale: float = min(screen_width / SCREEN_WIDTH, screen_height / SCREEN_HEIGHT)
-        scaled_width: int = int(SCREEN_WIDTH * scale)
-        scaled_height: int = int(SCREEN_HEIGHT * scale)
-        pos_x: float = (screen_width - scaled_width) / 2
-        pos_y: float = (screen_height - scaled_height) / 2
-
-        mouse_x, mouse_y = pos
-        unscaled_x: float = (mouse_x - pos_x) / scale
-        unscaled_y: float = (mouse_y - pos_y) / scale
-
-        return int(unscaled_x), int(unscaled_y)
+        return self.scaler.to_game(pos)
 
     def _setup_buttons(self) -> None:
         """Create rects for menu buttons."""
@@ -132,160 +238,227 @@ class Game:
             topleft=(256, 320)
         )
 
+    def reset_world(self) -> None:
+        """
+        Replaces the physics world, entity pools and particle system with fresh
+        ones, dropping every entity. The assets are kept.
+
+        Bodies left over from earlier games, such as those parked in the
+        pools, change the order Box2D solves a step in. After a reset, a game
+        plays out exactly as it would on a new Game.
+        """
+        self.bricks = None
+        self.particles = ParticleSystem()
+        self._setup_physics()
+
     def _setup_physics(self) -> None:
         """Sets up the Box2D physics world."""
         self.world: world = world(gravity=(0, 8), doSleep=True)
         self.contact_listener: GameContactListener = GameContactListener(self)
         self.world.contactListener = self.contact_listener
+        self.bodies_to_destroy: DestructionQueue = DestructionQueue(self.world)
+        discard_body: Callable[[PhysicsSprite], None] = lambda sprite: self.world.DestroyBody(sprite.body)
+        self.ball_pool: EntityPool[Ball] = EntityPool(
+            lambda paddle: Ball(self.assets, paddle, self.world, self), POOL_SIZES["ball"], discard_body
+        )
+        self.bullet_pool: EntityPool[Bullet] = EntityPool(
+            lambda x, y: Bullet(self.assets, x, y, self.world, self), POOL_SIZES["bullet"], discard_body
+        )
+        self.powerup_pool: EntityPool[PowerUp] = EntityPool(
+            lambda x, y, type: PowerUp(self.assets, x, y, type), POOL_SIZES["powerup"]
+        )
+        self.contact_listener.register(Ball.kind, BrickField.kind, self.handle_ball_brick_collision)
+        self.contact_listener.register(Ball.kind, "floor", lambda ball, _: self.handle_ball_floor_collision(ball))
+        self.contact_listener.register(Bullet.kind, BrickField.kind, self.handle_bullet_brick_collision)
 
         # Create walls and floor sensor
         self.walls: List[staticBody] = []
         floor: staticBody = self.world.CreateStaticBody(
             position=(0, SCREEN_HEIGHT / PPM),
-            shapes=polygonShape(box=(SCREEN_WIDTH / PPM, 1 / PPM)),
+            fixtures=fixtureDef(
+                shape=polygonShape(box=(SCREEN_WIDTH / PPM, 1 / PPM)),
+                isSensor=True,
+                categoryBits=CATEGORY_FLOOR,
+                maskBits=CATEGORY_BALL,
+                userData=("floor", None),
+            ),
         )
-        floor.fixtures[0].isSensor = True
         floor.userData = "floor"
         self.walls.append(floor)
 
-        wall_top: staticBody = self.world.CreateStaticBody(position=(0, 0))
-        wall_top.CreateEdgeChain(
-            [
-                (0, 0),
-                (SCREEN_WIDTH / PPM, 0),
-            ]
-        )
-        self.walls.append(wall_top)
-
-        wall_left: staticBody = self.world.CreateStaticBody(position=(0, 0))
-        wall_left.CreateEdgeChain([(0, 0), (0, SCREEN_HEIGHT / PPM)])
-        self.walls.append(wall_left)
-
-        wall_right: staticBody = self.world.CreateStaticBody(position=(SCREEN_WIDTH / PPM, 0))
-        wall_right.CreateEdgeChain([(0, 0), (0, SCREEN_HEIGHT / PPM)])
-        self.walls.append(wall_right)
+        self.walls.append(self._create_wall((0, 0), [(0, 0), (SCREEN_WIDTH / PPM, 0)]))
+        self.walls.append(self._create_wall((0, 0), [(0, 0), (0, SCREEN_HEIGHT / PPM)]))
+        self.walls.append(self._create_wall((SCREEN_WIDTH / PPM, 0), [(0, 0), (0, SCREEN_HEIGHT / PPM)]))
 
-    def save_progress(self, level: int) -> None:
+    def _create_wall(self, position: Tuple[float, float], vertices: List[Tuple[float, float]]) -> staticBody:
         """
-        Save the current level to the save file.
+        Creates a wall that only balls collide with.
 
         Args:
-            level: The level to save.
+            position: The position of the wall body, in meters.
+            vertices: The edge chain of the wall, relative to its position.
+
+        Returns:
+            The wall body.
         """
-        try:
-            with open(self.save_path, "w") as f:
-                f.write(str(level))
-        except IOError as e:
-            print(f"Error saving progress: {e}")
+        wall: staticBody = self.world.CreateStaticBody(position=position)
+        wall.CreateFixture(
+            fixtureDef(
+                shape=chainShape(vertices_chain=vertices),
+                categoryBits=CATEGORY_WALL,
+                maskBits=CATEGORY_BALL,
+                userData=("wall", None),
+            )
+        )
+        return wall
 
-    def load_progress(self) -> int:
-        """Load the level from the save file."""
-        try:
-            if os.path.exists(self.save_path):
-                with open(self.save_path, "r") as f:
-                    return int(f.read().strip())
-        except (IOError, ValueError) as e:
-            print(f"Error loading progress: {e}")
-        return 0
+    def _game_over(self) -> None:
+        """Ends the game and records its score."""
+        self.game_mode = "game_over"
+        if self.saves_progress:
+            self.save.record_game(self.score, self.current_level)
+            self.save.flush()
 
-    def _start_game(self, new_game: bool) -> None:
+    def _start_game(self, new_game: bool, level: int | None = None, seed: int | None = None) -> None:
         """
         Starts a new game or continues from a saved game.
 
         Args:
             new_game: True to start a new game, False to continue.
+            level: The level to start on, overriding the saved progress.
+            seed: The seed of the game. Drawn from the game's generator by default.
         """
+        # A recording is played back on a fresh world, so a recorded game
+        # starts on one too, or it would diverge from its replay.
+        if self.record_replays:
+            self.reset_world()
+        # Tear down every entity of the previous game, keeping only the walls
+        # and the parked bodies of pooled entities.
         for body in self.world.bodies:
-            if isinstance(body.userData, Brick):
-                self.bodies_to_destroy.append(body)
-                body.userData.kill()
-
-        if hasattr(self, 'paddle') and self.paddle:
-            self.bodies_to_destroy.append(self.paddle.body)
-            self.paddle.kill()
-
-        for body in self.bodies_to_destroy:
-            self.world.DestroyBody(body)
+            if body.active and isinstance(body.userData, pygame.sprite.Sprite):
+                self.bodies_to_destroy.queue(body, body.userData)
+        self.bodies_to_destroy.flush()
+        self.assets.wait()
+        self.particles.set_images(self.assets.particle_images)
 
-        self.bodies_to_destroy = []
         self.score = 0
         self.lives = 5
-        self.current_level = 0 if new_game else self.load_progress()
+        if level is not None:
+            self.current_level = level
+        else:
+            self.current_level = 0 if new_game else self.save.level
+        self.session_seed = seed if seed is not None else self.rng.getrandbits(32)
+        self.rng.seed(self.session_seed)
+        self.particles.seed(self.rng.getrandbits(32))
+        if self.record_replays:
+            self.recording = Recording(self.session_seed, self.current_level)
         self.ammo = 0
         self.grow_active = False
+        self.lives_lost = 0
+        self.powerups_collected = 0
         self.play_sound("sfx-08")
 
         self.all_sprites: pygame.sprite.Group = pygame.sprite.Group()
-        self.bricks: pygame.sprite.Group = pygame.sprite.Group()
         self.balls: pygame.sprite.Group = pygame.sprite.Group()
-        self.particles: pygame.sprite.Group = pygame.sprite.Group()
+        self.particles.clear()
         self.powerups: pygame.sprite.Group = pygame.sprite.Group()
         self.bullets: pygame.sprite.Group = pygame.sprite.Group()
 
         self.paddle: Paddle = Paddle(self.assets, self.world, self)
         self.all_sprites.add(self.paddle)
 
-        self.ball: Ball = Ball(self.assets, self.paddle, self.world, self)
-        self.all_sprites.add(self.ball)
-        self.balls.add(self.ball)
+        self.ball: Ball = self._spawn_ball()
 
-        self._setup_level(self.current_level)
         self.game_mode = "playing"
+        self._setup_level(self.current_level)
+        if self.game_mode != "playing":
+            return
+        self.sim_clock.reset()
 
-    def _setup_level(self, level_num: int) -> None:
+    def _setup_level(self, level_num: int, level_map: "np.ndarray | List[List[int]] | None" = None) -> None:
         """
         Sets up the level.
 
         Args:
             level_num: The level number to set up.
+            level_map: A brick layout to use instead of the level's own map.
         """
-        for brick in self.bricks:
-            if(brick.body not in self.bodies_to_destroy):
-                self.bodies_to_destroy.append(brick.body)
-                brick.kill()
-
-        level_map: List[List[int]] | None = self.map_loader.get_map(level_num)
-        if not level_map:
+        if self.bricks is not None:
+            self.bodies_to_destroy.queue(self.bricks.body)
+            # Box2D reuses the memory of destroyed bodies, so a stale reference
+            # could later queue another body that lives at the same address.
+            self.bricks = None
+
+        if level_map is None:
+            level_map = self.map_loader.get_map(level_num)
+        if level_map is None or len(level_map) == 0:
+            # No game was played on the level, so there is no score to record.
             self.game_mode = "game_over"
             return
 
         brick_width: int = self.assets.images["brick"].get_width()
-        brick_height: int = self.assets.images["brick"].get_height()
 
         num_columns: int = len(level_map[0])
         total_grid_width: int = (num_columns * brick_width) + ((num_columns - 1) * 2)
         start_x: int = (SCREEN_WIDTH - total_grid_width) // 2
-
-        for y, row in enumerate(level_map):
-            for x, brick_hp in enumerate(row):
-                if brick_hp > 0:
-                    brick_x: int = start_x + x * (brick_width + 2)
-                    brick_y: int = y * (brick_height + 2) + 36
-                    brick: Brick = Brick(
-                        self.assets, brick_x, brick_y, brick_hp, self, self.world
-                    )
-                    self.all_sprites.add(brick)
-                    self.bricks.add(brick)
+        self.bricks = BrickField(self.assets, level_map, (start_x, 36), 2, self, self.world)
+        self.level_frames = 0
 
     def run(self) -> None:
         """Runs the main game loop."""
         running: bool = True
         while running:
-            self.clock.tick(FPS)
+            frame_time: float = self.clock.tick(MAX_RENDER_FPS) / 1000
+            self.profiler.begin_frame()
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                 if event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.RESIZABLE)
+                    self.screen = self.scaler.handle_resize(event.size)
+                    self.renderer.invalidate()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
+                    self.renderer.invalidate()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_s:
+                    self.audio.toggle_mute()
                 self._handle_events(event)
+            self.profiler.lap(PHASE_EVENTS)
 
-            self._update()
+            for _ in range(self.sim_clock.advance(frame_time)):
+                self._update()
+            if self.recording is not None and self.game_mode != "playing":
+                self._save_recording()
+            self.audio.flush()
             self._draw()
+            self.profiler.end_frame(
+                len(self.all_sprites) if self.game_mode == "playing" else 0,
+                len(self.particles),
+                self.world.bodyCount,
+                *self.bodies_to_destroy.take_counts(),
+            )
 
+        if self.recording is not None and self.game_mode == "playing":
+            self._save_recording()
+        self.save.close()
+        self.profiler.close()
         pygame.quit()
         sys.exit()
 
+    def _save_recording(self) -> None:
+        """Saves the recording of the game that just ended to REPLAY_DIR, keeping the last REPLAY_KEEP."""
+        recording: Recording = self.recording
+        self.recording = None
+        recording.finish(self)
+        try:
+            os.makedirs(REPLAY_DIR, exist_ok=True)
+            recording.save(os.path.join(REPLAY_DIR, time.strftime("replay-%Y%m%d-%H%M%S.bxr")))
+            replays: List[str] = sorted(name for name in os.listdir(REPLAY_DIR) if name.endswith(".bxr"))
+            for name in replays[:-REPLAY_KEEP]:
+                os.remove(os.path.join(REPLAY_DIR, name))
+        except OSError as e:
+            print(f"Error saving recording: {e}")
+
     def _handle_events(self, event: pygame.event.Event) -> None:
         """
         Handles game events.
@@ -300,17 +473,10 @@ class Game:
                 mouse_pos = self._get_scaled_mouse_pos(event.pos)
                 if self.new_game_button_rect.collidepoint(mouse_pos):
                     self._start_game(new_game=True)
-                elif self.continue_button_rect.collidepoint(
-                    mouse_pos
-                ) and os.path.exists(self.save_path):
+                elif self.continue_button_rect.collidepoint(mouse_pos) and self.save.has_save:
                     self._start_game(new_game=False)
         elif self.game_mode == "playing":
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:  # Left-click
-                    for ball in self.balls:
-                        ball.launch()
-                elif event.button == 3:  # Right-click
-                    self.shoot_bullet()
+            self.input.handle_event(event)
         elif self.game_mode == "game_over":
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 self.game_mode = "start_menu"
@@ -319,31 +485,42 @@ class Game:
         """Shoots a bullet."""
         if self.ammo > 0:
             self.ammo -= 1
-            bullet: Bullet = Bullet(
-                self.assets,
-                self.paddle.rect.centerx,
-                self.paddle.rect.top,
-                self.world,
-                self,
-            )
+            bullet: Bullet = self.bullet_pool.acquire(self.paddle.rect.centerx, self.paddle.rect.top)
             self.all_sprites.add(bullet)
             self.bullets.add(bullet)
             self.play_sound("sfx-09")
 
+    def _apply_input(self) -> None:
+        """Reads the next input frame and applies its actions."""
+        self.paddle_x, actions = self.input.poll(self)
+        if self.recording is not None:
+            self.recording.record((self.paddle_x, actions), self)
+        for action in actions:
+            if action == LAUNCH:
+                for ball in self.balls:
+                    ball.launch()
+            elif action == SHOOT:
+                self.shoot_bullet()
+
     def _update(self) -> None:
         """Updates the game state."""
         if self.game_mode == "playing":
-            for body in self.bodies_to_destroy:
-                self.world.DestroyBody(body)
-            self.bodies_to_destroy.clear()
+            self.level_frames += 1
+            self._apply_input()
+
+            self.bodies_to_destroy.flush()
+            self.profiler.lap(PHASE_DESTROY)
 
             if self.should_create_new_ball:
-                self.ball = Ball(self.assets, self.paddle, self.world, self)
-                self.all_sprites.add(self.ball)
-                self.balls.add(self.ball)
+                self.ball = self._spawn_ball()
                 self.should_create_new_ball = False
 
-            self.world.Step(1 / FPS, 6, 2)
+            for sprite in self.balls:
+                sprite.store_position()
+            for sprite in self.bullets:
+                sprite.store_position()
+            self.world.Step(PHYSICS_STEP, VELOCITY_ITERATIONS, POSITION_ITERATIONS)
+            self.profiler.lap(PHASE_STEP)
 
             if self.paddle_resize_needed:
                 self.paddle.resize(self.assets.images["paddle"].get_rect().width)
@@ -351,63 +528,68 @@ class Game:
 
             if self.score != self.score_val:
                 self.score_val = self.score
-                self.score_text = self.font.render(f"Score: {self.score}", True, WHITE)
+                self.score_glyphs = self.hud_glyphs.layout("Score: ", self.score, topleft=(10, 10))
             if self.lives != self.lives_val:
                 self.lives_val = self.lives
-                self.lives_text = self.font.render(f"Lives: {self.lives}", True, WHITE)
+                self.lives_glyphs = self.hud_glyphs.layout("Lives: ", self.lives, topright=(SCREEN_WIDTH - 10, 10))
             if self.ammo != self.ammo_val:
                 self.ammo_val = self.ammo
-                self.ammo_text = self.font.render(f"Ammo: {self.ammo}", True, WHITE)
+                self.ammo_glyphs = self.hud_glyphs.layout("Ammo: ", self.ammo, midtop=(SCREEN_WIDTH // 2, 10))
+            self.profiler.lap(PHASE_HUD)
 
             self.all_sprites.update()
+            self.ball_controller.update(self.balls.sprites())
             self.particles.update()
             self.powerups.update()
+            self.profiler.lap(PHASE_SPRITES)
             self._handle_powerup_collisions()
 
             if not self.bricks:
+                if self.saves_progress:
+                    self.save.record_level(self.current_level, self.level_frames * PHYSICS_STEP)
                 self.current_level += 1
                 if self.current_level >= self.map_loader.max_level:
-                    self.game_mode = "game_over"
+                    self._game_over()
                 else:
-                    if self.current_level > self.load_progress():
-                        self.save_progress(self.current_level)
+                    if self.saves_progress:
+                        self.save.unlock(self.current_level)
+                        self.save.flush()
                     self._setup_level(self.current_level)
                     for ball in self.balls:
-                        self.world.DestroyBody(ball.body)
-                        ball.kill()
-                    self.ball = Ball(self.assets, self.paddle, self.world, self)
-                    self.all_sprites.add(self.ball)
-                    self.balls.add(self.ball)
+                        self.bodies_to_destroy.queue(ball.body, ball)
+                    self.ball = self._spawn_ball()
+            self.profiler.lap(PHASE_POWERUPS)
 
-    def handle_ball_brick_collision(self, ball: Ball, brick: Brick) -> None:
+    def handle_ball_brick_collision(self, ball: Ball, cell: Cell) -> None:
         """
         Handles the collision between a ball and a brick.
 
         Args:
             ball: The ball that collided.
-            brick: The brick that was hit.
+            cell: The (column, row) of the brick that was hit.
         """
+        # The brick may already have been destroyed earlier in this step.
+        if cell not in self.bricks:
+            return
         if ball.is_bomb:
-            self.explode(brick)
+            self.explode(cell)
             ball.is_bomb = False
             ball.image = self.assets.images["ball"]
         else:
-            brick.hit()
+            self.bricks.hit(cell)
         self.score += 100
 
-    def handle_bullet_brick_collision(self, bullet: Bullet, brick: Brick) -> None:
+    def handle_bullet_brick_collision(self, bullet: Bullet, cell: Cell) -> None:
         """
         Handles the collision between a bullet and a brick.
 
         Args:
             bullet: The bullet that collided.
-            brick: The brick that was hit.
+            cell: The (column, row) of the brick that was hit.
         """
-        if bullet in self.bullets:
-            if (bullet.body not in self.bodies_to_destroy):
-                self.bodies_to_destroy.append(bullet.body)
-                bullet.kill()
-                brick.hit()
+        if bullet in self.bullets and cell in self.bricks:
+            if self.bodies_to_destroy.queue(bullet.body, bullet):
+                self.bricks.hit(cell)
                 self.score += 100
 
     def handle_ball_floor_collision(self, ball: Ball) -> None:
@@ -418,30 +600,37 @@ class Game:
             ball: The ball that hit the floor.
         """
         if ball in self.balls:
-            if(ball.body not in self.bodies_to_destroy):
-                self.bodies_to_destroy.append(ball.body)
-                ball.kill()
+            self.bodies_to_destroy.queue(ball.body, ball)
             if not self.balls:
                 self.lives -= 1
+                self.lives_lost += 1
                 self.play_sound("sfx-01")
                 if self.grow_active:
                     self.paddle_resize_needed = True
                     self.grow_active = False
                 if self.lives <= 0:
-                    self.game_mode = "game_over"
+                    self._game_over()
                 else:
                     self.should_create_new_ball = True
 
-    def explode(self, brick: Brick) -> None:
+    def explode(self, cell: Cell) -> None:
         """
-        Explodes a brick, destroying it and surrounding bricks.
+        Explodes a brick, destroying it and every brick within EXPLOSION_RADIUS of its center.
+
+        Bricks destroyed by a blast explode in turn, up to EXPLOSION_CHAIN_DEPTH
+        blasts away from the first one.
 
         Args:
-            brick: The brick to explode.
+            cell: The (column, row) of the brick to explode.
         """
-        for b in self.bricks.copy():
-            if b.rect.colliderect(brick.rect.inflate(50, 50)):
-                b.destroy()
+        blasts: deque[Tuple[Cell, int]] = deque([(cell, 0)])
+        while blasts:
+            center, depth = blasts.popleft()
+            x, y = self.bricks.grid.cell_rect(center).center
+            for hit_cell in self.bricks.grid.query_radius(x, y, EXPLOSION_RADIUS):
+                self.bricks.destroy(hit_cell)
+                if depth < EXPLOSION_CHAIN_DEPTH:
+                    blasts.append((hit_cell, depth + 1))
 
     def _handle_powerup_collisions(self) -> None:
         """Handles collisions between the paddle and power-ups."""
@@ -450,96 +639,162 @@ class Game:
         )
         for powerup in collided_powerups:
             self.play_sound("sfx-06")
-            if powerup.type == "ball":
-                new_ball: Ball = Ball(self.assets, self.paddle, self.world, self)
-                new_ball.launch()
-                self.all_sprites.add(new_ball)
-                self.balls.add(new_ball)
+            self.apply_powerup(powerup.type)
+            self.powerups_collected += 1
+            powerup.remove()
 
-            elif powerup.type == "bomb":
-                for ball in self.balls:
-                    ball.is_bomb = True
-                    ball.image = self.assets.images["ball_bomb"]
-            elif powerup.type == "gold":
-                self.score += 500
-            elif powerup.type == "shot":
-                self.ammo = 20
-            elif powerup.type == "ballMulti":
-                for _ in range(4):
-                    new_ball = Ball(self.assets, self.paddle, self.world, self)
-                    new_ball.launch()
-                    self.all_sprites.add(new_ball)
-                    self.balls.add(new_ball)
-            elif powerup.type == "life":
-                self.lives += 1
-            elif powerup.type == "grow":
-                if not self.grow_active:
-                    self.grow_active = True
-                    self.paddle.resize(self.paddle.rect.width * 1.5)
+    def _spawn_ball(self) -> Ball:
+        """
+        Puts a ball from the pool on the paddle.
+
+        Returns:
+            The new ball.
+        """
+        ball: Ball = self.ball_pool.acquire(self.paddle)
+        self.all_sprites.add(ball)
+        self.balls.add(ball)
+        return ball
+
+    def pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """Returns the hit, miss and discard counts of every entity pool."""
+        return {
+            "ball": self.ball_pool.stats(),
+            "bullet": self.bullet_pool.stats(),
+            "powerup": self.powerup_pool.stats(),
+        }
+
+    def apply_powerup(self, powerup_type: str) -> None:
+        """
+        Applies the effect of a collected power-up.
+
+        Args:
+            powerup_type: The type of the power-up.
+        """
+        if powerup_type == "ball":
+            self._spawn_ball().launch()
+
+        elif powerup_type == "bomb":
+            for ball in self.balls:
+                ball.is_bomb = True
+                ball.image = self.assets.images["ball_bomb"]
+        elif powerup_type == "gold":
+            self.score += 500
+        elif powerup_type == "shot":
+            self.ammo = 20
+        elif powerup_type == "ballMulti":
+            for _ in range(4):
+                self._spawn_ball().launch()
+        elif powerup_type == "life":
+            self.lives += 1
+        elif powerup_type == "grow":
+            if not self.grow_active:
+                self.grow_active = True
+                self.paddle.resize(self.paddle.rect.width * 1.5)
 
     def _draw(self) -> None:
         """Draws the game screen."""
-        if self.game_mode == "start_menu":
-            self._draw_start_menu()
-        elif self.game_mode == "playing":
-            self._draw_gameplay()
-        elif self.game_mode == "game_over":
-            self._draw_game_over()
+        dirty: List[pygame.Rect] | None = self._draw_scene()
+        if dirty is not None:
+            self._present_dirty(dirty)
+            self.profiler.lap(PHASE_FLIP)
+            return
 
         # Scale the game surface to the window size, maintaining aspect ratio
-        screen_width, screen_height = self.screen.get_size()
-
-        # determine the scale factor
-        scale: float = min(screen_width / SCREEN_WIDTH, screen_height / SCREEN_HEIGHT)
-
-        # calculate the new size of the game surface
-        scaled_width: int = int(SCREEN_WIDTH * scale)
-        scaled_height: int = int(SCREEN_HEIGHT * scale)
-
-        # scale the game surface
-        scaled_surface: pygame.Surface = pygame.transform.smoothscale(self.game_surface, (scaled_width, scaled_height))
+        self.scaler.present(self.game_surface)
+        self.profiler.lap(PHASE_SCALE)
+        pygame.display.flip()
+        self.profiler.lap(PHASE_FLIP)
 
-        # calculate the position to center the scaled surface
-        pos_x: float = (screen_width - scaled_width) / 2
-        pos_y: float = (screen_height - scaled_height) / 2
+    def _draw_scene(self) -> List[pygame.Rect] | None:
+        """
+        Draws the current screen onto the game surface, without presenting it.
 
-        # blit the scaled surface to the screen
-        self.screen.fill(BLACK) # fill with black bars
-        self.screen.blit(scaled_surface, (pos_x, pos_y))
+        Returns:
+            The rects that changed when dirty-rect rendering is on, otherwise None.
+        """
+        if self.game_mode != self.drawn_mode:
+            self.drawn_mode = self.game_mode
+            self.renderer.invalidate()
 
-        pygame.display.flip()
+        dirty: List[pygame.Rect] | None = None
+        if self.game_mode == "start_menu":
+            self._draw_start_menu()
+        elif self.game_mode == "playing":
+            dirty = self._draw_gameplay()
+        elif self.game_mode == "game_over":
+            self._draw_game_over()
+        if self.profiler.overlay_visible:
+            self.profiler.draw_overlay(self.game_surface)
+            # The overlay is not tracked by the dirty-rect renderer.
+            self.renderer.invalidate()
+        self.profiler.lap(PHASE_SCENE)
+        return dirty
 
     def _draw_start_menu(self) -> None:
         """Draws the start menu."""
         self.game_surface.blit(self.assets.images["bgTitle"], (0, 0))
+        if not self.assets.ready:
+            bar: pygame.Rect = pygame.Rect(0, 0, 256, 6)
+            bar.midbottom = (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 20)
+            pygame.draw.rect(self.game_surface, WHITE, bar, 1)
+            bar.width = int(bar.width * self.assets.progress())
+            pygame.draw.rect(self.game_surface, WHITE, bar)
         self.game_surface.blit(self.assets.images["btn_newGame"], self.new_game_button_rect)
-        if os.path.exists(self.save_path):
+        if self.save.has_save:
             self.game_surface.blit(
                 self.assets.images["btn_continue"], self.continue_button_rect
             )
 
-    def _draw_gameplay(self) -> None:
-        """Draws the gameplay screen."""
-        self.game_surface.blit(self.assets.images["bg1"], (0, 0))
-        for sprite in self.all_sprites:
-            if isinstance(sprite, Paddle):
-                sprite.draw(self.game_surface)
-            else:
-                self.game_surface.blit(sprite.image, sprite.rect)
+    def _present_dirty(self, dirty: List[pygame.Rect]) -> None:
+        """
+        Scales the changed parts of the game surface to the window and presents them.
+
+        Args:
+            dirty: The rects of the game surface that changed.
+        """
+        if dirty:
+            pygame.display.update(self.scaler.present_rects(self.game_surface, dirty))
+
+    def _gameplay_items(self) -> List[DrawItem]:
+        """Returns the sprites drawn over the brick layer, back to front."""
+        alpha: float = self.sim_clock.alpha
+        return [
+            (sprite, sprite.image, sprite.draw_rect(alpha) if isinstance(sprite, PhysicsSprite) else sprite.rect)
+            for sprite in self.all_sprites
+        ]
+
+    def _hud_items(self) -> List[DrawItem]:
+        """Returns the HUD text drawn over everything else."""
+        items: List[DrawItem] = []
+        # Every glyph is its own item, so only the glyphs that changed are redrawn.
+        for name, glyphs in (("score", self.score_glyphs), ("lives", self.lives_glyphs), ("ammo", self.ammo_glyphs)):
+            if name == "ammo" and self.ammo <= 0:
+                continue
+            items.extend(((name, index), glyph, rect) for index, (glyph, rect) in enumerate(glyphs))
+        return items
+
+    def _draw_gameplay(self) -> List[pygame.Rect] | None:
+        """
+        Draws the gameplay screen.
+
+        Returns:
+            The rects that changed when dirty-rect rendering is on, otherwise None.
+        """
+        changed: List[pygame.Rect] = self.bricks.update_layer()
+        if self.dirty_rects:
+            self.renderer.set_background(self.bricks.layer)
+            return self.renderer.draw(self._gameplay_items(), self.particles, self._hud_items(), changed)
+        self.game_surface.blit(self.bricks.layer, (0, 0))
+        # The sprites are mostly subsurfaces of the atlas, submitted in one batch.
+        self.game_surface.blits([(image, rect) for _, image, rect in self._gameplay_items()], doreturn=False)
         self.particles.draw(self.game_surface)
-        if self.score_text:
-            self.game_surface.blit(self.score_text, (10, 10))
-        if self.lives_text:
-            self.game_surface.blit(self.lives_text, (SCREEN_WIDTH - self.lives_text.get_width() - 10, 10))
-        if self.ammo > 0 and self.ammo_text:
-            self.game_surface.blit(
-                self.ammo_text, (SCREEN_WIDTH // 2 - self.ammo_text.get_width() // 2, 10)
-            )
+        self.game_surface.blits([(image, rect) for _, image, rect in self._hud_items()], doreturn=False)
+        return None
 
     def _draw_game_over(self) -> None:
         """Draws the game over screen."""
         self.game_surface.blit(self.assets.images["bgGameOver"], (0, 0))
-        go_text: pygame.Surface = self.font.render("Click to continue", True, WHITE)
+        go_text: pygame.Surface = self.text.render(self.font, "Click to continue", WHITE)
         self.game_surface.blit(
             go_text, (SCREEN_WIDTH // 2 - go_text.get_width() // 2, 300)
         )
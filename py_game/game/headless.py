@@ -0,0 +1,87 @@
+"""
+This module runs the game without a window, as fast as the CPU allows.
+"""
+
+import argparse
+import time
+from typing import Dict
+
+from .controls import InputSource, PolicyInput, tracking_policy
+from .game import Game
+
+
+def run_headless(
+    frames: int,
+    seed: int | None = None,
+    input_source: InputSource | None = None,
+    level: int = 0,
+    game: Game | None = None,
+) -> Dict[str, float]:
+    """
+    Simulates a game without drawing, audio or frame rate throttling.
+
+    The simulation stops after the given number of frames, or earlier if the
+    game ends.
+
+    Args:
+        frames: The maximum number of frames to simulate.
+        seed: The seed of the game, if any.
+        input_source: What steers the paddle. Defaults to the tracking policy.
+        level: The level to start on.
+        game: An existing headless game to reuse instead of creating one. Only
+            its assets are kept.
+
+    Returns:
+        The simulated frames, elapsed seconds, frames per second, the final
+        score, lives and level, and the levels cleared, lives lost and
+        power-ups collected.
+    """
+    if input_source is None:
+        input_source = PolicyInput(tracking_policy)
+    if game is None:
+        game = Game(headless=True, input_source=input_source)
+    else:
+        # The game plays out as it would on a new Game, whatever was played
+        # on this one before.
+        game.reset_world()
+        game.input = input_source
+    game._start_game(new_game=True, level=level, seed=seed)
+
+    frame: int = 0
+    start: float = time.perf_counter()
+    while frame < frames and game.game_mode == "playing":
+        game._update()
+        frame += 1
+    elapsed: float = time.perf_counter() - start
+
+    return {
+        "frames": frame,
+        "seconds": elapsed,
+        "fps": frame / elapsed if elapsed > 0 else 0.0,
+        "score": game.score,
+        "lives": game.lives,
+        "level": game.current_level,
+        "levels_cleared": game.current_level - level,
+        "lives_lost": game.lives_lost,
+        "powerups": game.powerups_collected,
+    }
+
+
+def main() -> None:
+    """Runs a headless simulation from the command line and reports its speed."""
+    parser = argparse.ArgumentParser(description="Run Box Breaker without a window.")
+    parser.add_argument("--frames", type=int, default=10000, help="maximum frames to simulate")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--level", type=int, default=0, help="level to start on")
+    args = parser.parse_args()
+
+    result = run_headless(args.frames, seed=args.seed, level=args.level)
+    print(
+        f"{result['frames']} frames in {result['seconds']:.2f}s "
+        f"({result['fps']:.0f} frames/sec), score {result['score']}, "
+        f"lives {result['lives']}, level {result['level']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
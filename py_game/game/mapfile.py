@@ -0,0 +1,190 @@
+"""
+This module contains the compiled map format.
+
+A compiled map file holds any number of levels. It starts with a header and
+an index of every level's offset and dimensions, followed by each level's
+hit points, one byte per cell, row by row. Levels are read straight from
+the memory-mapped file when they are asked for. Compile the text maps with:
+
+    python -m game.mapfile [SOURCE_DIR] [OUTPUT]
+
+The index also records the number, size and modification time of the text
+map each level was compiled from. A level is only read from the compiled
+file while the text map next to it still matches, which is checked when the
+level is asked for, so startup does not grow with the size of the pack.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import numpy as np
+from typing import List, Tuple
+
+from .constants import MAP_DIR, COMPILED_MAPS
+
+MAGIC: bytes = b"BXMAPS03"
+# Magic and number of levels.
+HEADER: struct.Struct = struct.Struct("<8sI")
+# Where each level's hit points start in the file, its size, and the stamp of
+# the text map it was compiled from. The stamp is all zeros without one.
+INDEX_ENTRY: np.dtype = np.dtype(
+    [
+        ("offset", "<u4"),
+        ("columns", "<u2"),
+        ("rows", "<u2"),
+        ("number", "<u4"),
+        ("size", "<u4"),
+        ("mtime", "<i8"),
+    ]
+)
+
+
+def text_map_files(directory: str) -> List[str]:
+    """
+    Returns the text maps in a directory, in level order.
+
+    Args:
+        directory: The directory of map.N files.
+
+    Returns:
+        The paths of the maps.
+    """
+    names: List[str] = [
+        name for name in os.listdir(directory) if name.startswith("map.") and name[4:].isdigit()
+    ]
+    names.sort(key=lambda name: int(name[4:]))
+    return [os.path.join(directory, name) for name in names]
+
+
+def parse_text_map(path: str) -> np.ndarray:
+    """
+    Parses a text map: one line per row of bricks, one digit of hit points per cell.
+
+    Args:
+        path: The map file.
+
+    Returns:
+        The hit points of every cell, with short rows padded with zeros.
+    """
+    with open(path, "r") as f:
+        rows: List[List[int]] = [[int(char) for char in line.strip() if char.isdigit()] for line in f]
+    rows = [row for row in rows if row]
+    columns: int = max((len(row) for row in rows), default=0)
+    level: np.ndarray = np.zeros((len(rows), columns), dtype=np.uint8)
+    for y, row in enumerate(rows):
+        level[y, : len(row)] = row
+    return level
+
+
+def text_map_stamp(path: str) -> Tuple[int, int, int]:
+    """
+    Returns what identifies a version of a text map without reading it.
+
+    Args:
+        path: The text map.
+
+    Returns:
+        The level number in its name, its size and its modification time in nanoseconds.
+
+    Raises:
+        OSError: If the map cannot be found.
+    """
+    stat: os.stat_result = os.stat(path)
+    return int(os.path.basename(path)[4:]), stat.st_size, stat.st_mtime_ns
+
+
+def write_map_file(levels: List[np.ndarray], path: str, sources: List[str] | None = None) -> None:
+    """
+    Writes levels to a compiled map file.
+
+    Args:
+        levels: The hit points of every cell of every level.
+        path: Where to write the file.
+        sources: The text map each level was compiled from, if any.
+    """
+    index: np.ndarray = np.zeros(len(levels), dtype=INDEX_ENTRY)
+    offset: int = HEADER.size + index.nbytes
+    for entry, level in zip(index, levels):
+        entry["offset"] = offset
+        entry["rows"], entry["columns"] = level.shape
+        offset += level.size
+    for entry, source in zip(index, sources or []):
+        entry["number"], entry["size"], entry["mtime"] = text_map_stamp(source)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(levels)))
+        f.write(index.tobytes())
+        for level in levels:
+            f.write(np.ascontiguousarray(level, dtype=np.uint8).tobytes())
+
+
+class MapFile:
+    """A memory-mapped compiled map file."""
+
+    def __init__(self, path: str) -> None:
+        """
+        Opens a compiled map file. Only the header is read.
+
+        Args:
+            path: The map file.
+
+        Raises:
+            ValueError: If the file is not a compiled map file.
+        """
+        with open(path, "rb") as f:
+            self.data: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = HEADER.unpack_from(self.data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled map file")
+        self.index: np.ndarray = np.frombuffer(self.data, dtype=INDEX_ENTRY, count=count, offset=HEADER.size)
+
+    def __len__(self) -> int:
+        """Returns the number of levels in the file."""
+        return len(self.index)
+
+    def level(self, level_index: int) -> np.ndarray:
+        """
+        Returns a read-only view of a level's hit points.
+
+        Args:
+            level_index: The index of the level.
+
+        Returns:
+            The hit points of every cell, one row per row of bricks.
+        """
+        offset, columns, rows = self.index[level_index].tolist()[:3]
+        return np.frombuffer(self.data, dtype=np.uint8, count=rows * columns, offset=offset).reshape(rows, columns)
+
+    def matches(self, level_index: int, source: str) -> bool:
+        """
+        Returns True if a level was compiled from a text map that has not changed since.
+
+        Args:
+            level_index: The index of the level.
+            source: The text map of the level.
+
+        Returns:
+            True if the text map has the number, size and modification time recorded for the level.
+        """
+        try:
+            stamp: Tuple[int, int, int] = text_map_stamp(source)
+        except (OSError, ValueError):
+            return False
+        return stamp == tuple(self.index[level_index].tolist()[3:])
+
+
+def main() -> None:
+    """Compiles a directory of text maps from the command line."""
+    parser = argparse.ArgumentParser(description="Compile Box Breaker text maps.")
+    parser.add_argument("source", nargs="?", default=MAP_DIR, help="directory of map.N files")
+    parser.add_argument("output", nargs="?", help="compiled file to write, by default in the source directory")
+    args = parser.parse_args()
+    output: str = args.output or os.path.join(args.source, COMPILED_MAPS)
+    paths: List[str] = text_map_files(args.source)
+    levels: List[np.ndarray] = [parse_text_map(path) for path in paths]
+    write_map_file(levels, output, paths)
+    print(f"Wrote {len(levels)} levels to {output}")
+
+
+if __name__ == "__main__":
+    main()
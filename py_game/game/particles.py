@@ -0,0 +1,140 @@
+"""
+This module contains the array-backed particle system.
+"""
+
+import numpy as np
+import pygame
+from typing import Dict, List, Tuple
+
+from .constants import FPS, PARTICLE_CAPACITY
+
+
+class ParticleSystem:
+    """
+    The particles that are created when a brick is destroyed.
+
+    Positions, velocities, remaining life and image indices live in NumPy
+    arrays that are updated in one vectorised step per frame. The arrays form
+    a ring buffer: when it is full, new particles replace the oldest ones.
+    """
+
+    GRAVITY: float = 0.1
+    LIFETIME: int = FPS * 2  # 2 seconds
+
+    def __init__(
+        self,
+        particle_images: Dict[str, List[pygame.Surface]] | None = None,
+        capacity: int = PARTICLE_CAPACITY,
+    ) -> None:
+        """
+        Initializes the ParticleSystem.
+
+        Args:
+            particle_images: The particle images for each brick colour, if they are loaded yet.
+            capacity: The maximum number of live particles.
+        """
+        self.capacity: int = capacity
+        self.images: List[pygame.Surface] = []
+        self.color_ranges: Dict[str, Tuple[int, int]] = {}
+        self.half_sizes: np.ndarray = np.zeros((0, 2), dtype=np.float32)
+        if particle_images is not None:
+            self.set_images(particle_images)
+        self.positions: np.ndarray = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocities: np.ndarray = np.zeros((capacity, 2), dtype=np.float32)
+        self.life: np.ndarray = np.zeros(capacity, dtype=np.int32)
+        self.image_index: np.ndarray = np.zeros(capacity, dtype=np.int32)
+        self.next_slot: int = 0
+        self.rng: np.random.Generator = np.random.default_rng()
+        self.has_fblits: bool = hasattr(pygame.Surface, "fblits")
+
+    def seed(self, seed: int) -> None:
+        """
+        Seeds the random number generator that scatters new particles.
+
+        Args:
+            seed: The seed.
+        """
+        self.rng = np.random.default_rng(seed)
+
+    def set_images(self, particle_images: Dict[str, List[pygame.Surface]]) -> None:
+        """
+        Sets the images to draw particles with. Colours without images emit nothing.
+
+        Args:
+            particle_images: The particle images for each brick colour.
+        """
+        self.images = []
+        self.color_ranges = {}
+        for color, images in particle_images.items():
+            self.color_ranges[color] = (len(self.images), len(images))
+            self.images.extend(images)
+        self.half_sizes = np.array(
+            [(image.get_width() / 2, image.get_height() / 2) for image in self.images], dtype=np.float32
+        ).reshape(-1, 2)
+
+    def __len__(self) -> int:
+        """Returns the number of live particles."""
+        return int(np.count_nonzero(self.life > 0))
+
+    def clear(self) -> None:
+        """Removes all particles."""
+        self.life[:] = 0
+
+    def emit(self, x: float, y: float, color: str, count: int = 5) -> None:
+        """
+        Creates particles at a position.
+
+        Args:
+            x: The x-coordinate of the particles.
+            y: The y-coordinate of the particles.
+            color: The color of the particles.
+            count: The number of particles to create.
+        """
+        start, num_images = self.color_ranges.get(color, (0, 0))
+        if num_images == 0 or count <= 0:
+            return
+        count = min(count, self.capacity)
+        slots: np.ndarray = (self.next_slot + np.arange(count)) % self.capacity
+        self.next_slot = int(slots[-1] + 1) % self.capacity
+
+        self.positions[slots] = (x, y)
+        self.velocities[slots, 0] = self.rng.uniform(-2, 2, count)
+        self.velocities[slots, 1] = self.rng.uniform(-5, 0, count)
+        self.life[slots] = self.LIFETIME
+        self.image_index[slots] = start + self.rng.integers(0, num_images, count)
+
+    def update(self) -> None:
+        """Updates the positions and life of all particles."""
+        self.velocities[:, 1] += self.GRAVITY
+        self.positions += self.velocities
+        np.subtract(self.life, 1, out=self.life, where=self.life > 0)
+
+    def _live(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the image indices and top-left corners of the live particles."""
+        alive: np.ndarray = np.flatnonzero(self.life > 0)
+        image_index: np.ndarray = self.image_index[alive]
+        topleft: np.ndarray = (self.positions[alive] - self.half_sizes[image_index]).astype(np.int32)
+        return image_index, topleft
+
+    def rects(self) -> List[pygame.Rect]:
+        """Returns the rects the live particles will be drawn at."""
+        image_index, topleft = self._live()
+        sizes: np.ndarray = (self.half_sizes[image_index] * 2).astype(np.int32)
+        return [pygame.Rect(x, y, w, h) for (x, y), (w, h) in zip(topleft.tolist(), sizes.tolist())]
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """
+        Draws all live particles with a single batched blit call.
+
+        Args:
+            surface: The surface to draw on.
+        """
+        image_index, topleft = self._live()
+        if len(image_index) == 0:
+            return
+        images: List[pygame.Surface] = self.images
+        blit_sequence = [(images[index], position) for index, position in zip(image_index.tolist(), topleft.tolist())]
+        if self.has_fblits:
+            surface.fblits(blit_sequence)
+        else:
+            surface.blits(blit_sequence, doreturn=False)
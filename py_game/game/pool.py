@@ -0,0 +1,80 @@
+"""
+This module contains the object pool for short-lived entities.
+"""
+
+from typing import Any, Callable, Dict, Generic, List, TypeVar
+
+T = TypeVar("T")
+
+
+class EntityPool(Generic[T]):
+    """
+    A free list of deactivated entities that are reused instead of reallocated.
+
+    Pooled entities implement spawn(*args), which resets them for reuse with
+    the same arguments as their factory, and deactivate(), which parks them
+    (for physics entities, by setting body.active to False). Entities
+    released while the free list is full are discarded instead.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[..., T],
+        capacity: int,
+        discard: Callable[[T], None] | None = None,
+    ) -> None:
+        """
+        Initializes the EntityPool.
+
+        Args:
+            factory: Creates a new entity from the spawn arguments.
+            capacity: The most entities to keep in the free list.
+            discard: Frees an entity that does not fit in the free list.
+        """
+        self.factory: Callable[..., T] = factory
+        self.capacity: int = capacity
+        self.discard: Callable[[T], None] | None = discard
+        self.free: List[T] = []
+        self.hits: int = 0
+        self.misses: int = 0
+        self.discarded: int = 0
+
+    def acquire(self, *args: Any) -> T:
+        """
+        Returns a spawned entity, reusing a free one if there is any.
+
+        Args:
+            *args: The spawn arguments.
+
+        Returns:
+            The entity.
+        """
+        if self.free:
+            self.hits += 1
+            entity: T = self.free.pop()
+            entity.spawn(*args)
+            return entity
+        self.misses += 1
+        entity = self.factory(*args)
+        entity.pool = self
+        return entity
+
+    def release(self, entity: T) -> None:
+        """
+        Returns an entity to the pool. The caller has already killed its sprite.
+
+        Args:
+            entity: The entity to release.
+        """
+        if len(self.free) >= self.capacity:
+            self.discarded += 1
+            if self.discard is not None:
+                self.discard(entity)
+            entity.pool = None
+            return
+        entity.deactivate()
+        self.free.append(entity)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the pool's hit, miss and discard counts and its free entities."""
+        return {"hits": self.hits, "misses": self.misses, "discarded": self.discarded, "free": len(self.free)}
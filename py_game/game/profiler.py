@@ -0,0 +1,214 @@
+"""
+This module contains the per-phase frame profiler and its overlay.
+"""
+
+import numpy as np
+import pygame
+import time
+from typing import IO, List, Tuple
+
+from .constants import PROFILER_HISTORY, WHITE
+
+# The phases of a frame, in the order they run.
+PHASES: Tuple[str, ...] = (
+    "events",
+    "destroy",
+    "step",
+    "hud",
+    "sprites",
+    "powerups",
+    "scene",
+    "scale",
+    "flip",
+)
+PHASE_EVENTS: int = 0
+PHASE_DESTROY: int = 1
+PHASE_STEP: int = 2
+PHASE_HUD: int = 3
+PHASE_SPRITES: int = 4
+PHASE_POWERUPS: int = 5
+PHASE_SCENE: int = 6
+PHASE_SCALE: int = 7
+PHASE_FLIP: int = 8
+
+# The entity counts recorded with every frame.
+COUNTERS: Tuple[str, ...] = ("sprites", "particles", "bodies", "queued", "destroyed")
+
+PHASE_COLORS: Tuple[Tuple[int, int, int], ...] = (
+    (128, 128, 128),
+    (200, 60, 60),
+    (240, 160, 40),
+    (240, 240, 80),
+    (80, 200, 80),
+    (60, 200, 200),
+    (80, 120, 240),
+    (170, 90, 230),
+    (240, 110, 200),
+)
+
+
+class FrameProfiler:
+    """
+    Times the phases of every frame into a fixed-size ring buffer.
+
+    Callers mark the end of each phase with lap(); the time since the
+    previous lap is added to that phase, so a phase that runs several times
+    in one frame (such as a physics step) accumulates. While disabled, every
+    call returns immediately.
+    """
+
+    def __init__(self, history: int = PROFILER_HISTORY, csv_path: str | None = None) -> None:
+        """
+        Initializes the FrameProfiler.
+
+        Args:
+            history: The number of frames kept in the ring buffer.
+            csv_path: Where to write every recorded frame of the session, if anywhere.
+        """
+        self.history: int = history
+        self.csv_path: str | None = csv_path
+        self.enabled: bool = csv_path is not None
+        self.overlay_visible: bool = False
+        self.timings: np.ndarray = np.zeros((history, len(PHASES)), dtype=np.float64)
+        self.counts: np.ndarray = np.zeros((history, len(COUNTERS)), dtype=np.int64)
+        self.frames: int = 0
+        self.row: int = -1
+        self.last_time: float = 0.0
+        self.csv_file: IO[str] | None = None
+        self.csv_written: int = 0
+        self.font: pygame.font.Font | None = None
+
+    def begin_frame(self) -> None:
+        """Starts timing a new frame."""
+        if not self.enabled:
+            return
+        if self.row == self.history - 1 and self.csv_path is not None:
+            self._write_csv(self.history)
+        self.row = (self.row + 1) % self.history
+        self.timings[self.row] = 0.0
+        self.frames += 1
+        self.last_time = time.perf_counter()
+
+    def lap(self, phase: int) -> None:
+        """
+        Adds the time since the last lap to a phase of the current frame.
+
+        Args:
+            phase: One of the PHASE_* indices.
+        """
+        if not self.enabled or self.row < 0:
+            return
+        now: float = time.perf_counter()
+        self.timings[self.row, phase] += now - self.last_time
+        self.last_time = now
+
+    def end_frame(self, sprites: int, particles: int, bodies: int, queued: int, destroyed: int) -> None:
+        """
+        Records the entity counts of the current frame.
+
+        Args:
+            sprites: The number of sprites.
+            particles: The number of live particles.
+            bodies: The number of Box2D bodies.
+            queued: The number of bodies and fixtures queued for destruction this frame.
+            destroyed: The number of bodies and fixtures destroyed this frame.
+        """
+        if not self.enabled or self.row < 0:
+            return
+        self.counts[self.row] = (sprites, particles, bodies, queued, destroyed)
+
+    def toggle_overlay(self) -> None:
+        """Shows or hides the overlay. Frames are recorded while it is shown."""
+        self.overlay_visible = not self.overlay_visible
+        self.enabled = self.overlay_visible or self.csv_path is not None
+
+    def recent(self, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the timings and counts of the most recent frames, oldest first.
+
+        Args:
+            count: The maximum number of frames to return.
+
+        Returns:
+            The timings in seconds per phase and the entity counts.
+        """
+        count = min(count, self.frames, self.history)
+        rows: np.ndarray = np.arange(self.row - count + 1, self.row + 1) % self.history
+        return self.timings[rows], self.counts[rows]
+
+    def _write_csv(self, count: int) -> None:
+        """
+        Appends the last recorded frames to the CSV file.
+
+        Args:
+            count: The number of frames to write, ending with the current one.
+        """
+        if self.csv_file is None:
+            self.csv_file = open(self.csv_path, "w")
+            header: List[str] = ["frame"] + [f"{phase}_ms" for phase in PHASES] + list(COUNTERS)
+            self.csv_file.write(",".join(header) + "\n")
+        timings, counts = self.recent(count)
+        first_frame: int = self.frames - len(timings)
+        for offset, (frame_timings, frame_counts) in enumerate(zip(timings.tolist(), counts.tolist())):
+            values: List[str] = [str(first_frame + offset)]
+            values.extend(f"{seconds * 1000:.4f}" for seconds in frame_timings)
+            values.extend(str(value) for value in frame_counts)
+            self.csv_file.write(",".join(values) + "\n")
+        self.csv_written = self.frames
+
+    def close(self) -> None:
+        """Writes the frames not yet in the CSV file and closes it."""
+        if self.csv_path is None:
+            return
+        try:
+            if self.frames > self.csv_written:
+                self._write_csv(self.frames - self.csv_written)
+            if self.csv_file is not None:
+                self.csv_file.close()
+                self.csv_file = None
+        except IOError as e:
+            print(f"Error writing profile: {e}")
+
+    def draw_overlay(self, surface: pygame.Surface, frames: int = 200, height: int = 60) -> None:
+        """
+        Draws a stacked graph of the recent frame timings and the latest counts.
+
+        Args:
+            surface: The surface to draw on.
+            frames: The number of frames to show, one pixel column each.
+            height: The height of the graph. The top of the graph is 1/30 s.
+        """
+        # The current frame is still being timed, so show the ones before it.
+        timings, counts = self.recent(frames + 1)
+        timings, counts = timings[:-1], counts[:-1]
+        if len(timings) == 0:
+            return
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18)
+
+        # Build the graph as a pixel array: each column is one frame, with
+        # the phases stacked from the bottom up.
+        pixels_per_second: float = height * 30
+        tops: np.ndarray = np.minimum(np.cumsum(timings, axis=1) * pixels_per_second, height)
+        bottoms: np.ndarray = np.hstack([np.zeros((len(tops), 1)), tops[:, :-1]])
+        heights: np.ndarray = np.arange(height)[::-1][None, :]
+        graph: np.ndarray = np.zeros((len(timings), height, 3), dtype=np.uint8)
+        for phase, color in enumerate(PHASE_COLORS):
+            mask: np.ndarray = (heights >= bottoms[:, phase : phase + 1]) & (heights < tops[:, phase : phase + 1])
+            graph[mask] = color
+        graph_surface: pygame.Surface = pygame.surfarray.make_surface(graph)
+
+        left: int = surface.get_width() - len(timings) - 10
+        top: int = surface.get_height() - height - 54
+        surface.fill((0, 0, 0), (left - 4, top - 4, len(timings) + 8, height + 52))
+        surface.blit(graph_surface, (left, top))
+
+        frame_ms: float = float(timings.sum(axis=1).mean()) * 1000
+        sprites, particles, bodies, queued, destroyed = counts[-1].tolist()
+        lines: List[str] = [
+            f"{frame_ms:.2f} ms/frame",
+            f"sprites {sprites}  particles {particles}  bodies {bodies}",
+            f"removals queued {queued}  destroyed {destroyed}",
+        ]
+        for index, line in enumerate(lines):
+            surface.blit(self.font.render(line, True, WHITE), (left, top + height + 4 + index * 14))
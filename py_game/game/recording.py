@@ -0,0 +1,186 @@
+"""
+This module contains game recordings.
+
+A recording is a game's seed and start level plus the input of every
+simulation frame: the paddle x-coordinate and the number of launch and
+shoot clicks. Since the game is deterministic for a seed, that is enough to
+play it again exactly. Every REPLAY_CHECKPOINT_INTERVAL frames the score
+and lives are recorded too, and playback checks them to catch a replay that
+plays out differently.
+
+A recording file starts with a header, followed by the zlib-compressed
+frames and checkpoints. Play one back with game.replay.
+"""
+
+import struct
+import zlib
+import numpy as np
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from .constants import REPLAY_CHECKPOINT_INTERVAL
+from .controls import InputFrame, InputSource, LAUNCH, SHOOT
+
+if TYPE_CHECKING:
+    from .game import Game
+
+MAGIC: bytes = b"BXRPLY01"
+# Magic, seed, start level, number of frames and number of checkpoints.
+HEADER: struct.Struct = struct.Struct("<8sQIII")
+# The paddle x-coordinate, or NO_PADDLE_X, and the launch count in the low
+# four bits of actions and the shoot count in the high four bits.
+FRAME: np.dtype = np.dtype([("x", "<i2"), ("actions", "u1")])
+# The score and lives at the start of a frame.
+CHECKPOINT: np.dtype = np.dtype([("frame", "<u4"), ("score", "<i4"), ("lives", "<i2")])
+NO_PADDLE_X: int = -32768
+
+
+class Recording:
+    """The seed, start level and per-frame input of one game."""
+
+    def __init__(self, seed: int, level: int) -> None:
+        """
+        Initializes the Recording.
+
+        Args:
+            seed: The seed the game was started with.
+            level: The level the game was started on.
+        """
+        self.seed: int = seed
+        self.level: int = level
+        self.frames: List[Tuple[int, int]] = []
+        self.checkpoints: List[Tuple[int, int, int]] = []
+
+    def __len__(self) -> int:
+        """Returns the number of recorded frames."""
+        return len(self.frames)
+
+    def record(self, frame: InputFrame, game: "Game") -> None:
+        """
+        Records the input of the next frame, and a checkpoint if one is due.
+
+        Args:
+            frame: The paddle x-coordinate and the actions performed.
+            game: The main game object, before the frame is played.
+        """
+        if len(self.frames) % REPLAY_CHECKPOINT_INTERVAL == 0:
+            self.checkpoints.append((len(self.frames), game.score, game.lives))
+        x, actions = frame
+        launches: int = min(actions.count(LAUNCH), 15)
+        shots: int = min(actions.count(SHOOT), 15)
+        self.frames.append((NO_PADDLE_X if x is None else x, launches | shots << 4))
+
+    def finish(self, game: "Game") -> None:
+        """
+        Records the final checkpoint, after the last frame.
+
+        Args:
+            game: The main game object.
+        """
+        self.checkpoints.append((len(self.frames), game.score, game.lives))
+
+    def frame(self, index: int) -> InputFrame:
+        """
+        Returns the input of a recorded frame.
+
+        Args:
+            index: The index of the frame.
+
+        Returns:
+            The paddle x-coordinate and the actions to perform.
+        """
+        x, actions = self.frames[index]
+        return (None if x == NO_PADDLE_X else x), [LAUNCH] * (actions & 0xF) + [SHOOT] * (actions >> 4)
+
+    def save(self, path: str) -> None:
+        """
+        Writes the recording to a file.
+
+        Args:
+            path: Where to write the recording.
+        """
+        frames: np.ndarray = np.array(self.frames, dtype=FRAME)
+        checkpoints: np.ndarray = np.array(self.checkpoints, dtype=CHECKPOINT)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.seed, self.level, len(frames), len(checkpoints)))
+            f.write(zlib.compress(frames.tobytes() + checkpoints.tobytes(), 9))
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        """
+        Reads a recording from a file.
+
+        Args:
+            path: The recording file.
+
+        Returns:
+            The recording.
+
+        Raises:
+            ValueError: If the file is not a recording.
+        """
+        with open(path, "rb") as f:
+            data: bytes = f.read()
+        magic, seed, level, frame_count, checkpoint_count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a recording")
+        body: bytes = zlib.decompress(data[HEADER.size :])
+        frames: np.ndarray = np.frombuffer(body, dtype=FRAME, count=frame_count)
+        checkpoints: np.ndarray = np.frombuffer(
+            body, dtype=CHECKPOINT, count=checkpoint_count, offset=frames.nbytes
+        )
+        recording: Recording = cls(seed, level)
+        recording.frames = frames.tolist()
+        recording.checkpoints = checkpoints.tolist()
+        return recording
+
+
+class ReplayInput(InputSource):
+    """Plays back a recording, checking its checkpoints along the way."""
+
+    def __init__(self, recording: Recording) -> None:
+        """
+        Initializes the ReplayInput.
+
+        Args:
+            recording: The recording to play.
+        """
+        self.recording: Recording = recording
+        self.position: int = 0
+        self.checkpoints: Dict[int, Tuple[int, int]] = {
+            frame: (score, lives) for frame, score, lives in recording.checkpoints
+        }
+        # The first checkpoint that did not match: (frame, expected, actual).
+        self.mismatch: Tuple[int, Tuple[int, int], Tuple[int, int]] | None = None
+
+    @property
+    def finished(self) -> bool:
+        """True once every recorded frame has been played."""
+        return self.position >= len(self.recording)
+
+    def check(self, game: "Game") -> None:
+        """
+        Compares the game with the checkpoint of the current frame, if there is one.
+
+        Args:
+            game: The main game object.
+        """
+        expected: Tuple[int, int] | None = self.checkpoints.get(self.position)
+        if expected is not None and self.mismatch is None and expected != (game.score, game.lives):
+            self.mismatch = (self.position, expected, (game.score, game.lives))
+
+    def poll(self, game: "Game") -> InputFrame:
+        """
+        Returns the next recorded frame, or no input once the recording ends.
+
+        Args:
+            game: The main game object.
+
+        Returns:
+            The paddle x-coordinate and the actions to perform.
+        """
+        self.check(game)
+        if self.finished:
+            return None, ()
+        frame: InputFrame = self.recording.frame(self.position)
+        self.position += 1
+        return frame
@@ -0,0 +1,139 @@
+"""
+This module contains the dirty-rectangle renderer for the gameplay screen.
+"""
+
+import pygame
+from typing import TYPE_CHECKING, Dict, Hashable, List, Tuple
+
+if TYPE_CHECKING:
+    from .particles import ParticleSystem
+
+# A drawable item is a key identifying it between frames, its image and the
+# rect it is drawn at.
+DrawItem = Tuple[Hashable, pygame.Surface, pygame.Rect]
+
+
+class DirtyRenderer:
+    """
+    Redraws only the regions of a surface that changed since the last frame.
+
+    The renderer remembers the image and rect every item was drawn with. Items
+    that moved, changed image, appeared or disappeared mark their old and new
+    rects dirty, as do the particles of this frame and the last one. The
+    background is restored under the dirty rects and everything overlapping
+    them is drawn again, in order.
+    """
+
+    def __init__(
+        self, surface: pygame.Surface, background: pygame.Surface | None = None, max_rects: int = 64
+    ) -> None:
+        """
+        Initializes the DirtyRenderer.
+
+        Args:
+            surface: The surface to draw on.
+            background: The image behind all items. Without one, set it before drawing.
+            max_rects: The number of dirty rects above which a frame is redrawn in full.
+        """
+        self.surface: pygame.Surface = surface
+        self.background: pygame.Surface | None = background
+        self.bounds: pygame.Rect = surface.get_rect()
+        self.max_rects: int = max_rects
+        self.drawn: Dict[Hashable, Tuple[pygame.Surface, pygame.Rect]] = {}
+        self.particle_rects: List[pygame.Rect] = []
+        self.full_redraw_needed: bool = True
+
+    def invalidate(self) -> None:
+        """Forces the next frame to be redrawn in full."""
+        self.full_redraw_needed = True
+
+    def set_background(self, background: pygame.Surface) -> None:
+        """
+        Replaces the image behind all items.
+
+        Args:
+            background: The new background.
+        """
+        if background is not self.background:
+            self.background = background
+            self.full_redraw_needed = True
+
+    def draw(
+        self,
+        items: List[DrawItem],
+        particles: "ParticleSystem",
+        overlay: List[DrawItem],
+        changed: List[pygame.Rect] | None = None,
+    ) -> List[pygame.Rect] | None:
+        """
+        Draws a frame.
+
+        Args:
+            items: The sprites to draw, back to front.
+            particles: The particles, drawn over the sprites.
+            overlay: The items drawn over the particles, such as the HUD.
+            changed: The regions of the background that changed since the last frame.
+
+        Returns:
+            The rects that changed, or None if the whole surface was redrawn.
+        """
+        previous: Dict[Hashable, Tuple[pygame.Surface, pygame.Rect]] = self.drawn
+        current: Dict[Hashable, Tuple[pygame.Surface, pygame.Rect]] = {}
+        dirty: List[pygame.Rect] = list(changed) if changed else []
+        for key, image, rect in items + overlay:
+            drawn = previous.pop(key, None)
+            if drawn is not None:
+                if drawn[0] is image and drawn[1] == rect:
+                    current[key] = drawn
+                    continue
+                dirty.append(drawn[1])
+            new_rect: pygame.Rect = rect.copy()
+            dirty.append(new_rect)
+            current[key] = (image, new_rect)
+        # Whatever is left was drawn last frame but is gone now.
+        dirty.extend(rect for _, rect in previous.values())
+        self.drawn = current
+
+        particle_rects: List[pygame.Rect] = particles.rects()
+        dirty.extend(self.particle_rects)
+        dirty.extend(particle_rects)
+        self.particle_rects = particle_rects
+
+        drawn_items: List[Tuple[pygame.Surface, pygame.Rect]] = list(current.values())
+        num_items: int = len(items)
+        if self.full_redraw_needed or len(dirty) > self.max_rects:
+            # Past max_rects one full redraw is cheaper than many small ones.
+            self.full_redraw_needed = False
+            self.surface.blit(self.background, (0, 0))
+            self.surface.blits(drawn_items[:num_items], doreturn=False)
+            particles.draw(self.surface)
+            self.surface.blits(drawn_items[num_items:], doreturn=False)
+            return None
+
+        dirty = [rect.clip(self.bounds) for rect in dirty]
+        dirty = [rect for rect in dirty if rect.width and rect.height]
+        if not dirty:
+            return dirty
+
+        # Overlay items touching a dirty rect are redrawn whole, on top of the
+        # particles, so their whole area has to be restored first.
+        item_rects: List[pygame.Rect] = [rect for _, rect in drawn_items[:num_items]]
+        overlay_items: List[Tuple[pygame.Surface, pygame.Rect]] = [
+            (image, rect) for image, rect in drawn_items[num_items:] if rect.collidelist(dirty) != -1
+        ]
+        dirty.extend(rect.clip(self.bounds) for _, rect in overlay_items)
+
+        # Clipping keeps items redrawn in a dirty rect from covering the parts
+        # of items above them that are outside it.
+        for dirty_rect in dirty:
+            self.surface.set_clip(dirty_rect)
+            self.surface.blit(self.background, dirty_rect, dirty_rect)
+            self.surface.blits(
+                [drawn_items[index] for index in dirty_rect.collidelistall(item_rects)], doreturn=False
+            )
+        # Every live particle lies within a dirty rect, so they can all be
+        # drawn in one batch without clipping.
+        self.surface.set_clip(None)
+        particles.draw(self.surface)
+        self.surface.blits(overlay_items, doreturn=False)
+        return dirty
@@ -0,0 +1,134 @@
+"""
+This module plays back game recordings.
+
+Recordings play through the normal update path. They play headless and
+uncapped, with their checkpoints checked, or in a window after jumping to a
+frame without drawing the frames before it:
+
+    python -m game.replay FILE [--seek FRAME] [--watch]
+"""
+
+import argparse
+import time
+import pygame
+from typing import Dict
+
+from .constants import MAX_RENDER_FPS
+from .game import Game
+from .recording import Recording, ReplayInput
+
+
+def start_replay(game: Game, recording: Recording) -> ReplayInput:
+    """
+    Starts a recorded game.
+
+    Args:
+        game: The game to play the recording on.
+        recording: The recording to play.
+
+    Returns:
+        The input source playing the recording.
+    """
+    replay: ReplayInput = ReplayInput(recording)
+    game.input = replay
+    game.reset_world()
+    game._start_game(new_game=True, level=recording.level, seed=recording.seed)
+    return replay
+
+
+def fast_forward(game: Game, replay: ReplayInput, frame: int | None = None) -> None:
+    """
+    Plays a recording through the normal update path without drawing, as fast as the CPU allows.
+
+    Args:
+        game: The game playing the recording.
+        replay: The input source playing the recording.
+        frame: The frame to stop at. Defaults to the end of the recording.
+    """
+    end: int = len(replay.recording) if frame is None else min(frame, len(replay.recording))
+    while replay.position < end and game.game_mode == "playing":
+        game._update()
+    if replay.finished:
+        replay.check(game)
+
+
+def play_recording(path: str, frame: int | None = None) -> Dict[str, float]:
+    """
+    Plays a recording headless and checks it against its checkpoints.
+
+    Args:
+        path: The recording file.
+        frame: The frame to stop at. Defaults to the end of the recording.
+
+    Returns:
+        The frames played, elapsed seconds, frames per second and the final
+        score and lives, and the frame of the first checkpoint that did not
+        match, or -1.
+    """
+    recording: Recording = Recording.load(path)
+    game: Game = Game(headless=True)
+    replay: ReplayInput = start_replay(game, recording)
+    start: float = time.perf_counter()
+    fast_forward(game, replay, frame)
+    elapsed: float = time.perf_counter() - start
+    return {
+        "frames": replay.position,
+        "seconds": elapsed,
+        "fps": replay.position / elapsed if elapsed > 0 else 0.0,
+        "score": game.score,
+        "lives": game.lives,
+        "mismatch_frame": replay.mismatch[0] if replay.mismatch else -1,
+    }
+
+
+def watch_recording(path: str, frame: int = 0) -> None:
+    """
+    Jumps to a frame of a recording without drawing, then plays the rest in a window.
+
+    Args:
+        path: The recording file.
+        frame: The frame to start watching from.
+    """
+    recording: Recording = Recording.load(path)
+    # A replay is not the player's own game, so it neither touches the save nor is recorded again.
+    game: Game = Game(saves_progress=False)
+    replay: ReplayInput = start_replay(game, recording)
+    fast_forward(game, replay, frame)
+    game.sim_clock.reset()
+    while game.game_mode == "playing" and not replay.finished:
+        if any(event.type == pygame.QUIT for event in pygame.event.get()):
+            break
+        for _ in range(game.sim_clock.advance(game.clock.tick(MAX_RENDER_FPS) / 1000)):
+            game._update()
+        game.audio.flush()
+        game._draw()
+    if replay.mismatch:
+        frame, expected, actual = replay.mismatch
+        print(f"Replay diverged at frame {frame}: expected score/lives {expected}, got {actual}")
+    pygame.quit()
+
+
+def main() -> None:
+    """Plays a recording from the command line."""
+    parser = argparse.ArgumentParser(description="Play a Box Breaker recording.")
+    parser.add_argument("path", help="recording file")
+    parser.add_argument("--seek", type=int, help="frame to stop at, or to start watching from")
+    parser.add_argument("--watch", action="store_true", help="watch the recording in a window")
+    args = parser.parse_args()
+
+    if args.watch:
+        watch_recording(args.path, args.seek or 0)
+        return
+    result: Dict[str, float] = play_recording(args.path, args.seek)
+    print(
+        f"{result['frames']} frames in {result['seconds']:.2f}s "
+        f"({result['fps']:.0f} frames/sec), score {result['score']}, lives {result['lives']}"
+    )
+    if result["mismatch_frame"] >= 0:
+        print(f"Replay diverged: checkpoint at frame {result['mismatch_frame']} did not match")
+        raise SystemExit(1)
+    print("All checkpoints matched")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+This module contains the save file.
+
+The save file holds the player's progress, high scores, best level times and
+stats as versioned JSON. It is read once when the game starts and served from
+memory after that. Changes are written on a background thread, to a temporary
+file that then replaces the save file, so the game never waits for the disk
+and a crash during a write leaves the previous save intact.
+"""
+
+import copy
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from .constants import SAVE_VERSION, HIGH_SCORE_COUNT
+
+# A new save. Keys missing from a loaded save are filled in from here.
+DEFAULT_SAVE: Dict[str, Any] = {
+    "version": SAVE_VERSION,
+    "level": 0,
+    "high_scores": [],
+    "best_times": {},
+    "stats": {"games_played": 0, "levels_cleared": 0, "total_score": 0},
+}
+
+
+class SaveFile:
+    """
+    The save file, held in memory and written in the background.
+
+    Reads and changes only touch memory. flush() writes the changes made
+    since the last flush, and close() waits for the writes to finish. A
+    SaveFile without a path lives only in memory, for games that keep no
+    progress.
+    """
+
+    def __init__(self, path: str | None, legacy_path: str | None = None) -> None:
+        """
+        Initializes the SaveFile and loads the save.
+
+        Args:
+            path: The JSON save file, or None to neither read nor write one.
+            legacy_path: The save file of older versions, which held only the
+                level. Its level is carried over when there is no JSON save yet.
+        """
+        self.path: str | None = path
+        self.legacy_path: str | None = legacy_path
+        self.data: Dict[str, Any] = copy.deepcopy(DEFAULT_SAVE)
+        self.dirty: bool = False
+        # False when the save file is from a newer version, so it is not overwritten.
+        self.writable: bool = path is not None
+        self.executor: ThreadPoolExecutor | None = None
+        if path is not None:
+            self.load()
+
+    def load(self) -> None:
+        """Reads the save file, or migrates the legacy one."""
+        try:
+            with open(self.path, "r") as f:
+                data: Dict[str, Any] = json.load(f)
+        except FileNotFoundError:
+            self._load_legacy()
+            return
+        except (IOError, ValueError) as e:
+            print(f"Error loading save: {e}")
+            self._load_legacy()
+            return
+        if not isinstance(data, dict) or data.get("version", 0) > SAVE_VERSION:
+            print(f"Error loading save: unsupported save file {self.path}")
+            self.writable = False
+            return
+        for key, value in DEFAULT_SAVE.items():
+            data.setdefault(key, copy.deepcopy(value))
+        data["version"] = SAVE_VERSION
+        self.data = data
+
+    def _load_legacy(self) -> None:
+        """Carries the level over from a legacy save file, which is left in place."""
+        if self.legacy_path is None:
+            return
+        try:
+            with open(self.legacy_path, "r") as f:
+                self.data["level"] = int(f.read().strip())
+        except FileNotFoundError:
+            return
+        except (IOError, ValueError) as e:
+            print(f"Error loading progress: {e}")
+            return
+        # Written out with the next change, or when the game closes.
+        self.dirty = True
+
+    @property
+    def level(self) -> int:
+        """The level to continue from."""
+        return self.data["level"]
+
+    @property
+    def has_save(self) -> bool:
+        """True if there is a game to continue."""
+        return self.data["level"] > 0
+
+    @property
+    def high_scores(self) -> List[Dict[str, Any]]:
+        """The best scores, highest first."""
+        return self.data["high_scores"]
+
+    def unlock(self, level: int) -> None:
+        """
+        Saves the level to continue from, if it is further than the saved one.
+
+        Args:
+            level: The level reached.
+        """
+        if level > self.data["level"]:
+            self.data["level"] = level
+            self.dirty = True
+
+    def record_level(self, level: int, seconds: float) -> None:
+        """
+        Records a cleared level and its time, if it is the best one.
+
+        Args:
+            level: The level cleared.
+            seconds: The time the level took, in simulated seconds.
+        """
+        self.data["stats"]["levels_cleared"] += 1
+        best_times: Dict[str, float] = self.data["best_times"]
+        key: str = str(level)
+        if key not in best_times or seconds < best_times[key]:
+            best_times[key] = round(seconds, 2)
+        self.dirty = True
+
+    def record_game(self, score: int, level: int) -> None:
+        """
+        Records a finished game and its score, if it makes the high scores.
+
+        Args:
+            score: The final score.
+            level: The level the game ended on.
+        """
+        stats: Dict[str, int] = self.data["stats"]
+        stats["games_played"] += 1
+        stats["total_score"] += score
+        high_scores: List[Dict[str, Any]] = self.data["high_scores"]
+        high_scores.append({"score": score, "level": level, "date": time.strftime("%Y-%m-%d")})
+        high_scores.sort(key=lambda entry: entry["score"], reverse=True)
+        del high_scores[HIGH_SCORE_COUNT:]
+        self.dirty = True
+
+    def flush(self) -> None:
+        """Writes the changes made since the last flush in the background."""
+        if not self.dirty or not self.writable:
+            return
+        self.dirty = False
+        # The data is serialised now, so the writer never sees it half-changed.
+        text: str = json.dumps(self.data, indent=2)
+        if self.executor is None:
+            # A single writer keeps the writes in order.
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save")
+        self.executor.submit(self._write, text)
+
+    def _write(self, text: str) -> None:
+        """
+        Writes the save file atomically.
+
+        Args:
+            text: The contents of the save file.
+        """
+        temporary_path: str = self.path + ".tmp"
+        try:
+            with open(temporary_path, "w") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary_path, self.path)
+        except OSError as e:
+            print(f"Error saving progress: {e}")
+
+    def close(self) -> None:
+        """Writes any remaining changes and waits for every write to finish."""
+        self.flush()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
@@ -0,0 +1,220 @@
+"""
+This module scales the fixed-size game surface to the window.
+"""
+
+import pygame
+from typing import List, Tuple
+
+from .constants import SCREEN_WIDTH, SCREEN_HEIGHT, BLACK
+
+SCALE_MODES: Tuple[str, ...] = ("smooth", "integer", "scaled")
+
+
+class Scaler:
+    """
+    Owns the display surface and presents the game surface on it.
+
+    The geometry (scale factor, destination rect, black bars) and the scaled
+    destination surface are only recomputed when the window size changes.
+
+    Modes:
+        smooth: Bilinear scaling to the largest size that fits the window.
+        integer: Nearest-neighbour scaling by the largest whole factor that
+            fits, falling back to smooth when the window is smaller than the game.
+        scaled: SDL's SCALED display flag, which scales on the GPU.
+    """
+
+    def __init__(self, mode: str = "smooth") -> None:
+        """
+        Initializes the Scaler.
+
+        Args:
+            mode: One of SCALE_MODES.
+        """
+        if mode not in SCALE_MODES:
+            raise ValueError(f"Unknown scale mode {mode!r}, expected one of {SCALE_MODES}")
+        self.mode: str = mode
+        self.screen: pygame.Surface | None = None
+        self.scale: float = 1.0
+        self.dest_rect: pygame.Rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.bars: List[pygame.Rect] = []
+        self.smooth: bool = True
+        self.scaled_surface: pygame.Surface | None = None
+
+    def create_screen(self, resizable: bool = True) -> pygame.Surface:
+        """
+        Opens the display.
+
+        Args:
+            resizable: True to let the user resize the window.
+
+        Returns:
+            The display surface.
+        """
+        flags: int = pygame.RESIZABLE if resizable else 0
+        if self.mode == "scaled":
+            try:
+                self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags | pygame.SCALED)
+                self._update_geometry()
+                return self.screen
+            except pygame.error as e:
+                print(f"Failed to open a SCALED display, using smooth scaling: {e}")
+                self.mode = "smooth"
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags)
+        self._update_geometry()
+        return self.screen
+
+    def handle_resize(self, size: Tuple[int, int]) -> pygame.Surface:
+        """
+        Resizes the display after a VIDEORESIZE event.
+
+        Args:
+            size: The new window size.
+
+        Returns:
+            The display surface.
+        """
+        # With SCALED, SDL keeps the logical size and scales for us.
+        if self.mode != "scaled":
+            self.screen = pygame.display.set_mode(size, pygame.RESIZABLE)
+        self._update_geometry()
+        return self.screen
+
+    def _update_geometry(self) -> None:
+        """Recomputes the scale, placement and destination surface for the window size."""
+        screen_width, screen_height = self.screen.get_size()
+        scale: float = min(screen_width / SCREEN_WIDTH, screen_height / SCREEN_HEIGHT)
+        self.smooth = self.mode == "smooth" or scale < 1
+        if not self.smooth:
+            scale = float(int(scale))
+        self.scale = scale
+
+        scaled_width: int = int(SCREEN_WIDTH * scale)
+        scaled_height: int = int(SCREEN_HEIGHT * scale)
+        self.dest_rect = pygame.Rect(
+            (screen_width - scaled_width) // 2,
+            (screen_height - scaled_height) // 2,
+            scaled_width,
+            scaled_height,
+        )
+        self.bars = [
+            rect
+            for rect in (
+                pygame.Rect(0, 0, screen_width, self.dest_rect.top),
+                pygame.Rect(0, self.dest_rect.bottom, screen_width, screen_height - self.dest_rect.bottom),
+                pygame.Rect(0, self.dest_rect.top, self.dest_rect.left, scaled_height),
+                pygame.Rect(
+                    self.dest_rect.right, self.dest_rect.top, screen_width - self.dest_rect.right, scaled_height
+                ),
+            )
+            if rect.width > 0 and rect.height > 0
+        ]
+        self.scaled_surface = None
+        if self.dest_rect.size != (SCREEN_WIDTH, SCREEN_HEIGHT):
+            # Same default format as the game surface, as the transforms require.
+            self.scaled_surface = pygame.Surface(self.dest_rect.size)
+
+    def present(self, source: pygame.Surface) -> None:
+        """
+        Draws the whole game surface onto the display. The caller flips it.
+
+        Args:
+            source: The game surface.
+        """
+        for bar in self.bars:
+            self.screen.fill(BLACK, bar)
+        if self.scaled_surface is None:
+            self.screen.blit(source, self.dest_rect)
+            return
+        if self.smooth:
+            pygame.transform.smoothscale(source, self.dest_rect.size, self.scaled_surface)
+        else:
+            pygame.transform.scale(source, self.dest_rect.size, self.scaled_surface)
+        self.screen.blit(self.scaled_surface, self.dest_rect)
+
+    def present_rects(self, source: pygame.Surface, rects: List[pygame.Rect]) -> List[pygame.Rect]:
+        """
+        Draws parts of the game surface onto the display.
+
+        Args:
+            source: The game surface.
+            rects: The parts of the game surface to draw.
+
+        Returns:
+            The display rects that were drawn, for pygame.display.update.
+        """
+        updated: List[pygame.Rect] = []
+        for rect in self.merge_rects(rects) if self.scaled_surface is not None else rects:
+            screen_rect: pygame.Rect = self.to_screen_rect(rect)
+            if self.scaled_surface is None:
+                self.screen.blit(source, screen_rect, rect)
+            elif self.smooth:
+                self.screen.blit(
+                    pygame.transform.smoothscale(source.subsurface(rect), screen_rect.size), screen_rect
+                )
+            else:
+                self.screen.blit(pygame.transform.scale(source.subsurface(rect), screen_rect.size), screen_rect)
+            updated.append(screen_rect)
+        return updated
+
+    @staticmethod
+    def merge_rects(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+        """
+        Merges overlapping rects whose union is no larger than the two of them.
+
+        A sprite's old and new rects mostly overlap, so this roughly halves the
+        number of scaling calls of a frame without scaling more pixels.
+
+        Args:
+            rects: The rects to merge.
+
+        Returns:
+            Rects covering at least the same area.
+        """
+        merged: List[pygame.Rect] = []
+        for rect in rects:
+            rect = rect.copy()
+            merging: bool = True
+            while merging:
+                merging = False
+                for index in rect.collidelistall(merged):
+                    other: pygame.Rect = merged[index]
+                    union: pygame.Rect = rect.union(other)
+                    if union.width * union.height <= rect.width * rect.height + other.width * other.height:
+                        del merged[index]
+                        rect = union
+                        merging = True
+                        break
+            merged.append(rect)
+        return merged
+
+    def to_screen_rect(self, rect: pygame.Rect) -> pygame.Rect:
+        """
+        Maps a rect on the game surface to the display.
+
+        Args:
+            rect: The rect in game surface coordinates.
+
+        Returns:
+            The rect in display coordinates.
+        """
+        left: int = self.dest_rect.left + int(rect.left * self.scale)
+        top: int = self.dest_rect.top + int(rect.top * self.scale)
+        right: int = self.dest_rect.left + int(rect.right * self.scale)
+        bottom: int = self.dest_rect.top + int(rect.bottom * self.scale)
+        return pygame.Rect(left, top, max(1, right - left), max(1, bottom - top))
+
+    def to_game(self, pos: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        Maps a display position, such as the mouse, to the game surface.
+
+        Args:
+            pos: The position in display coordinates.
+
+        Returns:
+            The position in game surface coordinates.
+        """
+        return (
+            int((pos[0] - self.dest_rect.left) / self.scale),
+            int((pos[1] - self.dest_rect.top) / self.scale),
+        )
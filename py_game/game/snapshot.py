@@ -0,0 +1,256 @@
+"""
+This module contains snapshots of the full game state.
+
+A snapshot copies everything a game needs to carry on from a frame: the
+position and velocity of every body, the hit points of the bricks, the
+balls, bullets, power-ups and particles, the counters and the random number
+generators. It is made of NumPy arrays and plain values, so it is small and
+pickles as is. Restoring one reuses the bodies and pooled entities the game
+already has instead of rebuilding the world, so it is cheap enough for
+rewinding, retrying from a checkpoint or branching a search from one state.
+
+The game state is restored exactly, but Box2D's contacts and broad-phase
+order are not part of a snapshot: restoring drops the contacts of the moving
+bodies, and the order Box2D finds new contacts in depends on the history of
+the world. A game carries on from a restored snapshot the way it would from
+that state, but not bit for bit the same way every time.
+"""
+
+import math
+import numpy as np
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+from .constants import PPM
+from .entities import Ball, BrickField, Bullet, PowerUp, PhysicsSprite
+
+if TYPE_CHECKING:
+    from .game import Game
+
+BALL: int = 0
+BULLET: int = 1
+# The bodies of the balls and bullets, including those waiting to be destroyed.
+# previous_x is NaN for a sprite with no previous position.
+BODY: np.dtype = np.dtype(
+    [
+        ("kind", "u1"),
+        ("x", "<f4"),
+        ("y", "<f4"),
+        ("angle", "<f4"),
+        ("vx", "<f4"),
+        ("vy", "<f4"),
+        ("spin", "<f4"),
+        ("previous_x", "<f4"),
+        ("previous_y", "<f4"),
+        ("moving", "?"),
+        ("bomb", "?"),
+        ("pending", "?"),
+    ]
+)
+POWERUP_TYPES: Tuple[str, ...] = ("ball", "bomb", "gold", "shot", "ballMulti", "life", "grow")
+POWERUP: np.dtype = np.dtype([("x", "<i2"), ("y", "<i2"), ("type", "u1")])
+# The live particles, by their slot in the ring buffer. Dead slots are left out.
+PARTICLE: np.dtype = np.dtype(
+    [
+        ("slot", "<u2"),
+        ("x", "<f4"),
+        ("y", "<f4"),
+        ("vx", "<f4"),
+        ("vy", "<f4"),
+        ("life", "<i4"),
+        ("image", "<i4"),
+    ]
+)
+# The game attributes copied as they are.
+COUNTERS: Tuple[str, ...] = (
+    "game_mode",
+    "current_level",
+    "level_frames",
+    "score",
+    "lives",
+    "ammo",
+    "grow_active",
+    "should_create_new_ball",
+    "paddle_resize_needed",
+    "paddle_x",
+    "lives_lost",
+    "powerups_collected",
+    "session_seed",
+)
+
+
+class Snapshot:
+    """The state of a game between two frames."""
+
+    def __init__(self, game: "Game") -> None:
+        """
+        Takes a snapshot of a game. Must not be called during a physics step.
+
+        Args:
+            game: The game to take a snapshot of.
+        """
+        self.counters: Dict[str, Any] = {name: getattr(game, name) for name in COUNTERS}
+        self.rng_state: Tuple[Any, ...] = game.rng.getstate()
+        self.particle_rng_state: Dict[str, Any] = game.particles.rng.bit_generator.state
+        # None when the game has no bricks, as after its level failed to load.
+        self.hp: np.ndarray | None = None if game.bricks is None else game.bricks.hp.copy()
+        # True right after a level is cleared, while the cleared level's bricks wait to be destroyed.
+        self.pending_bricks: bool = any(
+            isinstance(body.userData, BrickField) for body in game.bodies_to_destroy.pending
+        )
+        position = game.paddle.body.position
+        self.paddle: Tuple[float, float, int] = (position.x, position.y, game.paddle.rect.width)
+
+        sprites: List[Tuple[PhysicsSprite, bool]] = [(ball, False) for ball in game.balls]
+        sprites += [(bullet, False) for bullet in game.bullets]
+        sprites += [
+            (sprite, True)
+            for sprite in game.bodies_to_destroy.pending.values()
+            if isinstance(sprite, (Ball, Bullet))
+        ]
+        rows: List[Tuple[Any, ...]] = []
+        for sprite, pending in sprites:
+            body = sprite.body
+            previous: Tuple[float, float] = sprite.previous_position or (math.nan, math.nan)
+            is_ball: bool = isinstance(sprite, Ball)
+            rows.append(
+                (
+                    BALL if is_ball else BULLET,
+                    body.position.x,
+                    body.position.y,
+                    body.angle,
+                    body.linearVelocity.x,
+                    body.linearVelocity.y,
+                    body.angularVelocity,
+                    *previous,
+                    is_ball and sprite.state == "moving",
+                    is_ball and sprite.is_bomb,
+                    pending,
+                )
+            )
+        self.bodies: np.ndarray = np.array(rows, dtype=BODY)
+
+        self.powerups: np.ndarray = np.array(
+            [(*powerup.rect.center, POWERUP_TYPES.index(powerup.type)) for powerup in game.powerups],
+            dtype=POWERUP,
+        )
+        particles = game.particles
+        alive: np.ndarray = np.flatnonzero(particles.life > 0)
+        self.particles: np.ndarray = np.zeros(len(alive), dtype=PARTICLE)
+        self.particles["slot"] = alive
+        self.particles["x"], self.particles["y"] = particles.positions[alive].T
+        self.particles["vx"], self.particles["vy"] = particles.velocities[alive].T
+        self.particles["life"] = particles.life[alive]
+        self.particles["image"] = particles.image_index[alive]
+        self.next_particle: int = particles.next_slot
+
+    def restore(self, game: "Game") -> None:
+        """
+        Puts a game back in the state of the snapshot, reusing its bodies.
+        Must not be called during a physics step. The recording of the
+        current game, if any, stops, since it can no longer be replayed.
+
+        Args:
+            game: The game the snapshot was taken of.
+        """
+        game.bodies_to_destroy.flush()
+        self._restore_bodies(game)
+        level: int = self.counters["current_level"]
+        if self.hp is None:
+            if game.bricks is not None:
+                game.bodies_to_destroy.queue(game.bricks.body)
+                game.bricks = None
+        elif (
+            self.pending_bricks
+            or game.bricks is None
+            or game.current_level != level
+            or game.bricks.hp.shape != self.hp.shape
+        ):
+            # Setting the level up again also leaves the current bricks waiting
+            # to be destroyed, as the cleared level's were.
+            game._setup_level(level, self.hp)
+        else:
+            game.bricks.restore(self.hp)
+        for name, value in self.counters.items():
+            setattr(game, name, value)
+        game.rng.setstate(self.rng_state)
+        game.recording = None
+
+        x, y, width = self.paddle
+        if game.paddle.rect.width != width:
+            game.paddle.resize(width)
+        game.paddle.body.position = (x, y)
+        game.paddle.rect.centerx = x * PPM
+
+        for powerup in list(game.powerups):
+            powerup.remove()
+        for powerup_x, powerup_y, type_index in self.powerups.tolist():
+            powerup: PowerUp = game.powerup_pool.acquire(powerup_x, powerup_y, POWERUP_TYPES[type_index])
+            game.all_sprites.add(powerup)
+            game.powerups.add(powerup)
+
+        particles = game.particles
+        slots: np.ndarray = self.particles["slot"]
+        particles.clear()
+        particles.positions[slots, 0] = self.particles["x"]
+        particles.positions[slots, 1] = self.particles["y"]
+        particles.velocities[slots, 0] = self.particles["vx"]
+        particles.velocities[slots, 1] = self.particles["vy"]
+        particles.life[slots] = self.particles["life"]
+        particles.image_index[slots] = self.particles["image"]
+        particles.next_slot = self.next_particle
+        particles.rng.bit_generator.state = self.particle_rng_state
+
+        # Redraw the HUD and the whole screen.
+        game.score_val = game.lives_val = game.ammo_val = -1
+        game.renderer.invalidate()
+
+    def _restore_bodies(self, game: "Game") -> None:
+        """Moves the game's balls and bullets to the snapshot's, taking more from their pools or parking the extras."""
+        kinds: List[Tuple[np.ndarray, List[PhysicsSprite], Callable[[], PhysicsSprite]]] = []
+        for kind, group, spawn in (
+            (BALL, game.balls, game._spawn_ball),
+            (BULLET, game.bullets, lambda: self._spawn_bullet(game)),
+        ):
+            entries: np.ndarray = self.bodies[self.bodies["kind"] == kind]
+            sprites: List[PhysicsSprite] = list(group)
+            for sprite in sprites[len(entries) :]:
+                game.bodies_to_destroy.queue(sprite.body, sprite)
+            kinds.append((entries, sprites[: len(entries)], spawn))
+        # Parked once for every kind, so no flush drops the sprites that
+        # _restore_sprite queues again.
+        game.bodies_to_destroy.flush()
+        for entries, sprites, spawn in kinds:
+            while len(sprites) < len(entries):
+                sprites.append(spawn())
+            for sprite, entry in zip(sprites, entries):
+                self._restore_sprite(game, sprite, entry)
+
+    @staticmethod
+    def _spawn_bullet(game: "Game") -> Bullet:
+        """Takes a bullet from the pool, to be moved into place."""
+        bullet: Bullet = game.bullet_pool.acquire(game.paddle.rect.centerx, game.paddle.rect.top)
+        game.all_sprites.add(bullet)
+        game.bullets.add(bullet)
+        return bullet
+
+    @staticmethod
+    def _restore_sprite(game: "Game", sprite: PhysicsSprite, entry: np.void) -> None:
+        """Moves a ball or bullet into the state of a snapshot entry."""
+        body = sprite.body
+        # Taking the body out of the simulation and back drops its contacts,
+        # so the next step does not warm-start from the impulses before the restore.
+        body.active = False
+        body.active = True
+        body.transform = ((float(entry["x"]), float(entry["y"])), float(entry["angle"]))
+        body.linearVelocity = (float(entry["vx"]), float(entry["vy"]))
+        body.angularVelocity = float(entry["spin"])
+        sprite.previous_position = (
+            None if math.isnan(entry["previous_x"]) else (float(entry["previous_x"]), float(entry["previous_y"]))
+        )
+        sprite.rect.center = (body.position.x * PPM, body.position.y * PPM)
+        if isinstance(sprite, Ball):
+            sprite.state = "moving" if entry["moving"] else "on_paddle"
+            sprite.is_bomb = bool(entry["bomb"])
+            sprite.image = game.assets.images["ball_bomb" if sprite.is_bomb else "ball"]
+        if entry["pending"]:
+            game.bodies_to_destroy.queue(body, sprite)
@@ -0,0 +1,181 @@
+"""
+This module contains the spatial index over the brick field.
+"""
+
+import pygame
+from typing import Dict, Generic, Iterator, List, Tuple, TypeVar
+
+Cell = Tuple[int, int]
+T = TypeVar("T")
+
+
+class BrickGrid(Generic[T]):
+    """
+    The occupied cells of a level's brick layout, keyed by (column, row).
+
+    Every query visits only the cells that can overlap the area asked about,
+    so its cost grows with the size of the area rather than with the number
+    of bricks on the board.
+    """
+
+    def __init__(
+        self,
+        origin: Tuple[int, int],
+        cell_size: Tuple[int, int],
+        brick_size: Tuple[int, int],
+        columns: int,
+        rows: int,
+    ) -> None:
+        """
+        Initializes the BrickGrid.
+
+        Args:
+            origin: The top-left corner of the first cell, in pixels.
+            cell_size: The distance between neighbouring bricks, including the gap between them.
+            brick_size: The width and height of a brick.
+            columns: The number of columns in the layout.
+            rows: The number of rows in the layout.
+        """
+        self.origin: Tuple[int, int] = origin
+        self.cell_size: Tuple[int, int] = cell_size
+        self.brick_size: Tuple[int, int] = brick_size
+        self.columns: int = columns
+        self.rows: int = rows
+        self.cells: Dict[Cell, T] = {}
+
+    def __len__(self) -> int:
+        """Returns the number of occupied cells."""
+        return len(self.cells)
+
+    def __contains__(self, cell: Cell) -> bool:
+        """Returns True if the cell is occupied."""
+        return cell in self.cells
+
+    def add(self, cell: Cell, value: T) -> None:
+        """
+        Occupies a cell.
+
+        Args:
+            cell: The (column, row) of the brick.
+            value: What to store for the brick.
+        """
+        self.cells[cell] = value
+
+    def remove(self, cell: Cell) -> T | None:
+        """
+        Empties a cell.
+
+        Args:
+            cell: The (column, row) of the brick.
+
+        Returns:
+            What was stored for the brick, or None if the cell was empty.
+        """
+        return self.cells.pop(cell, None)
+
+    def get(self, cell: Cell) -> T | None:
+        """
+        Returns what is stored for a cell.
+
+        Args:
+            cell: The (column, row) to look up.
+
+        Returns:
+            The stored value, or None if the cell is empty.
+        """
+        return self.cells.get(cell)
+
+    def cell_at(self, x: float, y: float) -> Cell:
+        """
+        Returns the cell containing a point. The cell may be outside the layout.
+
+        Args:
+            x: The x-coordinate in pixels.
+            y: The y-coordinate in pixels.
+
+        Returns:
+            The (column, row) of the cell.
+        """
+        return (
+            int((x - self.origin[0]) // self.cell_size[0]),
+            int((y - self.origin[1]) // self.cell_size[1]),
+        )
+
+    def cell_rect(self, cell: Cell) -> pygame.Rect:
+        """
+        Returns the rect of the brick in a cell.
+
+        Args:
+            cell: The (column, row) of the brick.
+
+        Returns:
+            The brick's rect in pixels.
+        """
+        return pygame.Rect(
+            self.origin[0] + cell[0] * self.cell_size[0],
+            self.origin[1] + cell[1] * self.cell_size[1],
+            *self.brick_size,
+        )
+
+    def _cells_in(self, left: int, top: int, right: int, bottom: int) -> Iterator[Cell]:
+        """Yields the occupied cells in a block of cells, clipped to the layout."""
+        for row in range(max(top, 0), min(bottom, self.rows - 1) + 1):
+            for column in range(max(left, 0), min(right, self.columns - 1) + 1):
+                if (column, row) in self.cells:
+                    yield (column, row)
+
+    def neighbours(self, cell: Cell, distance: int = 1) -> List[Cell]:
+        """
+        Returns the occupied cells within a number of cells of a cell, not counting the cell itself.
+
+        Args:
+            cell: The (column, row) in the middle.
+            distance: How many cells to look in every direction.
+
+        Returns:
+            The neighbouring cells.
+        """
+        column, row = cell
+        return [
+            other
+            for other in self._cells_in(column - distance, row - distance, column + distance, row + distance)
+            if other != cell
+        ]
+
+    def query_rect(self, rect: pygame.Rect) -> List[Cell]:
+        """
+        Returns the occupied cells whose bricks overlap a rectangle.
+
+        Args:
+            rect: The rectangle in pixels.
+
+        Returns:
+            The overlapping cells.
+        """
+        left, top = self.cell_at(rect.left, rect.top)
+        right, bottom = self.cell_at(rect.right - 1, rect.bottom - 1)
+        return [cell for cell in self._cells_in(left, top, right, bottom) if self.cell_rect(cell).colliderect(rect)]
+
+    def query_radius(self, x: float, y: float, radius: float) -> List[Cell]:
+        """
+        Returns the occupied cells whose bricks are at least partly within a distance of a point.
+
+        Args:
+            x: The x-coordinate of the point in pixels.
+            y: The y-coordinate of the point in pixels.
+            radius: The distance in pixels.
+
+        Returns:
+            The cells in range.
+        """
+        left, top = self.cell_at(x - radius, y - radius)
+        right, bottom = self.cell_at(x + radius, y + radius)
+        result: List[Cell] = []
+        for cell in self._cells_in(left, top, right, bottom):
+            rect: pygame.Rect = self.cell_rect(cell)
+            # The distance from the point to the nearest point of the brick.
+            dx: float = max(rect.left - x, 0, x - rect.right)
+            dy: float = max(rect.top - y, 0, y - rect.bottom)
+            if dx * dx + dy * dy <= radius * radius:
+                result.append(cell)
+        return result
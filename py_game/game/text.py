@@ -0,0 +1,119 @@
+"""
+This module contains the text rendering caches.
+
+Rendering text with the font rasteriser is slow next to blitting, so text is
+rendered once and reused. TextCache keeps the most recently used strings.
+GlyphStrip renders the digits and labels of the HUD once, and lays out the
+numbers that change every few frames from those glyphs.
+"""
+
+import pygame
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+from .constants import TEXT_CACHE_SIZE
+
+Color = Tuple[int, int, int]
+
+
+class TextCache:
+    """The rendered surfaces of the most recently used strings."""
+
+    def __init__(self, max_size: int = TEXT_CACHE_SIZE) -> None:
+        """
+        Initializes the TextCache.
+
+        Args:
+            max_size: The number of strings kept. The least recently used ones are dropped.
+        """
+        self.max_size: int = max_size
+        self.surfaces: OrderedDict[Tuple[str, pygame.font.Font, Color], pygame.Surface] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        """Returns the number of cached strings."""
+        return len(self.surfaces)
+
+    def render(self, font: pygame.font.Font, text: str, color: Color) -> pygame.Surface:
+        """
+        Returns the rendered text, rendering it only if it is not cached.
+
+        Args:
+            font: The font to render with.
+            text: The text.
+            color: The color of the text.
+
+        Returns:
+            The antialiased text, shared with other callers, so it must not be drawn on.
+        """
+        key: Tuple[str, pygame.font.Font, Color] = (text, font, color)
+        surface: pygame.Surface | None = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+
+class GlyphStrip:
+    """
+    Labelled numbers laid out from glyphs rendered once.
+
+    A number is drawn as its label and one glyph per character, each placed
+    at the advance width of the ones before it. The glyphs are shared
+    surfaces, so a changed number is laid out again without rendering any
+    text, and the dirty-rect renderer redraws only the glyphs that changed.
+    The default font has fixed-width digits, so the result matches rendering
+    the whole string to within a few pixels.
+    """
+
+    CHARACTERS: str = "0123456789-"
+
+    def __init__(self, font: pygame.font.Font, color: Color, labels: Iterable[str] = ()) -> None:
+        """
+        Initializes the GlyphStrip and renders its glyphs.
+
+        Args:
+            font: The font to render with.
+            color: The color of the text.
+            labels: The labels drawn before the numbers, such as "Score: ".
+        """
+        self.height: int = font.get_height()
+        # Every glyph and label with the distance to the next one.
+        self.glyphs: Dict[str, Tuple[pygame.Surface, int]] = {
+            text: (font.render(text, True, color), font.size(text)[0])
+            for text in (*self.CHARACTERS, *labels)
+        }
+
+    def layout(
+        self, label: str, value: int, **anchor: Tuple[int, int] | int
+    ) -> List[Tuple[pygame.Surface, pygame.Rect]]:
+        """
+        Lays out a label and a number.
+
+        Args:
+            label: The label, one of those the strip was created with.
+            value: The number drawn after the label.
+            **anchor: Where to place the text, as for Surface.get_rect, such as topleft=(10, 10).
+
+        Returns:
+            The glyphs and the rects to draw them at, left to right.
+        """
+        glyphs: List[Tuple[pygame.Surface, pygame.Rect]] = []
+        x: int = 0
+        for text in (label, *str(value)):
+            glyph, advance = self.glyphs[text]
+            glyphs.append((glyph, glyph.get_rect(left=x)))
+            x += advance
+        bounds: pygame.Rect = pygame.Rect(0, 0, glyphs[-1][1].right, self.height)
+        for name, position in anchor.items():
+            setattr(bounds, name, position)
+        for _, rect in glyphs:
+            rect.move_ip(bounds.topleft)
+        return glyphs
@@ -0,0 +1,51 @@
+"""
+This module contains the fixed-timestep simulation clock.
+"""
+
+from .constants import PHYSICS_STEP, MAX_SUBSTEPS
+
+
+class SimulationClock:
+    """
+    Decouples the fixed physics step from the rendered frame rate.
+
+    Real frame time is collected in an accumulator and spent in whole physics
+    steps. What is left over, as a fraction of a step, is the interpolation
+    factor for drawing between the previous and the current physics state.
+    """
+
+    def __init__(self, step: float = PHYSICS_STEP, max_substeps: int = MAX_SUBSTEPS) -> None:
+        """
+        Initializes the SimulationClock.
+
+        Args:
+            step: The length of one physics step in seconds.
+            max_substeps: The most steps to run for a single frame.
+        """
+        self.step: float = step
+        self.max_substeps: int = max_substeps
+        self.accumulator: float = 0.0
+        self.alpha: float = 1.0
+
+    def reset(self) -> None:
+        """Forgets any accumulated time."""
+        self.accumulator = 0.0
+        self.alpha = 1.0
+
+    def advance(self, frame_time: float) -> int:
+        """
+        Adds the time a frame took and returns how many physics steps to run.
+
+        Args:
+            frame_time: The real time since the last frame, in seconds.
+
+        Returns:
+            The number of physics steps to run before drawing.
+        """
+        # Dropping time beyond max_substeps steps slows the game down for a
+        # moment instead of falling further behind every frame.
+        self.accumulator = min(self.accumulator + frame_time, self.step * self.max_substeps)
+        steps: int = int(self.accumulator / self.step)
+        self.accumulator -= steps * self.step
+        self.alpha = self.accumulator / self.step
+        return steps
@@ -2,19 +2,133 @@
 This module contains utility classes for the game.
 """
 
+import hashlib
+import json
+import numpy as np
 import pygame
 import os
-from typing import Dict, List, Tuple
-from .constants import IMAGE_DIR, SOUND_DIR, MAP_DIR
+import struct
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Generic, List, Tuple, TypeVar
+from .bundle import AssetBundle
+from .constants import (
+    IMAGE_DIR,
+    SOUND_DIR,
+    MAP_DIR,
+    COMPILED_MAPS,
+    ATLAS_IMAGE,
+    ATLAS_INDEX,
+    MIXER_FORMAT,
+    MIXER_BUFFER,
+    ASSET_WORKERS,
+)
+from .mapfile import MapFile, parse_text_map, text_map_files
 
+T = TypeVar("T")
 
-class AssetManager:
-    """A class to manage loading and storing game assets."""
+# The images the title screen needs. They load before the first frame.
+TITLE_IMAGES: Tuple[str, ...] = ("bgTitle", "btn_newGame", "btn_continue")
+# The name of the texture atlas among the images to load.
+ATLAS: str = "atlas"
+
+
+class AssetTable(Generic[T]):
+    """
+    Assets by name, which can be read while a background loader fills the table.
+
+    Looking up an asset that is still loading waits for that asset alone.
+    Membership tests never wait: they are True only once an asset is loaded.
+    """
 
     def __init__(self) -> None:
-        """Initializes the AssetManager."""
-        self.images: Dict[str, pygame.Surface] = {}
-        self.sounds: Dict[str, pygame.mixer.Sound] = {}
+        """Initializes the AssetTable."""
+        self.loaded: Dict[str, T] = {}
+        self.pending: Dict[str, threading.Event] = {}
+        self.lock: threading.Lock = threading.Lock()
+
+    def expect(self, name: str) -> None:
+        """
+        Marks an asset as loading, so lookups wait for it.
+
+        Args:
+            name: The name of the asset.
+        """
+        with self.lock:
+            if name not in self.loaded:
+                self.pending.setdefault(name, threading.Event())
+
+    def __setitem__(self, name: str, value: T) -> None:
+        """Stores a loaded asset and wakes up whoever waits for it."""
+        with self.lock:
+            self.loaded[name] = value
+            event: threading.Event | None = self.pending.pop(name, None)
+        if event is not None:
+            event.set()
+
+    def fail(self, name: str) -> None:
+        """
+        Gives up on an asset that could not be loaded. Lookups raise KeyError.
+
+        Args:
+            name: The name of the asset.
+        """
+        with self.lock:
+            event: threading.Event | None = self.pending.pop(name, None)
+        if event is not None:
+            event.set()
+
+    def __getitem__(self, name: str) -> T:
+        """Returns an asset, waiting for it if it is still loading."""
+        value: T | None = self.loaded.get(name)
+        if value is not None:
+            return value
+        event: threading.Event | None = self.pending.get(name)
+        if event is not None:
+            event.wait()
+        return self.loaded[name]
+
+    def __contains__(self, name: object) -> bool:
+        """Returns True if the asset is loaded."""
+        return name in self.loaded
+
+    def __len__(self) -> int:
+        """Returns the number of loaded assets."""
+        return len(self.loaded)
+
+    def keys(self) -> List[str]:
+        """Returns the names of the loaded assets."""
+        return list(self.loaded)
+
+    def items(self) -> List[Tuple[str, T]]:
+        """Returns the loaded assets and their names."""
+        return list(self.loaded.items())
+
+
+class AssetManager:
+    """
+    A class to manage loading and storing game assets.
+
+    The title screen images load before the constructor returns. Every other
+    image and all sounds decode on a thread pool in the background; lookups
+    of an image still loading wait for it, and wait() waits for all of them.
+
+    When pack_atlas.py has packed the sprites into a texture atlas, the
+    sprite images are subsurfaces of that one surface rather than separate
+    surfaces of their own.
+    """
+
+    def __init__(self, load_sounds: bool = True, workers: int = ASSET_WORKERS) -> None:
+        """
+        Initializes the AssetManager.
+
+        Args:
+            load_sounds: False to skip initializing the mixer and loading sounds.
+            workers: The number of threads decoding assets in the background.
+        """
+        self.load_sounds: bool = load_sounds
+        self.images: AssetTable[pygame.Surface] = AssetTable()
+        self.sounds: AssetTable[pygame.mixer.Sound] = AssetTable()
         self.particle_images: Dict[str, List[pygame.Surface]] = {
             "red": [],
             "blue": [],
@@ -25,73 +139,221 @@ class AssetManager:
             "black": [],
             "silver": [],
         }
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self.atlas: pygame.Surface | None = None
+        self.image_futures: List[Future] = []
+        self.sound_futures: List[Future] = []
+        self.particles_collected: bool = False
         self.load_assets()
 
     def load_assets(self) -> None:
-        """Load all images and sounds."""
-        for filename in os.listdir(IMAGE_DIR):
-            if filename.endswith(".png"):
-                name: str = os.path.splitext(filename)[0]
-                try:
-                    image: pygame.Surface = pygame.image.load(
-                        os.path.join(IMAGE_DIR, filename)
-                    ).convert_alpha()
-                    self.images[name] = image
-                    if name.startswith("p") and "_" in name:
-                        parts: List[str] = name.split("_")
-                        if (
-                            len(parts) == 2
-                            and parts[0].startswith("p")
-                            and parts[0][1:].isdigit()
-                        ):
-                            color: str = parts[1]
-                            if color in self.particle_images:
-                                self.particle_images[color].append(image)
-                    elif name.startswith("p") and name[1:].isdigit():
-                        self.particle_images["red"].append(image)
-                except pygame.error as e:
-                    print(f"Failed to load image {filename}: {e}")
+        """Load the title screen images and start loading everything else."""
+        bundle: AssetBundle | None = AssetBundle.open()
+        names: List[str]
+        load_image: Callable[[str], pygame.Surface]
+        if bundle is not None:
+            names = bundle.image_names()
+            load_image = bundle.image
+        else:
+            names = [os.path.splitext(f)[0] for f in sorted(os.listdir(IMAGE_DIR)) if f.endswith(".png")]
+            if os.path.exists(ATLAS_IMAGE):
+                names.append(ATLAS)
+            load_image = lambda name: pygame.image.load(
+                ATLAS_IMAGE if name == ATLAS else os.path.join(IMAGE_DIR, f"{name}.png")
+            ).convert_alpha()
+
+        atlas_sprites: Dict[str, Tuple[int, int, int, int]] = self._read_atlas_index() if ATLAS in names else {}
+        names = [name for name in names if name != ATLAS]
+        for name in names:
+            self.images.expect(name)
+        for name in TITLE_IMAGES:
+            if name in names:
+                self._load(self.images, name, load_image)
+        if atlas_sprites:
+            self.image_futures.append(self.executor.submit(self._load_atlas, atlas_sprites, load_image))
+        self.image_futures.extend(
+            self.executor.submit(self._load, self.images, name, load_image)
+            for name in names
+            if name not in TITLE_IMAGES and name not in atlas_sprites
+        )
+
+        if self.load_sounds:
+            try:
+                pygame.mixer.pre_init(*MIXER_FORMAT, MIXER_BUFFER)
+                pygame.mixer.init()
+                load_sound: Callable[[str], pygame.mixer.Sound]
+                if bundle is not None and bundle.has_mixer_format():
+                    names = bundle.sound_names()
+                    load_sound = bundle.sound
+                else:
+                    names = [os.path.splitext(f)[0] for f in sorted(os.listdir(SOUND_DIR)) if f.endswith(".mp3")]
+                    load_sound = lambda name: pygame.mixer.Sound(os.path.join(SOUND_DIR, f"{name}.mp3"))
+                self.sound_futures = [
+                    self.executor.submit(self._load, self.sounds, name, load_sound) for name in names
+                ]
+            except pygame.error as e:
+                print(f"Failed to initialize mixer or load sound: {e}")
+        # The queued jobs still run; the threads exit once they are done.
+        self.executor.shutdown(wait=False)
+
+    def _load(self, table: AssetTable, name: str, loader: Callable[[str], T]) -> None:
+        """
+        Loads one asset into a table.
+
+        Args:
+            table: The table to store the asset in.
+            name: The name of the asset.
+            loader: Loads the asset by name.
+        """
+        try:
+            table[name] = loader(name)
+        except (pygame.error, OSError) as e:
+            print(f"Failed to load asset {name}: {e}")
+            table.fail(name)
+
+    def _read_atlas_index(self) -> Dict[str, Tuple[int, int, int, int]]:
+        """
+        Reads where each sprite is in the atlas, leaving out sprites whose
+        image changed since the atlas was packed, so they load from their own files.
+
+        Returns:
+            The (x, y, width, height) of every sprite, or nothing if the index cannot be read.
+        """
+        try:
+            with open(ATLAS_INDEX, "r") as f:
+                index: Dict[str, Any] = json.load(f)
+            sprites: Dict[str, Tuple[int, int, int, int]] = {
+                name: tuple(rect) for name, rect in index["sprites"].items()
+            }
+            sources: Dict[str, str] = index.get("sources", {})
+        except (IOError, ValueError, KeyError) as e:
+            print(f"Failed to load atlas index {ATLAS_INDEX}: {e}")
+            return {}
+        stale: List[str] = [name for name in sprites if self._sprite_changed(name, sources.get(name))]
+        if stale:
+            print(f"Loading {', '.join(stale)} from {IMAGE_DIR}: changed since the atlas was packed")
+        return {name: rect for name, rect in sprites.items() if name not in stale}
+
+    @staticmethod
+    def _sprite_changed(name: str, source_hash: str | None) -> bool:
+        """
+        Checks a sprite's image against the hash recorded when the atlas was packed.
+
+        Args:
+            name: The name of the sprite.
+            source_hash: The SHA-256 of its image when it was packed, if recorded.
+
+        Returns:
+            True if the image differs from the packed one.
+        """
+        path: str = os.path.join(IMAGE_DIR, f"{name}.png")
+        try:
+            with open(path, "rb") as f:
+                return hashlib.sha256(f.read()).hexdigest() != source_hash
+        except FileNotFoundError:
+            # Without the image there is nothing to be stale against.
+            return False
+
+    def _load_atlas(
+        self, sprites: Dict[str, Tuple[int, int, int, int]], loader: Callable[[str], pygame.Surface]
+    ) -> None:
+        """
+        Loads the atlas and cuts every sprite out of it.
+
+        Args:
+            sprites: The (x, y, width, height) of every sprite in the atlas.
+            loader: Loads an image by name.
+        """
         try:
-            pygame.mixer.pre_init(44100, -16, 2, 512)
-            pygame.mixer.init()
-            for filename in os.listdir(SOUND_DIR):
-                if filename.endswith(".mp3"):
-                    name = os.path.splitext(filename)[0]
-                    sound: pygame.mixer.Sound = pygame.mixer.Sound(os.path.join(SOUND_DIR, filename))
-                    self.sounds[name] = sound
-        except pygame.error as e:
-            print(f"Failed to initialize mixer or load sound: {e}")
+            self.atlas = loader(ATLAS)
+        except (pygame.error, OSError) as e:
+            print(f"Failed to load atlas: {e}")
+            for name in sprites:
+                self.images.fail(name)
+            return
+        for name, rect in sprites.items():
+            self.images[name] = self.atlas.subsurface(rect)
+
+    def progress(self) -> float:
+        """Returns the fraction of background assets that are loaded, from 0 to 1."""
+        futures: List[Future] = self.image_futures + self.sound_futures
+        if not futures:
+            return 1.0
+        return sum(future.done() for future in futures) / len(futures)
+
+    @property
+    def ready(self) -> bool:
+        """True once every image and sound is loaded."""
+        return self.progress() >= 1.0
+
+    def wait(self, sounds: bool = False) -> None:
+        """
+        Waits until the images, and optionally the sounds, are loaded.
+
+        Args:
+            sounds: True to wait for the sounds as well.
+        """
+        wait(self.image_futures + (self.sound_futures if sounds else []))
+        if not self.particles_collected:
+            self._collect_particle_images()
+
+    def _collect_particle_images(self) -> None:
+        """Sorts the loaded particle images by colour, in the order of their names."""
+        self.particles_collected = True
+        for name, image in sorted(self.images.items()):
+            if name.startswith("p") and "_" in name:
+                parts: List[str] = name.split("_")
+                if len(parts) == 2 and parts[0].startswith("p") and parts[0][1:].isdigit():
+                    color: str = parts[1]
+                    if color in self.particle_images:
+                        self.particle_images[color].append(image)
+            elif name.startswith("p") and name[1:].isdigit():
+                self.particle_images["red"].append(image)
 
 
 class MapLoader:
-    """A class to load and manage game maps."""
+    """
+    A class to load game maps on demand.
 
-    def __init__(self) -> None:
-        """Initializes the MapLoader."""
-        self.maps: List[List[List[int]]] = []
+    The maps come from a compiled map file, or from a directory that holds
+    either a compiled map file or text maps. Nothing is read until a level
+    is asked for, so large level packs cost nothing up front.
+    """
+
+    def __init__(self, path: str = MAP_DIR) -> None:
+        """
+        Initializes the MapLoader.
+
+        Args:
+            path: A compiled map file or a directory of maps.
+        """
+        self.path: str = path
+        self.map_file: MapFile | None = None
+        self.text_maps: List[str] = []
         self.max_level: int = 0
         self.load_maps()
 
     def load_maps(self) -> None:
-        """Load all maps from the maps directory."""
-        map_files: List[str] = sorted(
-            [f for f in os.listdir(MAP_DIR) if f.startswith("map.")],
-            key=lambda x: int(x.split(".")[1]),
-        )
-        self.max_level = len(map_files)
-        for filename in map_files:
+        """Find the maps, preferring a compiled map file with as many levels as there are text maps next to it."""
+        compiled: str = self.path if os.path.isfile(self.path) else os.path.join(self.path, COMPILED_MAPS)
+        if os.path.isdir(self.path):
+            self.text_maps = text_map_files(self.path)
+        if os.path.exists(compiled):
             try:
-                with open(os.path.join(MAP_DIR, filename), "r") as f:
-                    level_map: List[List[int]] = []
-                    for line in f:
-                        row: List[int] = [int(char) for char in line.strip() if char.isdigit()]
-                        if row:
-                            level_map.append(row)
-                    self.maps.append(level_map)
-            except (IOError, ValueError) as e:
-                print(f"Failed to load or parse map {filename}: {e}")
-
-    def get_map(self, level_index: int) -> List[List[int]] | None:
+                map_file: MapFile = MapFile(compiled)
+                # Without the text maps there is nothing to be stale against. Each
+                # level is checked against its text map when it is asked for.
+                if self.text_maps and len(map_file) != len(self.text_maps):
+                    print(f"Ignoring compiled maps {compiled}: levels were added or removed since they were compiled")
+                else:
+                    self.map_file = map_file
+                    self.max_level = len(map_file)
+                    return
+            except (OSError, ValueError, struct.error) as e:
+                print(f"Failed to load compiled maps {compiled}: {e}")
+        self.max_level = len(self.text_maps)
+
+    def get_map(self, level_index: int) -> np.ndarray | None:
         """
         Returns the map for the given level index.
 
@@ -99,8 +361,17 @@ class MapLoader:
             level_index: The index of the level to return.
 
         Returns:
-            The map for the given level index, or None if the level does not exist.
+            The hit points of every cell of the level, which must not be
+            modified, or None if the level does not exist or cannot be read.
         """
-        if 0 <= level_index < len(self.maps):
-            return self.maps[level_index]
-        return None
+        if not 0 <= level_index < self.max_level:
+            return None
+        if self.map_file is not None and (
+            not self.text_maps or self.map_file.matches(level_index, self.text_maps[level_index])
+        ):
+            return self.map_file.level(level_index)
+        try:
+            return parse_text_map(self.text_maps[level_index])
+        except (IOError, ValueError) as e:
+            print(f"Failed to load or parse map {self.text_maps[level_index]}: {e}")
+            return None
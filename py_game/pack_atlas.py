@@ -0,0 +1,88 @@
+"""
+Packs the sprite images into one texture atlas.
+
+Every image in res/pixmaps except the backgrounds and buttons is trimmed to
+its visible pixels, as trim_images.py does, and packed into res/atlas.png.
+res/atlas.json records where each sprite is and a hash of the image it was
+packed from. At runtime the AssetManager cuts the sprites out of the atlas
+as subsurfaces, except for sprites whose image changed since, which it
+loads from their own files until the atlas is packed again.
+
+Usage: python pack_atlas.py
+"""
+
+import hashlib
+import json
+import os
+from PIL import Image
+
+RES_DIR = os.path.join(os.path.dirname(__file__), "res")
+IMAGE_DIR = os.path.join(RES_DIR, "pixmaps")
+ATLAS_IMAGE = os.path.join(RES_DIR, "atlas.png")
+ATLAS_INDEX = os.path.join(RES_DIR, "atlas.json")
+ATLAS_WIDTH = 256
+PADDING = 1  # Transparent pixels between sprites, so smooth scaling does not bleed
+
+
+def load_sprites():
+    """Returns the trimmed sprite images and the SHA-256 of their files, by name."""
+    sprites = {}
+    sources = {}
+    for filename in sorted(os.listdir(IMAGE_DIR)):
+        name, extension = os.path.splitext(filename)
+        if extension != ".png" or name.startswith(("bg", "btn")):
+            continue
+        path = os.path.join(IMAGE_DIR, filename)
+        with open(path, "rb") as f:
+            sources[name] = hashlib.sha256(f.read()).hexdigest()
+        image = Image.open(path).convert("RGBA")
+        bbox = image.getbbox()
+        if bbox and bbox != (0, 0, *image.size):
+            print(f"Trimmed {filename}")
+            image = image.crop(bbox)
+        sprites[name] = image
+    return sprites, sources
+
+
+def pack(sprites):
+    """
+    Places the sprites in shelves, tallest first.
+
+    Returns:
+        The position of every sprite and the height of the atlas.
+    """
+    positions = {}
+    x = y = shelf_height = 0
+    for name in sorted(sprites, key=lambda name: (-sprites[name].height, name)):
+        width, height = sprites[name].size
+        if x + width > ATLAS_WIDTH:
+            x = 0
+            y += shelf_height + PADDING
+            shelf_height = 0
+        positions[name] = (x, y)
+        x += width + PADDING
+        shelf_height = max(shelf_height, height)
+    return positions, y + shelf_height
+
+
+def main():
+    sprites, sources = load_sprites()
+    positions, height = pack(sprites)
+    atlas = Image.new("RGBA", (ATLAS_WIDTH, height), (0, 0, 0, 0))
+    index = {}
+    for name, (x, y) in positions.items():
+        atlas.paste(sprites[name], (x, y))
+        index[name] = [x, y, *sprites[name].size]
+    atlas.save(ATLAS_IMAGE)
+    with open(ATLAS_INDEX, "w") as f:
+        json.dump(
+            {"image": os.path.basename(ATLAS_IMAGE), "sprites": index, "sources": sources},
+            f,
+            indent=1,
+            sort_keys=True,
+        )
+    print(f"Packed {len(index)} sprites into {ATLAS_WIDTH}x{height} {ATLAS_IMAGE}")
+
+
+if __name__ == "__main__":
+    main()
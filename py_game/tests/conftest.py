@@ -0,0 +1,33 @@
+"""
+This module contains the shared setup of the tests.
+
+The tests run headless on SDL's dummy drivers, from the py_game directory:
+
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from game.controls import PolicyInput, tracking_policy
+from game.game import Game
+
+
+@pytest.fixture
+def game() -> Game:
+    """A headless game steered by the tracking policy, with a fixed seed."""
+    return Game(headless=True, seed=1, input_source=PolicyInput(tracking_policy))
+
+
+def play(game: Game, frames: int) -> None:
+    """Plays frames of a game until it leaves the playing mode."""
+    for _ in range(frames):
+        if game.game_mode != "playing":
+            break
+        game._update()
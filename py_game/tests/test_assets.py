@@ -0,0 +1,38 @@
+"""
+This module contains the tests of loading sprites from the texture atlas.
+"""
+
+import shutil
+
+import pygame
+
+from game import utils
+from game.utils import AssetManager
+
+
+def load_assets() -> AssetManager:
+    """Loads the images, without sounds, and waits for all of them."""
+    # Images are converted to the display format, so there has to be a display.
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    assets = AssetManager(load_sounds=False)
+    assets.wait()
+    return assets
+
+
+def test_sprites_come_from_the_atlas() -> None:
+    assets = load_assets()
+    assert assets.atlas is not None
+    assert assets.images["ball"].get_parent() is assets.atlas
+
+
+def test_changed_sprite_loads_from_its_own_file(tmp_path, monkeypatch) -> None:
+    shutil.copytree(utils.IMAGE_DIR, tmp_path, dirs_exist_ok=True)
+    image = pygame.image.load(str(tmp_path / "ball.png"))
+    image.fill((255, 0, 0, 255))
+    pygame.image.save(image, str(tmp_path / "ball.png"))
+    monkeypatch.setattr(utils, "IMAGE_DIR", str(tmp_path))
+
+    assets = load_assets()
+    assert assets.images["ball"].get_parent() is not assets.atlas
+    assert assets.images["ball_bomb"].get_parent() is assets.atlas
@@ -0,0 +1,20 @@
+"""
+This module contains the tests of the sound manager.
+"""
+
+import pytest
+
+from game.audio import SoundManager
+from game.constants import MERGED_VOLUME_MAX, MERGED_VOLUME_STEP, SOUND_VOLUME
+
+
+def test_single_plays_use_the_base_volume() -> None:
+    assert SoundManager({}).merged_volume(1) == SOUND_VOLUME
+    assert SoundManager({}, volume=0.5).merged_volume(1) == 0.5
+
+
+def test_merged_plays_are_louder_up_to_the_cap() -> None:
+    audio = SoundManager({}, volume=0.5)
+    assert audio.merged_volume(3) == pytest.approx(0.5 + 2 * MERGED_VOLUME_STEP)
+    assert audio.merged_volume(1000) == MERGED_VOLUME_MAX
+    assert SoundManager({}, volume=1.0).merged_volume(5) == 1.0
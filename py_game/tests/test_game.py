@@ -0,0 +1,22 @@
+"""
+This module contains the tests of starting games and levels.
+"""
+
+from conftest import play
+from game.game import Game
+
+
+def test_missing_level_ends_the_game(game: Game) -> None:
+    game._start_game(new_game=True, level=0)
+    game._start_game(new_game=True, level=99)
+    assert game.game_mode == "game_over"
+    assert game.bricks is None
+
+
+def test_level_after_missing_level_can_be_cleared(game: Game) -> None:
+    game._start_game(new_game=True, level=0)
+    game._start_game(new_game=True, level=99)
+    game._start_game(new_game=True, level=0)
+    play(game, 20000)
+    assert game.score > 0
+    assert game.current_level >= 1
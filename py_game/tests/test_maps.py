@@ -0,0 +1,60 @@
+"""
+This module contains the tests of the compiled map format.
+"""
+
+import os
+import shutil
+
+import numpy as np
+
+from game.constants import MAP_DIR, COMPILED_MAPS
+from game.mapfile import MapFile, parse_text_map, text_map_files, write_map_file
+from game.utils import MapLoader
+
+
+def compile_maps(directory: str) -> None:
+    """Compiles the text maps of a directory next to them."""
+    paths = text_map_files(directory)
+    levels = [parse_text_map(path) for path in paths]
+    write_map_file(levels, os.path.join(directory, COMPILED_MAPS), paths)
+
+
+def test_compiled_maps_match_text_maps() -> None:
+    paths = text_map_files(MAP_DIR)
+    map_file = MapFile(os.path.join(MAP_DIR, COMPILED_MAPS))
+    assert len(map_file) == len(paths)
+    for index, path in enumerate(paths):
+        np.testing.assert_array_equal(map_file.level(index), parse_text_map(path))
+
+
+def test_loader_uses_compiled_maps_while_they_match(tmp_path) -> None:
+    shutil.copytree(MAP_DIR, tmp_path, dirs_exist_ok=True)
+    compile_maps(str(tmp_path))
+    loader = MapLoader(str(tmp_path))
+    assert loader.map_file is not None
+    assert loader.max_level == len(text_map_files(str(tmp_path)))
+    assert all(loader.map_file.matches(index, path) for index, path in enumerate(loader.text_maps))
+    assert loader.get_map(0).base is not None
+
+
+def test_loader_reads_changed_levels_from_their_text_maps(tmp_path) -> None:
+    shutil.copytree(MAP_DIR, tmp_path, dirs_exist_ok=True)
+    compile_maps(str(tmp_path))
+    with open(tmp_path / "map.1", "w") as f:
+        f.write("111\n")
+    loader = MapLoader(str(tmp_path))
+    assert loader.map_file is not None
+    assert not loader.map_file.matches(0, loader.text_maps[0])
+    np.testing.assert_array_equal(loader.get_map(0), [[1, 1, 1]])
+    assert loader.map_file.matches(1, loader.text_maps[1])
+
+
+def test_loader_ignores_compiled_maps_with_other_levels(tmp_path) -> None:
+    shutil.copytree(MAP_DIR, tmp_path, dirs_exist_ok=True)
+    compile_maps(str(tmp_path))
+    count = len(text_map_files(str(tmp_path)))
+    with open(tmp_path / f"map.{count + 1}", "w") as f:
+        f.write("111\n")
+    loader = MapLoader(str(tmp_path))
+    assert loader.map_file is None
+    assert loader.max_level == count + 1
@@ -0,0 +1,43 @@
+"""
+This module contains the tests of recording and replaying games.
+"""
+
+import os
+
+from conftest import play
+from game.game import Game
+from game.recording import Recording
+from game.replay import play_recording, start_replay
+
+
+def test_consecutive_recorded_games_replay(game: Game, tmp_path) -> None:
+    game.record_replays = True
+    paths = []
+    for index in range(2):
+        game._start_game(new_game=True)
+        play(game, 1500)
+        recording = game.recording
+        game.recording = None
+        recording.finish(game)
+        path = os.path.join(tmp_path, f"game-{index}.bxr")
+        recording.save(path)
+        paths.append(path)
+    for path in paths:
+        result = play_recording(path)
+        assert result["frames"] > 0
+        assert result["mismatch_frame"] == -1
+
+
+def test_watched_replay_is_not_recorded_or_saved(game: Game, tmp_path) -> None:
+    game.record_replays = True
+    game._start_game(new_game=True)
+    play(game, 300)
+    recording = game.recording
+    recording.finish(game)
+    path = os.path.join(tmp_path, "game.bxr")
+    recording.save(path)
+
+    watcher = Game(saves_progress=False, assets=game.assets)
+    assert watcher.save.path is None
+    start_replay(watcher, Recording.load(path))
+    assert watcher.recording is None
@@ -0,0 +1,58 @@
+"""
+This module contains the tests of the save file.
+"""
+
+import json
+import os
+
+from game.constants import SAVE_VERSION
+from game.game import Game
+from game.save import SaveFile
+
+
+def test_flush_replaces_the_save_file(tmp_path) -> None:
+    path = os.path.join(tmp_path, "save.json")
+    save = SaveFile(path)
+    save.unlock(3)
+    save.record_game(1200, 3)
+    save.close()
+    assert os.listdir(tmp_path) == ["save.json"]
+    with open(path) as f:
+        data = json.load(f)
+    assert data["version"] == SAVE_VERSION
+    assert data["level"] == 3
+    assert data["high_scores"][0]["score"] == 1200
+    assert SaveFile(path).data == data
+
+
+def test_legacy_level_is_migrated(tmp_path) -> None:
+    path = os.path.join(tmp_path, "save.json")
+    legacy_path = os.path.join(tmp_path, "progress.txt")
+    with open(legacy_path, "w") as f:
+        f.write("4\n")
+    save = SaveFile(path, legacy_path)
+    assert save.level == 4
+    save.close()
+    assert SaveFile(path).level == 4
+    assert os.path.exists(legacy_path)
+
+
+def test_newer_save_is_left_alone(tmp_path) -> None:
+    path = os.path.join(tmp_path, "save.json")
+    text = json.dumps({"version": SAVE_VERSION + 1, "level": 7})
+    with open(path, "w") as f:
+        f.write(text)
+    save = SaveFile(path)
+    assert not save.writable
+    save.unlock(9)
+    save.close()
+    with open(path) as f:
+        assert f.read() == text
+
+
+def test_headless_game_keeps_its_save_in_memory(game: Game) -> None:
+    assert game.save.path is None
+    assert not game.save.has_save
+    game.save.unlock(2)
+    game.save.close()
+    assert game.save.executor is None
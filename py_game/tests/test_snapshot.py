@@ -0,0 +1,56 @@
+"""
+This module contains the tests of taking and restoring snapshots.
+"""
+
+import numpy as np
+
+from conftest import play
+from game.game import Game
+from game.snapshot import Snapshot
+
+
+def assert_same(snapshot: Snapshot, other: Snapshot) -> None:
+    """Asserts that two snapshots hold the same state."""
+    assert vars(snapshot).keys() == vars(other).keys()
+    for name, value in vars(snapshot).items():
+        if isinstance(value, np.ndarray):
+            # Compared as bytes, since the structured arrays hold NaNs.
+            assert value.dtype == other.__dict__[name].dtype, name
+            assert value.tobytes() == other.__dict__[name].tobytes(), name
+        else:
+            assert value == other.__dict__[name], name
+
+
+def test_restore_puts_back_the_snapshot(game: Game) -> None:
+    game._start_game(new_game=True, level=0)
+    play(game, 600)
+    snapshot = Snapshot(game)
+    play(game, 300)
+    snapshot.restore(game)
+    assert_same(Snapshot(game), snapshot)
+
+
+def test_restore_keeps_bodies_waiting_to_be_destroyed(game: Game) -> None:
+    game._start_game(new_game=True, level=0)
+    while game.current_level == 0 and game.game_mode == "playing":
+        game._update()
+    snapshot = Snapshot(game)
+    assert snapshot.pending_bricks
+    assert snapshot.bodies["pending"].any()
+    play(game, 300)
+    snapshot.restore(game)
+    assert_same(Snapshot(game), snapshot)
+
+
+def test_snapshot_of_a_game_without_bricks(game: Game) -> None:
+    game._start_game(new_game=True, level=0)
+    game._start_game(new_game=True, level=99)
+    snapshot = Snapshot(game)
+    assert snapshot.hp is None
+
+    game._start_game(new_game=True, level=0)
+    play(game, 60)
+    snapshot.restore(game)
+    assert game.bricks is None
+    assert game.game_mode == "game_over"
+    assert_same(Snapshot(game), snapshot)
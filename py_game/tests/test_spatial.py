@@ -0,0 +1,54 @@
+"""
+This module contains the tests of the brick grid and explosions.
+"""
+
+import pygame
+
+from game import game as game_module
+from game.game import Game
+from game.spatial import BrickGrid
+
+
+def full_grid(columns: int = 10, rows: int = 10) -> BrickGrid[int]:
+    """A grid of 32x16 bricks 2 pixels apart, as the levels lay them out, with every cell occupied."""
+    grid: BrickGrid[int] = BrickGrid((0, 0), (34, 18), (32, 16), columns, rows)
+    for row in range(rows):
+        for column in range(columns):
+            grid.add((column, row), 0)
+    return grid
+
+
+def test_neighbours_are_clipped_to_the_layout() -> None:
+    grid = full_grid()
+    assert sorted(grid.neighbours((0, 0))) == [(0, 1), (1, 0), (1, 1)]
+    grid.remove((1, 1))
+    assert len(grid.neighbours((5, 5))) == 8
+    assert len(grid.neighbours((2, 2))) == 7
+
+
+def test_radius_query_reaches_the_nearest_point_of_each_brick() -> None:
+    grid = full_grid()
+    x, y = grid.cell_rect((5, 5)).center
+    cells = grid.query_radius(x, y, 34)
+    assert sorted(cells) == sorted((column, row) for column in range(4, 7) for row in range(3, 8))
+    assert grid.query_radius(x, y, 0) == [(5, 5)]
+
+
+def test_rect_query_returns_overlapping_bricks() -> None:
+    grid = full_grid()
+    assert sorted(grid.query_rect(pygame.Rect(30, 0, 10, 10))) == [(0, 0), (1, 0)]
+    assert grid.query_rect(pygame.Rect(32, 0, 2, 16)) == []
+
+
+def test_blasts_chain_through_destroyed_bricks(game: Game, monkeypatch) -> None:
+    game._start_game(new_game=True, level=0)
+    cell = max(game.bricks.grid.cells, key=lambda cell: len(game.bricks.grid.neighbours(cell)))
+    bricks = len(game.bricks.grid)
+    game.explode(cell)
+    chained = bricks - len(game.bricks.grid)
+
+    game._start_game(new_game=True, level=0)
+    monkeypatch.setattr(game_module, "EXPLOSION_CHAIN_DEPTH", 0)
+    game.explode(cell)
+    single = bricks - len(game.bricks.grid)
+    assert 0 < single < chained
@@ -0,0 +1,58 @@
+"""
+This module contains the tests of the text rendering caches.
+"""
+
+import pygame
+import pytest
+
+from game.text import GlyphStrip, TextCache
+
+WHITE = (255, 255, 255)
+
+
+@pytest.fixture
+def font() -> pygame.font.Font:
+    """The default font, as the HUD uses it."""
+    pygame.font.init()
+    return pygame.font.Font(None, 36)
+
+
+def test_layout_places_glyphs_left_to_right(font: pygame.font.Font) -> None:
+    strip = GlyphStrip(font, WHITE, ["Score: "])
+    glyphs = strip.layout("Score: ", 1205, topleft=(10, 10))
+    assert len(glyphs) == 5
+    assert glyphs[0][1].topleft == (10, 10)
+    lefts = [rect.left for _, rect in glyphs]
+    assert lefts == sorted(lefts)
+    # The digits are the strip's own glyphs, shared by every layout.
+    assert glyphs[1][0] is strip.glyphs["1"][0]
+    assert glyphs[3][0] is strip.glyphs["0"][0]
+
+
+@pytest.mark.parametrize(
+    "anchor, point",
+    [("topleft", (10, 10)), ("topright", (630, 10)), ("midtop", (320, 10))],
+)
+def test_layout_anchors_the_whole_text(font: pygame.font.Font, anchor: str, point) -> None:
+    strip = GlyphStrip(font, WHITE, ["Lives: "])
+    glyphs = strip.layout("Lives: ", 5, **{anchor: point})
+    left, top = glyphs[0][1].topleft
+    bounds = pygame.Rect(left, top, glyphs[-1][1].right - left, strip.height)
+    assert getattr(bounds, anchor) == point
+
+
+def test_layout_width_matches_rendering_the_string(font: pygame.font.Font) -> None:
+    strip = GlyphStrip(font, WHITE, ["Ammo: "])
+    glyphs = strip.layout("Ammo: ", 42, topleft=(0, 0))
+    assert abs(glyphs[-1][1].right - font.size("Ammo: 42")[0]) <= 3
+
+
+def test_cache_drops_the_least_recently_used_text(font: pygame.font.Font) -> None:
+    cache = TextCache(max_size=2)
+    first = cache.render(font, "a", WHITE)
+    cache.render(font, "b", WHITE)
+    assert cache.render(font, "a", WHITE) is first
+    cache.render(font, "c", WHITE)
+    assert len(cache) == 2
+    assert ("b", font, WHITE) not in cache.surfaces
+    assert (cache.hits, cache.misses) == (1, 3)